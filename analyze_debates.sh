@@ -8,15 +8,19 @@ show_help() {
   echo
   echo "Options:"
   echo "  --calculate    Calculate metrics for all debates"
+  echo "  --jobs N       Worker processes for --calculate (0: one per CPU, default: 1)"
   echo "  --time         Visualize metrics over time"
   echo "  --agents       Visualize agent performance"
   echo "  --topics       Visualize topic diversity"
   echo "  --metric NAME  Specify metric to visualize (overall_quality, coherence, diversity, depth)"
+  echo "  --window N     Plot a rolling mean over N debates with --time (default: 1)"
   echo "  --help         Show this help message"
   echo
   echo "Examples:"
   echo "  ./analyze_debates.sh --calculate"
+  echo "  ./analyze_debates.sh --calculate --jobs 4"
   echo "  ./analyze_debates.sh --time --metric diversity"
+  echo "  ./analyze_debates.sh --time --window 10"
   echo "  ./analyze_debates.sh --agents"
 }
 
@@ -24,6 +28,8 @@ show_help() {
 CALCULATE=false
 VISUALIZE=""
 METRIC="overall_quality"
+JOBS=1
+WINDOW=1
 
 # Parse arguments
 while [[ $# -gt 0 ]]; do
@@ -48,6 +54,14 @@ while [[ $# -gt 0 ]]; do
       METRIC="$2"
       shift 2
       ;;
+    --jobs)
+      JOBS="$2"
+      shift 2
+      ;;
+    --window)
+      WINDOW="$2"
+      shift 2
+      ;;
     --help)
       show_help
       exit 0
@@ -69,13 +83,13 @@ fi
 # Calculate metrics if requested
 if [[ "$CALCULATE" == "true" ]]; then
   echo "Calculating metrics for all debates..."
-  docker compose run --rm debate-system python -m src.metrics.debate_metrics
+  docker compose run --rm debate-system python -m src.metrics.debate_metrics --jobs "$JOBS"
 fi
 
 # Visualize metrics if requested
 if [[ -n "$VISUALIZE" ]]; then
   echo "Visualizing debate metrics..."
-  docker compose run --rm debate-system python -m src.metrics.visualizers --type "$VISUALIZE" --metric "$METRIC"
+  docker compose run --rm debate-system python -m src.metrics.visualizers --type "$VISUALIZE" --metric "$METRIC" --window "$WINDOW"
 fi
 
 echo "Analysis complete."
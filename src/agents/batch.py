@@ -0,0 +1,201 @@
+"""
+batch.py - Offline batch submission of chat completion requests.
+
+Requests are written to a JSONL file in the provider's batch format, one line per request:
+    {"custom_id": ..., "method": "POST", "url": "/v1/chat/completions", "body": {...}}
+and handed to a BatchBackend, which submits the file, reports its status and downloads the
+results file ({"custom_id": ..., "response": {"status_code": ..., "body": {...}}, "error": ...}).
+OpenAIBatchBackend uses the provider's Batch API; LocalBatchBackend runs the file through
+call_openai on this machine and keeps its job records on disk, as a stand-in for tests and for
+providers without a batch endpoint.
+"""
+
+import concurrent.futures
+import json
+import os
+import uuid
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from src.config.settings import get_llm_config
+from .llm_utils import get_client, call_openai, _build_request, _text_result
+from .rate_limiter import RateLimitExceeded
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+# Batch states after which polling stops
+COMPLETED = "completed"
+FAILED_STATES = ("failed", "expired", "cancelled")
+
+
+def build_batch_line(custom_id: str, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+    """One batch input line for a system + user chat request, sized like an interactive call."""
+    request, _ = _build_request(get_llm_config(), system_prompt, user_prompt)
+    return {"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": request}
+
+
+def write_batch_file(path: str, requests: Iterable[Tuple[str, str, str]]) -> int:
+    """
+    Write (custom_id, system_prompt, user_prompt) requests as a batch input file.
+    Returns:
+        Number of requests written
+    """
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for custom_id, system_prompt, user_prompt in requests:
+            f.write(json.dumps(build_batch_line(custom_id, system_prompt, user_prompt), ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def read_batch_results(path: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Read a batch output file into {custom_id: {"response": ..., "usage": ...}}, the call_openai
+    return_usage shape. Failed requests carry an "[LLM error: ...]" response like interactive calls.
+    """
+    results = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get("response") or {}
+            body = response.get("body") or {}
+            if record.get("error") or response.get("status_code", 200) != 200 or not body.get("choices"):
+                error = record.get("error") or body.get("error") or "no completion returned"
+                results[record["custom_id"]] = _text_result(f"[LLM error: {error}]", True)
+                continue
+            usage = body.get("usage") or {}
+            results[record["custom_id"]] = {
+                "response": body["choices"][0]["message"]["content"],
+                "usage": {key: usage[key] for key in ("prompt_tokens", "completion_tokens", "total_tokens") if key in usage},
+            }
+    return results
+
+
+class BatchBackend:
+    """Submits batch input files and retrieves their results."""
+
+    def submit(self, input_path: str) -> str:
+        """Submit a batch input file and return its batch id."""
+        raise NotImplementedError
+
+    def status(self, batch_id: str) -> str:
+        """Current state of a batch: "completed", one of FAILED_STATES, or any in-progress state."""
+        raise NotImplementedError
+
+    def download(self, batch_id: str, output_path: str) -> None:
+        """Write a completed batch's results (including per-request errors) to output_path."""
+        raise NotImplementedError
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """Batch API of OpenAI (and compatible providers): 24h completion window at reduced cost."""
+
+    def __init__(self, client=None, completion_window: str = "24h"):
+        if client is None:
+            cfg = get_llm_config()
+            client = get_client(cfg["api_key"], cfg.get("base_url"))
+        self.client = client
+        self.completion_window = completion_window
+
+    def submit(self, input_path: str) -> str:
+        with open(input_path, "rb") as f:
+            input_file = self.client.files.create(file=f, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=self.completion_window,
+        )
+        return batch.id
+
+    def status(self, batch_id: str) -> str:
+        return self.client.batches.retrieve(batch_id).status
+
+    def download(self, batch_id: str, output_path: str) -> None:
+        batch = self.client.batches.retrieve(batch_id)
+        with open(output_path, "w", encoding="utf-8") as out:
+            # Successful requests land in the output file, failed ones in the error file
+            for file_id in (batch.output_file_id, batch.error_file_id):
+                if file_id:
+                    text = self.client.files.content(file_id).text
+                    out.write(text if text.endswith("\n") or not text else text + "\n")
+
+
+class LocalBatchBackend(BatchBackend):
+    """
+    File-based stand-in for a batch provider. A job is processed the first time its status is
+    polled, by sending every request through `responder` on a thread pool; job records and result
+    files live under work_dir so a crashed sweep can resume.
+    """
+
+    def __init__(self, work_dir: str, responder: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+                 max_workers: int = 8):
+        """
+        Args:
+            work_dir: Directory for job records and result files
+            responder: Callable taking a request body and returning {"response": ..., "usage": ...};
+                       defaults to call_openai with the body's system and user messages
+            max_workers: Requests processed concurrently per job
+        """
+        self.work_dir = work_dir
+        self.responder = responder or self._call_llm
+        self.max_workers = max(1, max_workers)
+        os.makedirs(work_dir, exist_ok=True)
+
+    @staticmethod
+    def _call_llm(body: Dict[str, Any]) -> Dict[str, Any]:
+        messages = {message["role"]: message["content"] for message in body["messages"]}
+        return call_openai(messages.get("system", ""), messages.get("user", ""), return_usage=True)
+
+    def _job_path(self, batch_id: str) -> str:
+        return os.path.join(self.work_dir, f"{batch_id}.job.json")
+
+    def _output_path(self, batch_id: str) -> str:
+        return os.path.join(self.work_dir, f"{batch_id}.output.jsonl")
+
+    def submit(self, input_path: str) -> str:
+        batch_id = f"localbatch_{uuid.uuid4().hex[:12]}"
+        with open(self._job_path(batch_id), "w") as f:
+            json.dump({"input": os.path.abspath(input_path), "status": "validating"}, f)
+        return batch_id
+
+    def status(self, batch_id: str) -> str:
+        with open(self._job_path(batch_id)) as f:
+            job = json.load(f)
+        if job["status"] != COMPLETED:
+            self._process(job["input"], self._output_path(batch_id))
+            job["status"] = COMPLETED
+            with open(self._job_path(batch_id), "w") as f:
+                json.dump(job, f)
+        return job["status"]
+
+    def _process(self, input_path: str, output_path: str) -> None:
+        with open(input_path, encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+
+        def respond(line):
+            try:
+                result = self.responder(line["body"])
+            except RateLimitExceeded as e:
+                # A request still throttled after every retry fails on its own, like a provider-side 429
+                error = {"code": "rate_limit_exceeded", "message": str(e)}
+                return {"id": f"batch_req_{uuid.uuid4().hex[:12]}", "custom_id": line["custom_id"],
+                        "response": {"status_code": 429, "body": {"error": error}}, "error": error}
+            body = {
+                "object": "chat.completion",
+                "model": line["body"].get("model"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": result["response"]}, "finish_reason": "stop"}],
+                "usage": result.get("usage") or {},
+            }
+            return {"id": f"batch_req_{uuid.uuid4().hex[:12]}", "custom_id": line["custom_id"],
+                    "response": {"status_code": 200, "body": body}, "error": None}
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            records = list(executor.map(respond, lines))
+        with open(output_path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def download(self, batch_id: str, output_path: str) -> None:
+        with open(self._output_path(batch_id), encoding="utf-8") as src, open(output_path, "w", encoding="utf-8") as dst:
+            dst.write(src.read())
@@ -28,9 +28,29 @@ class JudgeAgent:
         """
         from .llm_utils import call_openai
         return_usage = kwargs.get('return_usage', False)
-        # Prepare the judging prompt for the LLM (summaries only)
+        # Call the LLM
+        result = call_openai(self.prompt, self.build_user_prompt(agent_summaries), return_usage=return_usage)
+        return self._package_result(result, agent_summaries, return_usage)
+
+    async def async_judge(self, agent_summaries, transcript, **kwargs):
+        """
+        Asynchronous counterpart of judge(); same arguments and return shapes.
+        """
+        from .llm_utils import async_call_openai
+        return_usage = kwargs.get('return_usage', False)
+        result = await async_call_openai(self.prompt, self.build_user_prompt(agent_summaries), return_usage=return_usage)
+        return self._package_result(result, agent_summaries, return_usage)
+
+    def build_user_prompt(self, agent_summaries):
+        """
+        Prepare the judging prompt for the LLM (summaries only).
+        Args:
+            agent_summaries (dict): {agent_name: summary}
+        Returns:
+            str: User prompt asking for a ranked-choice vote
+        """
         agent_list = '\n'.join([f"- {k}: {v}" for k, v in agent_summaries.items()])
-        user_prompt = (
+        return (
             f"Agent summaries:\n{agent_list}\n\n"
             f"Your task: {self.prompt}\n"
             "Respond in the following format (replace AGENT_NAME and RATIONALE):\n"
@@ -39,15 +59,29 @@ class JudgeAgent:
             "RANK3: AGENT_NAME\nRATIONALE3: ...\n"
             "Note: If you cannot rank all three, provide as much information as possible."
         )
-        # Call the LLM
-        result = call_openai(self.prompt, user_prompt, return_usage=return_usage)
+
+    def _package_result(self, result, agent_summaries, return_usage):
+        """Parse a call_openai result into the judge() return shape."""
         if return_usage:
             llm_response = result["response"]
             usage = result.get("usage", {})
         else:
             llm_response = result
             usage = {}
-        # Parse the LLM response for vote and rationale
+        result_dict = self.parse_response(llm_response, agent_summaries)
+        if return_usage:
+            return {"result": result_dict, "usage": usage}
+        return result_dict
+
+    def parse_response(self, llm_response, agent_summaries):
+        """
+        Parse the LLM response for ranked votes and rationales.
+        Args:
+            llm_response (str): Raw LLM output in the RANKn/RATIONALEn format
+            agent_summaries (dict): {agent_name: summary}, used for the fallback vote
+        Returns:
+            dict: {"rank1": {"agent": ..., "rationale": ...}, "rank2": ..., "rank3": ...}
+        """
         rank1 = None
         rank2 = None
         rank3 = None
@@ -70,11 +104,8 @@ class JudgeAgent:
         if not rank1:
             # Fallback: pick the first agent
             rank1 = list(agent_summaries.keys())[0] if agent_summaries else None
-        result_dict = {
+        return {
             "rank1": {"agent": rank1, "rationale": rationale1},
             "rank2": {"agent": rank2, "rationale": rationale2},
             "rank3": {"agent": rank3, "rationale": rationale3}
         }
-        if return_usage:
-            return {"result": result_dict, "usage": usage}
-        return result_dict
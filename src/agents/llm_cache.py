@@ -0,0 +1,162 @@
+"""
+llm_cache.py - Content-addressed cache for LLM responses.
+
+Responses are keyed on a hash of (model, temperature, system_prompt, user_prompt) and kept in two
+tiers: a small in-memory LRU in front of a SQLite table on disk. Entries expire after a TTL and the
+disk tier is trimmed to a maximum entry count and byte size, least recently used first.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class ResponseCache:
+    """Two-tier (memory LRU + SQLite) cache of LLM responses with TTL and size-based eviction."""
+
+    def __init__(self, path: str, memory_entries: int = 256, max_entries: int = 10000,
+                 max_bytes: int = 0, ttl: float = 0):
+        """
+        Args:
+            path: SQLite database file for the disk tier
+            memory_entries: Capacity of the in-memory LRU tier
+            max_entries: Maximum entries kept on disk (0 = unbounded)
+            max_bytes: Maximum total response bytes kept on disk (0 = unbounded)
+            ttl: Seconds before an entry expires (0 = never)
+        """
+        self.path = path
+        self.memory_entries = memory_entries
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._memory = OrderedDict()  # key -> (created, value)
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "memory_hits": 0, "disk_hits": 0, "evictions": 0, "expired": 0}
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created REAL NOT NULL,"
+            " accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, temperature: float, system_prompt: str, user_prompt: str) -> str:
+        """Content hash identifying a request."""
+        payload = json.dumps([model, temperature, system_prompt, user_prompt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _expired(self, created: float, now: float) -> bool:
+        return bool(self.ttl) and now - created > self.ttl
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached value.
+        Returns:
+            The stored {"response": ..., "usage": ...} dict, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created, value = entry
+                if not self._expired(created, now):
+                    self._memory.move_to_end(key)
+                    self._counters["hits"] += 1
+                    self._counters["memory_hits"] += 1
+                    return value
+                del self._memory[key]
+
+            row = self._conn.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                value_json, created = row
+                if self._expired(created, now):
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                    self._counters["expired"] += 1
+                else:
+                    self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+                    self._conn.commit()
+                    value = json.loads(value_json)
+                    self._remember(key, created, value)
+                    self._counters["hits"] += 1
+                    self._counters["disk_hits"] += 1
+                    return value
+
+            self._counters["misses"] += 1
+            return None
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a value in both tiers and trim the disk tier if it is over budget."""
+        now = time.time()
+        value_json = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._remember(key, now, value)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, value_json, len(value_json.encode("utf-8")), now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _remember(self, key: str, created: float, value: Dict[str, Any]) -> None:
+        """Insert into the memory LRU, dropping the least recently used entry when full."""
+        self._memory[key] = (created, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict(self, now: float) -> None:
+        """Drop expired rows, then least recently used rows until within max_entries/max_bytes."""
+        if self.ttl:
+            cur = self._conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl,))
+            self._counters["expired"] += cur.rowcount
+        if self.max_entries:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+            if count > self.max_entries:
+                cur = self._conn.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+                self._counters["evictions"] += cur.rowcount
+        if self.max_bytes:
+            (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+            if total > self.max_bytes:
+                excess = total - self.max_bytes
+                victims = []
+                for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed"):
+                    victims.append((key,))
+                    excess -= size
+                    if excess <= 0:
+                        break
+                self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+                self._counters["evictions"] += len(victims)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters plus the current disk footprint."""
+        with self._lock:
+            count, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            return dict(self._counters, entries=count, bytes=total, memory_entries=len(self._memory))
+
+    def clear(self) -> None:
+        """Remove every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -2,41 +2,259 @@
 llm_utils.py - Utility functions for LLM API calls (OpenAI, etc.)
 """
 
-from src.config.settings import get_llm_config
-from openai import OpenAI
-import tiktoken
+import asyncio
+import atexit
+import contextlib
+import functools
+import threading
+import time
+import weakref
 
-def estimate_prompt_size(prompt):
+import httpx
+from src.config.settings import get_llm_config, get_llm_pool_size, get_cache_config, get_rate_limit_config
+from .llm_cache import ResponseCache
+from .rate_limiter import RETRYABLE_ERRORS, AdaptiveLimiter, RateLimitExceeded
+from openai import OpenAI, AsyncOpenAI, DefaultHttpxClient, DefaultAsyncHttpxClient
+try:
+    import tiktoken
+except ImportError:  # Token counts fall back to a character estimate
+    tiktoken = None
+
+# Idle keep-alive connections are dropped after this many seconds
+KEEPALIVE_EXPIRY = 30.0
+# Ceiling on open connections (httpx's own default); calls in flight are bounded by the rate limiter
+MAX_CONNECTIONS = 100
+
+# Process-wide client registry: (api_key, base_url) -> OpenAI client with a pooled HTTP connection
+_clients = {}
+_clients_lock = threading.Lock()
+
+def _pool_limits():
     """
-    Estimate the size of a prompt in tokens using tiktoken.
-    Fallback to a simple character count if tiktoken is not available.
+    Connection limits shared by the sync and async clients. The pool size only bounds the idle
+    keep-alive connections: calls beyond it open a short-lived connection instead of queueing.
+    """
+    pool_size = get_llm_pool_size()
+    return httpx.Limits(
+        max_connections=max(MAX_CONNECTIONS, pool_size),
+        max_keepalive_connections=pool_size,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+
+def get_client(api_key, base_url=None):
+    """
+    Return the shared OpenAI client for (api_key, base_url), creating it on first use.
+    The client keeps a keep-alive connection pool sized by get_llm_pool_size(), so repeated
+    calls reuse open connections instead of paying TCP/TLS setup every time.
+    """
+    key = (api_key, base_url or None)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            http_client = DefaultHttpxClient(limits=_pool_limits())
+            # Retries are left to the shared AdaptiveLimiter so it sees every 429
+            client = OpenAI(api_key=api_key, base_url=base_url or None, http_client=http_client, max_retries=0)
+            _clients[key] = client
+    return client
+
+# Async clients are bound to the event loop that created them, so they are pooled per loop
+_async_clients = weakref.WeakKeyDictionary()
+# Open async_client_session() scopes per loop
+_async_client_users = weakref.WeakKeyDictionary()
+
+def get_async_client(api_key, base_url=None):
+    """
+    Return the AsyncOpenAI client for (api_key, base_url) on the running event loop.
+    One client (and connection pool) is shared by every coroutine on that loop.
+    """
+    loop = asyncio.get_running_loop()
+    key = (api_key, base_url or None)
+    with _clients_lock:
+        loop_clients = _async_clients.setdefault(loop, {})
+        client = loop_clients.get(key)
+        if client is None:
+            client = AsyncOpenAI(
+                api_key=api_key,
+                base_url=base_url or None,
+                http_client=DefaultAsyncHttpxClient(limits=_pool_limits()),
+                max_retries=0,
+            )
+            loop_clients[key] = client
+    return client
+
+def close_clients():
+    """Close every pooled client and empty the registry."""
+    with _clients_lock:
+        for client in _clients.values():
+            try:
+                client.close()
+            except Exception:
+                pass
+        _clients.clear()
+
+atexit.register(close_clients)
+
+@contextlib.asynccontextmanager
+async def async_client_session():
+    """
+    Scope in which the running loop's async clients are used. When the outermost session on the
+    loop exits, its clients are closed and dropped, releasing their connections. Sessions nest, so
+    debates running concurrently on one loop share one connection pool until the last one ends.
+    """
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        _async_client_users[loop] = _async_client_users.get(loop, 0) + 1
+    try:
+        yield
+    finally:
+        with _clients_lock:
+            _async_client_users[loop] -= 1
+            clients = _async_clients.pop(loop, {}) if not _async_client_users[loop] else {}
+        for client in clients.values():
+            try:
+                await client.close()
+            except Exception:
+                pass
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+def get_response_cache():
+    """
+    Return the process-wide ResponseCache, or None when LLM_CACHE is not enabled.
+    """
+    global _response_cache
+    if _response_cache is None:
+        cache_cfg = get_cache_config()
+        if not cache_cfg["enabled"]:
+            return None
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache(
+                    cache_cfg["path"],
+                    memory_entries=cache_cfg["memory_entries"],
+                    max_entries=cache_cfg["max_entries"],
+                    max_bytes=cache_cfg["max_bytes"],
+                    ttl=cache_cfg["ttl"],
+                )
+    return _response_cache
+
+def _cache_lookup(cfg, system_prompt, user_prompt):
+    """
+    Check the response cache for a request.
+    Returns:
+        (cache, key, cached_value): cache is None when caching is disabled; cached_value is None on a miss
+    """
+    cache = get_response_cache()
+    if cache is None:
+        return None, None, None
+    key = ResponseCache.make_key(cfg["model_name"], cfg["temperature"], system_prompt, user_prompt)
+    return cache, key, cache.get(key)
+
+def _cached_result(value, return_usage, on_token=None):
+    """Return a cache hit in the call_openai shape; usage is flagged as cached (not billed)."""
+    if on_token is not None:
+        on_token(value["response"])
+    if not return_usage:
+        return value["response"]
+    return {"response": value["response"], "usage": dict(value.get("usage") or {}, cached=True)}
+
+def _store_result(cache, key, result):
+    """Store a fresh (always return_usage-shaped) result and flag its usage as a cache miss."""
+    cache.put(key, {"response": result["response"], "usage": result["usage"]})
+    result["usage"] = dict(result["usage"], cached=False)
+    return result
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+def get_rate_limiter():
+    """
+    Return the process-wide AdaptiveLimiter shared by every LLM call (sync and async).
+    """
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                limits = get_rate_limit_config()
+                _rate_limiter = AdaptiveLimiter(
+                    rpm=limits["rpm"],
+                    tpm=limits["tpm"],
+                    max_concurrency=limits["max_concurrency"],
+                    max_retries=limits["max_retries"],
+                )
+    return _rate_limiter
+
+def _note_throttle(result, throttled):
+    """Record time spent waiting on the rate limiter in a return_usage-shaped result."""
+    throttled = round(throttled, 3)
+    if throttled > 0:
+        result["usage"] = dict(result["usage"], throttle_seconds=throttled)
+    return result
+
+# Chat format overhead: tokens wrapping each message, and the tokens priming the assistant reply
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_REPLY = 3
+
+@functools.lru_cache(maxsize=None)
+def get_encoder(model_name):
+    """
+    Return the tiktoken encoder for a model, loaded once per model and memoized.
+    Unknown models use cl100k_base. Returns None when tiktoken or its encoding files are unavailable,
+    so the failure is paid once rather than on every call.
     """
+    if tiktoken is None:
+        return None
     try:
-        return tiktoken.get_encoding(prompt).length
+        try:
+            return tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
     except Exception:
-        return len(prompt) // 4  # rough estimate, 1 token ~ 4 characters
+        return None
 
-def call_openai(system_prompt, user_prompt, return_usage=False):
+def count_tokens(text, model_name=None):
+    """Count the tokens in text with the model's encoder, or estimate ~4 characters per token."""
+    encoder = get_encoder(model_name or get_llm_config()["model_name"])
+    if encoder is None:
+        return len(text) // 4
+    return len(encoder.encode(text, disallowed_special=()))
+
+@functools.lru_cache(maxsize=1024)
+def _count_tokens_cached(text, model_name):
+    """count_tokens memoized for text that recurs across calls (agent, judge and summarizer system prompts)."""
+    return count_tokens(text, model_name)
+
+def estimate_prompt_size(prompt, model_name=None):
     """
-    Call OpenAI API with a system and user prompt, return the response text and optional token usage.
-    Args:
-        system_prompt (str): The system prompt (agent persona, instructions)
-        user_prompt (str): The user or debate prompt
-        return_usage (bool): If True, return dict with response and token usage info
+    Estimate the size of a prompt in tokens using the model's tiktoken encoder.
+    Fallback to a simple character count if tiktoken is not available.
+    """
+    return count_tokens(prompt, model_name)
+
+def count_message_tokens(system_prompt, user_prompt, model_name):
+    """Prompt tokens of a system + user chat request, including the chat format overhead."""
+    return (
+        _count_tokens_cached(system_prompt, model_name)
+        + count_tokens(user_prompt, model_name)
+        + 2 * TOKENS_PER_MESSAGE
+        + TOKENS_PER_REPLY
+    )
+
+def _build_request(cfg, system_prompt, user_prompt):
+    """
+    Build the keyword arguments for a chat completion request, sizing max_tokens
+    to the room left in the model's context window.
     Returns:
-        str: LLM response (default)
-        OR
-        dict: {'response': ..., 'usage': {'prompt_tokens': ..., 'completion_tokens': ..., 'total_tokens': ...}}
+        (request kwargs, prompt token count)
     """
-    cfg = get_llm_config()
-    if not cfg["api_key"]:
-        return "[LLM not configured: Please set OPENAI_API_KEY]" if not return_usage else {"response": "[LLM not configured: Please set OPENAI_API_KEY]", "usage": {}}
-    
-    # Estimate prompt size
-    prompt_size = estimate_prompt_size(system_prompt + user_prompt)
-    
-    # Get the actual model context window
     model_name = cfg["model_name"]
+    prompt_size = count_message_tokens(system_prompt, user_prompt, model_name)
+
+    # Get the actual model context window
     # Default context window by model type
     if model_name.startswith("gpt-3.5"):
         model_context_window = 4096
@@ -57,35 +275,177 @@ def call_openai(system_prompt, user_prompt, return_usage=False):
     max_tokens = max(128, model_context_window - prompt_size)
     if model_context_window - prompt_size < 128:
         print(f"Warning: Available tokens for completion is very low (max_tokens={max_tokens}, context_window={model_context_window}, prompt_size={prompt_size})")
-    
+
+    request = {
+        "model": cfg["model_name"],
+        "temperature": cfg["temperature"],
+        "max_tokens": int(max_tokens),  # Use int() to ensure max_tokens is an integer
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ],
+    }
+    return request, prompt_size
+
+def _usage_dict(usage):
+    """Token usage object from the API as a plain dict ({} if the provider sent none)."""
+    if not usage:
+        return {}
+    return {
+        "prompt_tokens": usage.prompt_tokens,
+        "completion_tokens": usage.completion_tokens,
+        "total_tokens": usage.total_tokens
+    }
+
+def _format_result(response, return_usage):
+    """Turn a chat completion into the call_openai return value."""
+    message_content = response.choices[0].message.content
+    if not return_usage:
+        return message_content
+    return {"response": message_content, "usage": _usage_dict(getattr(response, 'usage', None))}
+
+def _stream_request(request):
+    """Request kwargs for a streamed completion that still reports token usage in its last chunk."""
+    return dict(request, stream=True, stream_options={"include_usage": True})
+
+class StreamInterrupted(RuntimeError):
+    """
+    A streamed completion failed after some of its text had already been passed to on_token.
+    It is not retried: the text already shown cannot be taken back, so a retry would repeat it.
+    """
+
+def _complete(client, request, on_token):
+    """
+    Run one chat completion, streaming content deltas to on_token when it is given.
+    Returns:
+        (result, time_to_first_token): a return_usage-shaped result and the seconds until the first
+        content arrived (for a non-streamed call, the whole response)
+    Raises:
+        StreamInterrupted: a retryable error cut the stream off after on_token had received a delta
+    """
+    start = time.perf_counter()
+    if on_token is None:
+        response = client.chat.completions.create(**request)
+        return _format_result(response, True), time.perf_counter() - start
+    parts, usage, first_token = [], None, None
+    try:
+        for chunk in client.chat.completions.create(**_stream_request(request)):
+            usage = chunk.usage or usage
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                if first_token is None:
+                    first_token = time.perf_counter() - start
+                parts.append(delta)
+                on_token(delta)
+    except RETRYABLE_ERRORS as e:
+        if parts:
+            raise StreamInterrupted(f"stream interrupted after {len(parts)} deltas: {e}") from e
+        raise
+    return {"response": "".join(parts), "usage": _usage_dict(usage)}, first_token or time.perf_counter() - start
+
+async def _async_complete(client, request, on_token):
+    """Asynchronous counterpart of _complete."""
+    start = time.perf_counter()
+    if on_token is None:
+        response = await client.chat.completions.create(**request)
+        return _format_result(response, True), time.perf_counter() - start
+    parts, usage, first_token = [], None, None
     try:
-        client = OpenAI(
-            api_key=cfg["api_key"],
-            base_url=cfg["base_url"] if "base_url" in cfg and cfg["base_url"] else None
+        async for chunk in await client.chat.completions.create(**_stream_request(request)):
+            usage = chunk.usage or usage
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                if first_token is None:
+                    first_token = time.perf_counter() - start
+                parts.append(delta)
+                on_token(delta)
+    except RETRYABLE_ERRORS as e:
+        if parts:
+            raise StreamInterrupted(f"stream interrupted after {len(parts)} deltas: {e}") from e
+        raise
+    return {"response": "".join(parts), "usage": _usage_dict(usage)}, first_token or time.perf_counter() - start
+
+def _completed_tokens(completion):
+    """Tokens billed for a _complete() result, to settle the rate limiter's TPM reservation."""
+    result, _ = completion
+    return result["usage"].get("total_tokens")
+
+def _finish_result(cache, key, completion, throttled, return_usage):
+    """Cache a fresh completion, then attach per-call latency and throttle time to its usage."""
+    result, time_to_first_token = completion
+    if cache is not None:
+        result = _store_result(cache, key, result)
+    if not return_usage:
+        return result["response"]
+    result["usage"] = dict(result["usage"], time_to_first_token=round(time_to_first_token, 3))
+    return _note_throttle(result, throttled)
+
+def _text_result(text, return_usage):
+    """Wrap a placeholder or error string in the call_openai return shape."""
+    if return_usage:
+        return {"response": text, "usage": {}}
+    return text
+
+NOT_CONFIGURED_MESSAGE = "[LLM not configured: Please set OPENAI_API_KEY]"
+
+def call_openai(system_prompt, user_prompt, return_usage=False, on_token=None):
+    """
+    Call OpenAI API with a system and user prompt, return the response text and optional token usage.
+    Args:
+        system_prompt (str): The system prompt (agent persona, instructions)
+        user_prompt (str): The user or debate prompt
+        return_usage (bool): If True, return dict with response and token usage info
+        on_token (callable): If given, the completion is streamed and each content delta is passed to it
+                             as it arrives (a cached response is passed whole)
+    Returns:
+        str: LLM response (default)
+        OR
+        dict: {'response': ..., 'usage': {'prompt_tokens': ..., 'completion_tokens': ..., 'total_tokens': ...,
+               'time_to_first_token': seconds}}
+    Raises:
+        RateLimitExceeded: the provider kept throttling after every retry of the shared rate limiter
+    """
+    cfg = get_llm_config()
+    if not cfg["api_key"]:
+        return _text_result(NOT_CONFIGURED_MESSAGE, return_usage)
+    cache, key, cached = _cache_lookup(cfg, system_prompt, user_prompt)
+    if cached is not None:
+        return _cached_result(cached, return_usage, on_token)
+    request, prompt_tokens = _build_request(cfg, system_prompt, user_prompt)
+    try:
+        client = get_client(cfg["api_key"], cfg.get("base_url"))
+        completion, throttled = get_rate_limiter().call(
+            lambda: _complete(client, request, on_token), prompt_tokens + request["max_tokens"], _completed_tokens
         )
-        response = client.chat.completions.create(
-            model=cfg["model_name"],
-            temperature=cfg["temperature"],
-            max_tokens=int(max_tokens),  # Use int() to ensure max_tokens is an integer
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ]
+        return _finish_result(cache, key, completion, throttled, return_usage)
+    except RateLimitExceeded:
+        # Never let a throttling error string stand in for an agent's argument
+        raise
+    except Exception as e:
+        return _text_result(f"[LLM error: {e}]", return_usage)
+
+async def async_call_openai(system_prompt, user_prompt, return_usage=False, on_token=None):
+    """
+    Asynchronous counterpart of call_openai built on AsyncOpenAI.
+    Takes the same arguments and returns the same shapes, without blocking the event loop: the
+    response cache is read and written in a worker thread.
+    """
+    cfg = get_llm_config()
+    if not cfg["api_key"]:
+        return _text_result(NOT_CONFIGURED_MESSAGE, return_usage)
+    cache, key, cached = await asyncio.to_thread(_cache_lookup, cfg, system_prompt, user_prompt)
+    if cached is not None:
+        return _cached_result(cached, return_usage, on_token)
+    request, prompt_tokens = _build_request(cfg, system_prompt, user_prompt)
+    try:
+        client = get_async_client(cfg["api_key"], cfg.get("base_url"))
+        completion, throttled = await get_rate_limiter().acall(
+            lambda: _async_complete(client, request, on_token), prompt_tokens + request["max_tokens"], _completed_tokens
         )
-        message_content = response.choices[0].message.content
-        usage = getattr(response, 'usage', None)
-        if return_usage:
-            if usage:
-                usage_dict = {
-                    "prompt_tokens": usage.prompt_tokens,
-                    "completion_tokens": usage.completion_tokens,
-                    "total_tokens": usage.total_tokens
-                }
-            else:
-                usage_dict = {}
-            return {"response": message_content, "usage": usage_dict}
-        return message_content
+        if cache is None:
+            return _finish_result(cache, key, completion, throttled, return_usage)
+        return await asyncio.to_thread(_finish_result, cache, key, completion, throttled, return_usage)
+    except RateLimitExceeded:
+        raise
     except Exception as e:
-        if return_usage:
-            return {"response": f"[LLM error: {e}]", "usage": {}}
-        return f"[LLM error: {e}]"
+        return _text_result(f"[LLM error: {e}]", return_usage)
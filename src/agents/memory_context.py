@@ -0,0 +1,215 @@
+"""
+memory_context.py - Token-budgeted memory context for OrchestratorWithMemory.
+
+Candidate snippets - statements from the relevant past debates, the agent's own retained positions
+and its per-topic digests - are scored by relevance to the prompt and by recency, then packed
+greedily, best first, under a per-agent token budget counted with the model's tokenizer. A snippet
+longer than a quarter of the budget, or than what is left of it, is cut at a token boundary.
+Assembled contexts are cached per (agent, prompt) until the memory changes (in any process sharing it).
+"""
+
+import datetime
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.config.settings import get_llm_config, get_memory_context_budget
+from src.memory.search_index import debate_statements, tokenize
+from .llm_utils import count_tokens, get_encoder
+
+# Age at which a snippet's recency weight halves
+RECENCY_HALF_LIFE_DAYS = 180
+# Smallest remainder of the budget worth filling with a cut-down snippet
+MIN_SNIPPET_TOKENS = 48
+# Largest share of the budget one snippet may take, so several sources fit
+MAX_SNIPPET_SHARE = 0.25
+
+SECTION_HEADERS = {
+    "debates": "===== DEBATE CONTEXT =====\nPrevious relevant debates on this topic:",
+    "positions": "===== YOUR PAST POSITIONS =====\nYou have previously expressed these views:",
+}
+POSITIONS_FOOTER = ("\nYou should maintain philosophical consistency with these positions unless you have a "
+                    "strong reason to evolve your thinking.")
+
+
+def _recency(timestamp: Optional[str], now: datetime.datetime) -> float:
+    """Weight in (0, 1] halving every RECENCY_HALF_LIFE_DAYS since a YYYYmmdd_HHMMSS timestamp."""
+    try:
+        when = datetime.datetime.strptime(timestamp or "", "%Y%m%d_%H%M%S")
+    except ValueError:
+        return 0.5
+    age_days = max((now - when).total_seconds() / 86400, 0.0)
+    return 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS)
+
+
+def _coverage(prompt_terms: set, text: str) -> float:
+    """Share of the prompt's terms that occur in a text."""
+    if not prompt_terms:
+        return 0.0
+    return len(prompt_terms & set(tokenize(text))) / len(prompt_terms)
+
+
+class MemoryContextBuilder:
+    """Builds and caches each agent's memory context under a token budget."""
+
+    def __init__(self, memory_manager, token_budget: Optional[int] = None, model_name: Optional[str] = None):
+        """
+        Args:
+            memory_manager: MemoryManager the agent memories come from
+            token_budget: Tokens per agent context. If None, taken from MEMORY_CONTEXT_TOKENS
+            model_name: Model whose tokenizer counts the tokens. If None, the configured model
+        """
+        self.memory_manager = memory_manager
+        self.token_budget = get_memory_context_budget() if token_budget is None else token_budget
+        self.model_name = model_name or get_llm_config()["model_name"]
+        self._cache: Dict[Tuple[str, str], Tuple[str, Dict[str, Any]]] = {}
+        self._generation = memory_manager.generation  # Store change counter the cache reflects
+        self._lock = threading.Lock()
+        self.cache_hits = 0
+
+    def invalidate(self) -> None:
+        """Drop cached contexts (after the memory changed, e.g. a debate was saved)."""
+        with self._lock:
+            self._cache.clear()
+
+    def build(self, agent_name: str, prompt: str, relevant_debates: List[Dict[str, Any]],
+              agent_memory: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """
+        Assemble an agent's memory context for a prompt.
+        Returns:
+            (context, stats): the context text ("" if nothing relevant fits) and
+            {"budget", "candidates", "snippets", "candidate_tokens", "context_tokens", "tokens_saved", "cached"}
+        """
+        key = (agent_name, prompt)
+        generation = self.memory_manager.generation
+        with self._lock:
+            if generation != self._generation:
+                self._cache.clear()  # Debates were saved since the contexts were built
+                self._generation = generation
+            if key in self._cache:
+                self.cache_hits += 1
+                context, stats = self._cache[key]
+                return context, dict(stats, cached=True)
+        snippets = self._candidates(agent_name, prompt, relevant_debates, agent_memory)
+        context, stats = self._pack(snippets)
+        with self._lock:
+            self._cache[key] = (context, stats)
+        return context, dict(stats, cached=False)
+
+    # --- Candidates ---
+
+    def _candidates(self, agent_name: str, prompt: str, relevant_debates: List[Dict[str, Any]],
+                    agent_memory: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Scored snippets: {"section", "group", "group_header", "order", "text", "score"}."""
+        prompt_terms = set(tokenize(prompt))
+        now = datetime.datetime.now()
+        snippets = []
+
+        # Other agents' statements in the relevant debates; retrieval order ranks the debates
+        for rank, debate in enumerate(relevant_debates):
+            recency = _recency(debate.get("timestamp"), now)
+            header = f"Debate: \"{debate.get('prompt', '')}\""
+            for order, (speaker, text) in enumerate(debate_statements(debate)):
+                if speaker == agent_name:
+                    continue  # Covered by the agent's own positions
+                relevance = 0.5 / (1 + rank) + 0.5 * _coverage(prompt_terms, text)
+                snippets.append({"section": "debates", "group": rank, "group_header": header,
+                                 "order": order, "text": f"- {speaker}: {text}", "score": relevance * recency})
+
+        # The agent's own retained positions, by embedding similarity when available
+        similar = self.memory_manager.find_similar_positions(agent_name, prompt, limit=50, min_similarity=0.0)
+        similarity = {match["debate_id"]: match["similarity"] for match in similar or []}
+        for order, entry in enumerate(agent_memory.get("debates", [])):
+            text = entry.get("response", "")
+            if not text:
+                continue
+            relevance = max(similarity.get(entry.get("debate_id"), 0.0),
+                            _coverage(prompt_terms, entry.get("prompt", "") + " " + text))
+            if relevance > 0:
+                snippets.append({"section": "positions", "group": None, "group_header": None, "order": order,
+                                 "text": f"- On \"{entry.get('topic', 'Unknown')}\": {text}",
+                                 "score": relevance * _recency(entry.get("timestamp"), now)})
+
+        # Digests of positions older than the retention limit
+        for topic, digest in agent_memory.get("digests", {}).items():
+            summary = digest.get("summary") or " ".join(digest.get("points", []))
+            relevance = _coverage(prompt_terms, topic + " " + summary)
+            if summary and relevance > 0:
+                snippets.append({"section": "positions", "group": None, "group_header": None, "order": -1,
+                                 "text": f"- Earlier, on \"{topic}\" ({digest.get('entries', 0)} debates): {summary}",
+                                 "score": relevance * _recency(digest.get("last_timestamp"), now)})
+        return snippets
+
+    # --- Packing ---
+
+    def _tokens(self, text: str) -> int:
+        return count_tokens(text, self.model_name) + 1  # + the joining newline
+
+    def _truncate(self, text: str, max_tokens: int) -> str:
+        """Cut text to about max_tokens at a token boundary, marking the cut."""
+        encoder = get_encoder(self.model_name)
+        if encoder is None:
+            return text[:max(max_tokens - 1, 0) * 4] + "..."
+        return encoder.decode(encoder.encode(text, disallowed_special=())[:max(max_tokens - 1, 0)]) + "..."
+
+    def _pack(self, snippets: List[Dict[str, Any]]) -> Tuple[str, Dict[str, Any]]:
+        """Greedily fit the best-scoring snippets, with their headers, into the token budget."""
+        header_tokens = {
+            "debates": self._tokens(SECTION_HEADERS["debates"]),
+            "positions": self._tokens(SECTION_HEADERS["positions"]) + self._tokens(POSITIONS_FOOTER),
+        }
+        for snippet in snippets:
+            snippet["tokens"] = self._tokens(snippet["text"])
+        group_headers = {snippet["group"]: snippet["group_header"] for snippet in snippets
+                         if snippet["group_header"] is not None}
+        group_tokens = {group: self._tokens(header) for group, header in group_headers.items()}
+        candidate_tokens = (sum(snippet["tokens"] for snippet in snippets)
+                            + sum(header_tokens[section] for section in {s["section"] for s in snippets})
+                            + sum(group_tokens.values()))
+
+        remaining = self.token_budget
+        snippet_cap = max(MIN_SNIPPET_TOKENS, int(self.token_budget * MAX_SNIPPET_SHARE))
+        chosen: List[Dict[str, Any]] = []
+        open_sections, open_groups = set(), set()
+        for snippet in sorted(snippets, key=lambda s: s["score"], reverse=True):
+            overhead = 0 if snippet["section"] in open_sections else header_tokens[snippet["section"]]
+            if snippet["group_header"] is not None and snippet["group"] not in open_groups:
+                overhead += group_tokens[snippet["group"]]
+            room = min(remaining - overhead, snippet_cap)
+            if snippet["tokens"] > room:
+                if room < MIN_SNIPPET_TOKENS:
+                    continue
+                snippet = dict(snippet, text=self._truncate(snippet["text"], room - 1))
+                snippet["tokens"] = self._tokens(snippet["text"])
+                if snippet["tokens"] > room:
+                    continue
+            chosen.append(snippet)
+            remaining -= overhead + snippet["tokens"]
+            open_sections.add(snippet["section"])
+            if snippet["group_header"] is not None:
+                open_groups.add(snippet["group"])
+
+        parts = []
+        debate_snippets = sorted((s for s in chosen if s["section"] == "debates"), key=lambda s: (s["group"], s["order"]))
+        if debate_snippets:
+            parts.append(SECTION_HEADERS["debates"])
+            current_group = None
+            for snippet in debate_snippets:
+                if snippet["group"] != current_group:
+                    current_group = snippet["group"]
+                    parts.append(group_headers[current_group])
+                parts.append(snippet["text"])
+        position_snippets = [s for s in chosen if s["section"] == "positions"]  # Best first
+        if position_snippets:
+            parts.append(SECTION_HEADERS["positions"])
+            parts.extend(snippet["text"] for snippet in position_snippets)
+            parts.append(POSITIONS_FOOTER)
+        context = "\n".join(parts)
+        context_tokens = count_tokens(context, self.model_name) if context else 0
+        return context, {
+            "budget": self.token_budget,
+            "candidates": len(snippets),
+            "snippets": len(chosen),
+            "candidate_tokens": candidate_tokens,
+            "context_tokens": context_tokens,
+            "tokens_saved": max(candidate_tokens - context_tokens, 0),
+        }
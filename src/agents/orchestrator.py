@@ -11,6 +11,8 @@ For advanced features and parallel debate, use orchestrator_dynamic.py.
 from .agent_loader import load_agents_from_directory
 from .judge_agent import JudgeAgent
 from .quorum import quorum_decision
+from .orchestrator_dynamic import skip_turn
+from .rate_limiter import RateLimitExceeded
 import os
 
 class OrchestratorAgent:
@@ -50,14 +52,19 @@ class OrchestratorAgent:
         opening_statements = []
         rebuttals = defaultdict(list)
         agent_summaries = {}
+        failed_turns = []
 
         # --- Opening Statement Phase ---
         for agent in self.agents:
             # Use opening_statement if available, else fallback
-            if hasattr(agent, 'opening_statement'):
-                response = agent.opening_statement(prompt)
-            else:
-                response = agent.analyze_prompt(prompt)
+            try:
+                if hasattr(agent, 'opening_statement'):
+                    response = agent.opening_statement(prompt)
+                else:
+                    response = agent.analyze_prompt(prompt)
+            except RateLimitExceeded as e:
+                skip_turn(failed_turns, "opening", agent.name, e)
+                continue
             print(f"{agent.name} ({agent.archetype}) [Opening]: {response}")
             opening_statements.append((agent, response))
             transcript.append({"phase": "opening", "agent": agent.name, "text": response})
@@ -67,10 +74,14 @@ class OrchestratorAgent:
         for agent, opening in opening_statements:
             for other_agent, other_opening in opening_statements:
                 if agent != other_agent:
-                    if hasattr(agent, 'rebuttal'):
-                        rebuttal = agent.rebuttal(other_opening)
-                    else:
-                        rebuttal = agent.critique(other_opening)
+                    try:
+                        if hasattr(agent, 'rebuttal'):
+                            rebuttal = agent.rebuttal(other_opening)
+                        else:
+                            rebuttal = agent.critique(other_opening)
+                    except RateLimitExceeded as e:
+                        skip_turn(failed_turns, "rebuttal", agent.name, e, target=other_agent.name)
+                        continue
                     print(f"{agent.name} rebuts {other_agent.name}: {rebuttal}")
                     rebuttals[agent.name].append({"target": other_agent.name, "text": rebuttal})
                     transcript.append({"phase": "rebuttal", "agent": agent.name, "target": other_agent.name, "text": rebuttal})
@@ -88,7 +99,11 @@ class OrchestratorAgent:
         judge_votes = []
         judge_rationales = []
         for judge in self.judges:
-            result = judge.judge(agent_summaries, transcript)
+            try:
+                result = judge.judge(agent_summaries, transcript)
+            except RateLimitExceeded as e:
+                skip_turn(failed_turns, "judge", judge.name, e)
+                continue
             judge_votes.append(result["vote"])
             judge_rationales.append({"judge": judge.name, "vote": result["vote"], "rationale": result["rationale"]})
             print(f"{judge.name} voted for {result['vote']}: {result['rationale']}")
@@ -115,6 +130,7 @@ class OrchestratorAgent:
             "winner": winner,
             "is_tie": is_tie,
             "transcript": transcript,
+            "failed_turns": failed_turns,
             # "token_usage": dict(token_usage)  # Uncomment when implemented
         }
         log_path = os.path.join(os.path.dirname(__file__), "../../debate_history.jsonl")
@@ -2,9 +2,12 @@
 Dynamic orchestrator agent to manage debate flow with dynamically loaded philosophical agents.
 """
 
-import json
+import asyncio
+import contextlib
 import os
+import threading
 import concurrent.futures
+from collections import defaultdict
 from typing import List, Tuple, Dict, Any, Optional
 
 from .base import BaseAgent
@@ -12,25 +15,52 @@ from .judge_loader import load_judges_from_directory
 from .quorum import quorum_decision
 from .agent_loader import load_agents_from_directory
 from .summarizer_loader import load_summarizer_from_directory
+from src.config.settings import get_phase_parallel, get_rebuttal_per_agent_parallel, get_stream_output
+from src.debate.scheduler import DAGScheduler
+from src.debate.stream_printer import StreamPrinter
+from src.memory import MemoryManager
+
+# Phases that record per-call token usage, in debate order
+TOKEN_USAGE_PHASES = ["opening", "rebuttal", "closing", "summary", "judge"]
+
+
+def skip_turn(failed_turns, phase, name, error, target=None, live=None):
+    """
+    Record a turn whose LLM call was still rate limited after every retry and print why it is
+    missing. Returns None in place of the turn's result: the turn is left out of the transcript,
+    and an agent without its opening, closing or summary is left out of judging.
+    """
+    if live:
+        live.close()
+    turn = {"phase": phase, "name": name}
+    if target:
+        turn["target"] = target
+    failed_turns.append(turn)
+    print(f"[Rate limited] {phase} call for {name}{f' -> {target}' if target else ''} still throttled after "
+          f"every retry; left out of the debate ({error})")
+    return None
+
 
 class OrchestratorAgent:
     """
     Manages conversation flow and coordinates all philosophical agents for the debate.
     Loads agents dynamically from definition files.
     """
-    def __init__(self, agent_definitions_dir: Optional[str] = None):
+    def __init__(self, agent_definitions_dir: Optional[str] = None, memory_dir: Optional[str] = None):
         """
         Initialize the orchestrator with dynamically loaded agents.
-        
+
         Args:
             agent_definitions_dir: Directory containing agent definition files
                                   If None, default to "agent_definitions"
+            memory_dir: Directory of the memory store debates are saved to
+                        If None, default to {project_root}/memory/
         """
         # Path to agent definitions
         if agent_definitions_dir is None:
             project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
             agent_definitions_dir = os.path.join(project_root, "agent_definitions")
-        
+
         # Load agents dynamically
         self.agents = load_agents_from_directory(agent_definitions_dir)
         # Dynamically load judge agents from judge_definitions/
@@ -40,199 +70,705 @@ class OrchestratorAgent:
         if len(self.judges) % 2 == 0:
             raise RuntimeError("Number of judge agents must be odd to provide quorum. Refusing to run.")
         self.history = []
+        self._summarizer_prompts = None  # Loaded on first use, then shared by every debate
+        # Finished debates are saved once, through the memory store, which also appends a compact
+        # line per debate to debate_history.jsonl
+        self.memory_manager = MemoryManager(memory_dir, history_log=os.path.join(project_root, "debate_history.jsonl"))
 
-    def run(self, prompt: str, max_parallel: int = 1):
+    def run(self, prompt: str, max_parallel: int = 1,
+            per_agent_parallel: Optional[Dict[str, int]] = None,
+            stream: Optional[bool] = None) -> Dict[str, Any]:
         """
         Run a single round of multi-agent debate: Opening Statement, Rebuttal, Summarization, Judging.
         Args:
             prompt (str): The philosophical prompt to debate
             max_parallel (int): Maximum number of parallel API calls (default: 1)
+            per_agent_parallel (dict): Optional {agent_name: cap} on concurrent rebuttals per critic,
+                                       overriding PARALLEL_REBUTTALS_PER_AGENT for those agents
+            stream (bool): Stream opening and closing statements to the console as they are generated
+                           (default: STREAM_OUTPUT)
+        Returns:
+            dict: The debate log entry plus per-phase token_usage and the failed_turns left out of it
         """
-        import json
-        import os
-        from collections import defaultdict
-        import concurrent.futures
-
-        # --- Per-phase parallelism settings ---
-        def get_phase_parallel(phase: str, default: int = 1) -> int:
-            env_map = {
-                "opening": "PARALLEL_AGENTS_OPENING",
-                "rebuttal": "PARALLEL_AGENTS_REBUTTAL",
-                "summary": "PARALLEL_AGENTS_SUMMARY",
-                "judging": "PARALLEL_AGENTS_JUDGING",
-            }
-            # Try phase-specific env var, then global, then default
-            val = os.environ.get(env_map.get(phase, ""))
-            if val is not None:
-                try:
-                    return int(val)
-                except ValueError:
-                    pass
-            val = os.environ.get("PARALLEL_AGENTS")
-            if val is not None:
-                try:
-                    return int(val)
-                except ValueError:
-                    pass
-            return default
+        from .llm_utils import call_openai, RateLimitExceeded
 
         transcript = []
-        opening_statements = []
-        rebuttals = defaultdict(list)
-        agent_summaries = {}
-
-        # Track token usage
-        token_usage = {"opening": [], "rebuttal": [], "summary": [], "judge": []}
-
+        token_usage = {phase: [] for phase in TOKEN_USAGE_PHASES}
+        failed_turns = []
+        summarizer_prompt, final_summarizer_prompt = self._load_summarizer_prompts()
+        printer = StreamPrinter() if (get_stream_output() if stream is None else stream) else None
 
         def get_opening(agent):
-            from .llm_utils import call_openai
-            if hasattr(agent, 'opening_statement'):
-                result = call_openai(agent.opening_prompt, prompt, return_usage=True)
-            else:
-                result = call_openai(agent.analysis_prompt, prompt, return_usage=True)
-            response = result['response']
-            usage = result.get('usage', {})
-            token_usage["opening"].append(usage)
-            print(f"{agent.name} ({agent.archetype}) [Opening]: {response}")
-            if usage:
-                print(f"  [Tokens: prompt={usage.get('prompt_tokens', 0)}, completion={usage.get('completion_tokens', 0)}, total={usage.get('total_tokens', 0)}]")
-            return (agent, response, {"phase": "opening", "agent": agent.name, "text": response})
+            system_prompt, user_prompt = self._opening_prompts(agent, prompt)
+            live = self._open_stream(printer, agent, "Opening")
+            try:
+                result = call_openai(system_prompt, user_prompt, return_usage=True, on_token=live)
+            except RateLimitExceeded as e:
+                return self._skip_turn(failed_turns, "opening", agent.name, e, live=live)
+            return self._record_opening(agent, result, token_usage, live)
 
         with concurrent.futures.ThreadPoolExecutor(max_workers=get_phase_parallel("opening", max_parallel)) as executor:
-            opening_results = list(executor.map(get_opening, self.agents)) # Opening statements phase parallelism
+            opening_results = [r for r in executor.map(get_opening, self.agents) if r] # Opening statements phase parallelism
 
         opening_statements = [(agent, response) for agent, response, _ in opening_results]
         transcript.extend([log for _, _, log in opening_results])
 
-        # --- Rebuttal Phase (parallelized per agent) ---
-        def get_rebuttals(agent_opening):
-            from .llm_utils import call_openai
-            agent, opening = agent_opening
-            rebuttal_logs = []
-            rebuttal_list = []
-            for other_agent, other_opening in opening_statements:
-                if agent != other_agent:
-                    if hasattr(agent, 'rebuttal'):
-                        result = call_openai(agent.rebuttal_prompt, other_opening, return_usage=True)
-                    else:
-                        result = call_openai(agent.critique_prompt, other_opening, return_usage=True)
-                    rebuttal = result['response']
-                    usage = result.get('usage', {})
-                    token_usage["rebuttal"].append(usage)
-                    print(f"{agent.name} rebuts {other_agent.name}: {rebuttal}")
-                    if usage:
-                        print(f"  [Tokens: prompt={usage.get('prompt_tokens', 0)}, completion={usage.get('completion_tokens', 0)}, total={usage.get('total_tokens', 0)}]")
-                    rebuttal_list.append({"target": other_agent.name, "text": rebuttal})
-                    rebuttal_logs.append({"phase": "rebuttal", "agent": agent.name, "target": other_agent.name, "text": rebuttal})
-            return agent.name, rebuttal_list, rebuttal_logs
+        # --- Rebuttal Phase (one task per critic/target pair) ---
+        # N agents produce N*(N-1) independent rebuttals; each pair is its own task under the
+        # global PARALLEL_AGENTS_REBUTTAL cap, with optional per-critic caps on top.
+        pairs, schedule = self._rebuttal_pairs(opening_statements)
+        agent_semaphores = {
+            name: threading.BoundedSemaphore(limit)
+            for name, limit in self._per_agent_limits(per_agent_parallel).items()
+        }
+
+        def get_rebuttal(index):
+            agent, other_agent, other_opening = pairs[index]
+            system_prompt, user_prompt = self._rebuttal_prompts(agent, other_opening)
+            semaphore = agent_semaphores.get(agent.name)
+            try:
+                if semaphore is None:
+                    result = call_openai(system_prompt, user_prompt, return_usage=True)
+                else:
+                    with semaphore:
+                        result = call_openai(system_prompt, user_prompt, return_usage=True)
+            except RateLimitExceeded as e:
+                return index, self._skip_turn(failed_turns, "rebuttal", agent.name, e, target=other_agent.name)
+            return index, self._record_rebuttal(agent, other_agent, result, token_usage)
 
         with concurrent.futures.ThreadPoolExecutor(max_workers=get_phase_parallel("rebuttal", max_parallel)) as executor:
-            rebuttal_results = list(executor.map(get_rebuttals, opening_statements)) # Rebuttal phase parallelism
+            pair_results = dict(executor.map(get_rebuttal, schedule)) # Rebuttal phase parallelism
 
-        rebuttals = {name: rebuttal_list for name, rebuttal_list, _ in rebuttal_results}
-        for _, _, logs in rebuttal_results:
-            transcript.extend(logs)
+        rebuttals, rebuttal_logs = self._collect_rebuttals(opening_statements, pairs, pair_results)
+        transcript.extend(rebuttal_logs)
 
         # --- Closing Statement Phase (parallelized) ---
         # Each agent receives their worldview, opening, and all rebuttals against them, and generates a closing statement.
         def get_closing(agent_opening):
-            from .llm_utils import call_openai
             agent, opening = agent_opening
-            agent_rebuttals = rebuttals[agent.name]
-            rebuttals_against = []
-            for other_agent, rebuttal_list in rebuttals.items():
-                for r in rebuttal_list:
-                    if r["target"] == agent.name:
-                        rebuttals_against.append({"from": other_agent, "text": r["text"]})
-            # Compose worldview string (from agent definition)
-            worldview = getattr(agent, "worldview", None)
-            if worldview is None and hasattr(agent, "archetype"):
-                worldview = f"Archetype: {agent.archetype}"
-            closing_prompt = (
-                "You are to provide a closing response to the debate. "
-                "Consider your worldview, your opening statement, and the rebuttals you received. "
-                "Summarize your final position and address the main challenges raised against you.\n\n"
-                f"Worldview: {worldview}\n"
-                f"Opening Statement: {opening}\n"
-                f"Rebuttals Against You: {'; '.join([r['text'] for r in rebuttals_against])}"
-            )
-            # Use the agent's critique_prompt for closing, or fallback to analysis_prompt
-            prompt_to_use = getattr(agent, "closing_prompt", None) or getattr(agent, "critique_prompt", None) or getattr(agent, "analysis_prompt", None)
-            result = call_openai(prompt_to_use, closing_prompt, return_usage=True)
-            closing = result['response']
-            usage = result.get('usage', {})
-            token_usage["closing"].append(usage)
-            print(f"{agent.name} Closing: {closing}")
-            if usage:
-                print(f"  [Tokens: prompt={usage.get('prompt_tokens', 0)}, completion={usage.get('completion_tokens', 0)}, total={usage.get('total_tokens', 0)}]")
-            return agent.name, closing, {"phase": "closing", "agent": agent.name, "text": closing, "token_usage": usage}
+            system_prompt, user_prompt = self._closing_prompts(agent, opening, rebuttals)
+            live = self._open_stream(printer, agent, "Closing")
+            try:
+                result = call_openai(system_prompt, user_prompt, return_usage=True, on_token=live)
+            except RateLimitExceeded as e:
+                return self._skip_turn(failed_turns, "closing", agent.name, e, live=live)
+            return self._record_closing(agent, result, token_usage, live)
 
         with concurrent.futures.ThreadPoolExecutor(max_workers=get_phase_parallel("closing", max_parallel)) as executor:
-            closing_results = list(executor.map(get_closing, opening_statements))
+            closing_results = [r for r in executor.map(get_closing, opening_statements) if r]
         agent_closings = {name: closing for name, closing, _ in closing_results}
         transcript.extend([log for _, _, log in closing_results])
 
         # --- Summarization Phase (parallelized) ---
-        project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        summarizer_definitions_dir = os.path.join(project_root, "summarizer_definitions")
-        summarizer_name, summarizer_prompt = load_summarizer_from_directory(summarizer_definitions_dir)
-        from .llm_utils import call_openai
         def get_summary(agent_opening):
-            from .llm_utils import call_openai
             agent, opening = agent_opening
-            agent_rebuttals = rebuttals[agent.name]
-            rebuttals_against = []
-            for other_agent, rebuttal_list in rebuttals.items():
-                for r in rebuttal_list:
-                    if r["target"] == agent.name:
-                        rebuttals_against.append({"from": other_agent, "text": r["text"]})
-            summarization_input = (
-                f"Opening Statement: {opening}\n"
-                f"Rebuttals made: {'; '.join([r['text'] for r in agent_rebuttals])}\n"
-                f"Rebuttals received: {'; '.join([r['text'] for r in rebuttals_against])}"
-                f"\nClosing Statement: {agent_closings.get(agent.name, '')}"
-            )
-            result = call_openai(summarizer_prompt, summarization_input, return_usage=True)
-            summary = result['response']
-            usage = result.get('usage', {})
-            token_usage["summary"].append(usage)
-            print(f"{agent.name} Summary: {summary}")
-            if usage:
-                print(f"  [Tokens: prompt={usage.get('prompt_tokens', 0)}, completion={usage.get('completion_tokens', 0)}, total={usage.get('total_tokens', 0)}]")
-            return agent.name, summary, {"phase": "summary", "agent": agent.name, "text": summary, "token_usage": usage}
+            summarization_input = self._summary_input(agent, opening, rebuttals, agent_closings)
+            try:
+                result = call_openai(summarizer_prompt, summarization_input, return_usage=True)
+            except RateLimitExceeded as e:
+                return self._skip_turn(failed_turns, "summary", agent.name, e)
+            return self._record_summary(agent, result, token_usage)
 
         with concurrent.futures.ThreadPoolExecutor(max_workers=get_phase_parallel("summary", max_parallel)) as executor:
-            summary_results = list(executor.map(get_summary, opening_statements))
+            summary_results = [r for r in executor.map(get_summary, self._closed(opening_statements, agent_closings)) if r]
         agent_summaries = {name: summary for name, summary, _ in summary_results}
         transcript.extend([log for _, _, log in summary_results])
+        self._print_agent_summaries(agent_summaries)
+
+        # --- Judging Phase ---
+        # Judges receive ONLY agent_summaries (not full transcript or debate data) for evaluation
+        def get_judge_result(judge):
+            try:
+                judge_result = judge.judge(agent_summaries, transcript, return_usage=True)
+            except RateLimitExceeded as e:
+                return self._skip_turn(failed_turns, "judge", judge.name, e)
+            return self._record_judge_result(judge, judge_result, token_usage)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=get_phase_parallel("judging", max_parallel)) as executor:
+            judge_results = [r for r in executor.map(get_judge_result, self.judges) if r] # Judging phase parallelism
+
+        outcome = self._tally_judging(judge_results, transcript)
+        self._print_token_summary(token_usage)
+
+        # --- Final Debate Win Summary ---
+        print("\n=== Final Debate Summary ===")
+        final_summary_input = self._final_summary_input(prompt, agent_summaries, outcome)
+        try:
+            final_summary_result = call_openai(final_summarizer_prompt, final_summary_input, return_usage=True)
+        except RateLimitExceeded as e:
+            final_summary_result = self._skip_turn(failed_turns, "final-summary", "Final summarizer", e)
+
+        log_entry = self._complete_debate(
+            prompt, opening_statements, rebuttals, agent_summaries, outcome,
+            transcript, final_summary_result
+        )
+        self._persist_debate(prompt, log_entry)
+        return dict(log_entry, token_usage=token_usage, failed_turns=failed_turns)
+
+    async def async_run(self, prompt: str, max_parallel: int = 1,
+                        per_agent_parallel: Optional[Dict[str, int]] = None,
+                        stream: Optional[bool] = None,
+                        llm_slots: Optional[asyncio.Semaphore] = None) -> Dict[str, Any]:
+        """
+        Run the same debate as run() on a single asyncio event loop using AsyncOpenAI.
+        Each phase is bounded by its own semaphore (PARALLEL_AGENTS_<PHASE>, then PARALLEL_AGENTS,
+        then max_parallel), so many debates can share one thread without spawning thread pools.
+        Args:
+            prompt (str): The philosophical prompt to debate
+            max_parallel (int): Default per-phase concurrency when no environment override is set
+            per_agent_parallel (dict): Optional {agent_name: cap} on concurrent rebuttals per critic
+            stream (bool): Stream opening and closing statements live (default: STREAM_OUTPUT)
+            llm_slots (asyncio.Semaphore): Optional semaphore shared by several concurrent debates that
+                                           bounds their LLM calls in total, on top of the per-phase caps
+        Returns:
+            dict: The debate log entry plus per-phase token_usage and failed_turns, identical in shape to run()
+        """
+        from .llm_utils import async_client_session
+
+        # The loop's AsyncOpenAI clients are closed once no debate on it uses them any more
+        async with async_client_session():
+            return await self._async_run(prompt, max_parallel, per_agent_parallel, stream, llm_slots)
+
+    async def _async_run(self, prompt: str, max_parallel: int,
+                         per_agent_parallel: Optional[Dict[str, int]],
+                         stream: Optional[bool],
+                         llm_slots: Optional[asyncio.Semaphore]) -> Dict[str, Any]:
+        """The body of async_run()."""
+        from .llm_utils import async_call_openai, RateLimitExceeded
+
+        transcript = []
+        token_usage = {phase: [] for phase in TOKEN_USAGE_PHASES}
+        failed_turns = []
+        summarizer_prompt, final_summarizer_prompt = self._load_summarizer_prompts()
+        printer = StreamPrinter() if (get_stream_output() if stream is None else stream) else None
+        semaphores = {
+            phase: asyncio.Semaphore(max(1, get_phase_parallel(phase, max_parallel)))
+            for phase in ["opening", "rebuttal", "closing", "summary", "judging"]
+        }
+
+        shared_slots = llm_slots or contextlib.nullcontext()
+
+        async def call(phase, system_prompt, user_prompt, on_token=None):
+            async with semaphores[phase], shared_slots:
+                return await async_call_openai(system_prompt, user_prompt, return_usage=True, on_token=on_token)
+
+        async def get_opening(agent):
+            live = self._open_stream(printer, agent, "Opening")
+            try:
+                result = await call("opening", *self._opening_prompts(agent, prompt), on_token=live)
+            except RateLimitExceeded as e:
+                return self._skip_turn(failed_turns, "opening", agent.name, e, live=live)
+            return self._record_opening(agent, result, token_usage, live)
+
+        opening_results = [r for r in await asyncio.gather(*(get_opening(agent) for agent in self.agents)) if r]
+        opening_statements = [(agent, response) for agent, response, _ in opening_results]
+        transcript.extend([log for _, _, log in opening_results])
+
+        # --- Rebuttal Phase (one task per critic/target pair) ---
+        pairs, schedule = self._rebuttal_pairs(opening_statements)
+        agent_semaphores = {
+            name: asyncio.Semaphore(limit)
+            for name, limit in self._per_agent_limits(per_agent_parallel).items()
+        }
+
+        async def get_rebuttal(index):
+            agent, other_agent, other_opening = pairs[index]
+            system_prompt, user_prompt = self._rebuttal_prompts(agent, other_opening)
+            semaphore = agent_semaphores.get(agent.name)
+            try:
+                if semaphore is None:
+                    result = await call("rebuttal", system_prompt, user_prompt)
+                else:
+                    async with semaphore:
+                        result = await call("rebuttal", system_prompt, user_prompt)
+            except RateLimitExceeded as e:
+                return index, self._skip_turn(failed_turns, "rebuttal", agent.name, e, target=other_agent.name)
+            return index, self._record_rebuttal(agent, other_agent, result, token_usage)
+
+        pair_results = dict(await asyncio.gather(*(get_rebuttal(index) for index in schedule)))
+        rebuttals, rebuttal_logs = self._collect_rebuttals(opening_statements, pairs, pair_results)
+        transcript.extend(rebuttal_logs)
+
+        # --- Closing Statement Phase ---
+        async def get_closing(agent_opening):
+            agent, opening = agent_opening
+            live = self._open_stream(printer, agent, "Closing")
+            try:
+                result = await call("closing", *self._closing_prompts(agent, opening, rebuttals), on_token=live)
+            except RateLimitExceeded as e:
+                return self._skip_turn(failed_turns, "closing", agent.name, e, live=live)
+            return self._record_closing(agent, result, token_usage, live)
+
+        closing_results = [r for r in await asyncio.gather(*(get_closing(ao) for ao in opening_statements)) if r]
+        agent_closings = {name: closing for name, closing, _ in closing_results}
+        transcript.extend([log for _, _, log in closing_results])
+
+        # --- Summarization Phase ---
+        async def get_summary(agent_opening):
+            agent, opening = agent_opening
+            summarization_input = self._summary_input(agent, opening, rebuttals, agent_closings)
+            try:
+                result = await call("summary", summarizer_prompt, summarization_input)
+            except RateLimitExceeded as e:
+                return self._skip_turn(failed_turns, "summary", agent.name, e)
+            return self._record_summary(agent, result, token_usage)
+
+        summary_results = [r for r in await asyncio.gather(*(get_summary(ao) for ao in self._closed(opening_statements, agent_closings))) if r]
+        agent_summaries = {name: summary for name, summary, _ in summary_results}
+        transcript.extend([log for _, _, log in summary_results])
+        self._print_agent_summaries(agent_summaries)
+
+        # --- Judging Phase ---
+        async def get_judge_result(judge):
+            try:
+                async with semaphores["judging"], shared_slots:
+                    judge_result = await judge.async_judge(agent_summaries, transcript, return_usage=True)
+            except RateLimitExceeded as e:
+                return self._skip_turn(failed_turns, "judge", judge.name, e)
+            return self._record_judge_result(judge, judge_result, token_usage)
+
+        judge_results = [r for r in await asyncio.gather(*(get_judge_result(judge) for judge in self.judges)) if r]
+
+        outcome = self._tally_judging(judge_results, transcript)
+        self._print_token_summary(token_usage)
+
+        # --- Final Debate Win Summary ---
+        print("\n=== Final Debate Summary ===")
+        final_summary_input = self._final_summary_input(prompt, agent_summaries, outcome)
+        try:
+            async with shared_slots:
+                final_summary_result = await async_call_openai(final_summarizer_prompt, final_summary_input, return_usage=True)
+        except RateLimitExceeded as e:
+            final_summary_result = self._skip_turn(failed_turns, "final-summary", "Final summarizer", e)
+
+        log_entry = self._complete_debate(
+            prompt, opening_statements, rebuttals, agent_summaries, outcome,
+            transcript, final_summary_result
+        )
+        # File writes and metrics are blocking; keep them off the event loop
+        await asyncio.to_thread(self._persist_debate, prompt, log_entry)
+        return dict(log_entry, token_usage=token_usage, failed_turns=failed_turns)
+
+    def run_dag(self, prompt: str, max_parallel: int = 1,
+                per_agent_parallel: Optional[Dict[str, int]] = None,
+                stream: Optional[bool] = None) -> Dict[str, Any]:
+        """
+        Run the same debate as run() as a dependency graph instead of barriered phases.
+        Each call starts as soon as its inputs exist: a rebuttal of B needs only B's opening,
+        A's closing needs A's opening and the rebuttals aimed at A, and A's summary needs A's
+        closing plus the rebuttals A wrote and received. Per-phase caps still apply.
+        Args:
+            prompt (str): The philosophical prompt to debate
+            max_parallel (int): Default per-phase concurrency when no environment override is set
+            per_agent_parallel (dict): Optional {agent_name: cap} on concurrent rebuttals per critic
+            stream (bool): Stream opening and closing statements live (default: STREAM_OUTPUT)
+        Returns:
+            dict: The debate log entry plus token_usage, failed_turns and a "schedule" timing report
+        """
+        from .llm_utils import call_openai, RateLimitExceeded
+
+        token_usage = {phase: [] for phase in TOKEN_USAGE_PHASES}
+        failed_turns = []
+        summarizer_prompt, final_summarizer_prompt = self._load_summarizer_prompts()
+        printer = StreamPrinter() if (get_stream_output() if stream is None else stream) else None
+        pool_limits = {
+            phase: get_phase_parallel(phase, max_parallel)
+            for phase in ["opening", "rebuttal", "closing", "summary", "judging"]
+        }
+        for name, limit in self._per_agent_limits(per_agent_parallel).items():
+            pool_limits[f"rebuttal:{name}"] = limit
+        scheduler = DAGScheduler(max_workers=sum(pool_limits[phase] for phase in ["opening", "rebuttal", "closing", "summary", "judging"]),
+                                 pool_limits=pool_limits)
+        names = [agent.name for agent in self.agents]
+
+        # A turn whose call is still rate limited after every retry yields None, and so does every
+        # turn that needs it (an agent's rebuttals of a missing opening, its closing and its summary)
+
+        def opening_task(agent):
+            def fn(inputs):
+                live = self._open_stream(printer, agent, "Opening")
+                try:
+                    result = call_openai(*self._opening_prompts(agent, prompt), return_usage=True, on_token=live)
+                except RateLimitExceeded as e:
+                    return self._skip_turn(failed_turns, "opening", agent.name, e, live=live)
+                return self._record_opening(agent, result, token_usage, live)
+            return fn
+
+        def rebuttal_task(agent, other_agent):
+            def fn(inputs):
+                # The critic's own opening runs alongside: skip the call if it already failed
+                if inputs[f"opening:{other_agent.name}"] is None or {"phase": "opening", "name": agent.name} in failed_turns:
+                    return None
+                _, other_opening, _ = inputs[f"opening:{other_agent.name}"]
+                try:
+                    result = call_openai(*self._rebuttal_prompts(agent, other_opening), return_usage=True)
+                except RateLimitExceeded as e:
+                    return self._skip_turn(failed_turns, "rebuttal", agent.name, e, target=other_agent.name)
+                return self._record_rebuttal(agent, other_agent, result, token_usage)
+            return fn
+
+        def rebuttals_from(inputs, agent_name):
+            """Partial {critic: [rebuttals]} map built from the rebuttal results in inputs."""
+            rebuttals = {name: [] for name in names}
+            for name in names:
+                for other in names:
+                    key = f"rebuttal:{name}->{other}"
+                    if inputs.get(key) is not None:
+                        rebuttals[name].append(inputs[key][0])
+            return rebuttals
+
+        def closing_task(agent):
+            def fn(inputs):
+                if inputs[f"opening:{agent.name}"] is None:
+                    return None
+                _, opening, _ = inputs[f"opening:{agent.name}"]
+                system_prompt, user_prompt = self._closing_prompts(agent, opening, rebuttals_from(inputs, agent.name))
+                live = self._open_stream(printer, agent, "Closing")
+                try:
+                    result = call_openai(system_prompt, user_prompt, return_usage=True, on_token=live)
+                except RateLimitExceeded as e:
+                    return self._skip_turn(failed_turns, "closing", agent.name, e, live=live)
+                return self._record_closing(agent, result, token_usage, live)
+            return fn
+
+        def summary_task(agent):
+            def fn(inputs):
+                if inputs[f"closing:{agent.name}"] is None:
+                    return None
+                _, opening, _ = inputs[f"opening:{agent.name}"]
+                _, closing, _ = inputs[f"closing:{agent.name}"]
+                summarization_input = self._summary_input(agent, opening, rebuttals_from(inputs, agent.name), {agent.name: closing})
+                try:
+                    result = call_openai(summarizer_prompt, summarization_input, return_usage=True)
+                except RateLimitExceeded as e:
+                    return self._skip_turn(failed_turns, "summary", agent.name, e)
+                return self._record_summary(agent, result, token_usage)
+            return fn
+
+        def judge_task(judge):
+            def fn(inputs):
+                agent_summaries = {name: inputs[f"summary:{name}"][1] for name in names
+                                   if inputs[f"summary:{name}"] is not None}
+                try:
+                    judge_result = judge.judge(agent_summaries, [], return_usage=True)
+                except RateLimitExceeded as e:
+                    return self._skip_turn(failed_turns, "judge", judge.name, e)
+                return self._record_judge_result(judge, judge_result, token_usage)
+            return fn
+
+        # --- Build the graph: every node declares exactly the results it reads ---
+        for agent in self.agents:
+            scheduler.add(f"opening:{agent.name}", opening_task(agent), pools=["opening"])
+        for agent in self.agents:
+            for other_agent in self.agents:
+                if agent != other_agent:
+                    scheduler.add(f"rebuttal:{agent.name}->{other_agent.name}", rebuttal_task(agent, other_agent),
+                                  deps=[f"opening:{other_agent.name}"],
+                                  pools=["rebuttal", f"rebuttal:{agent.name}"])
+        for agent in self.agents:
+            received = [f"rebuttal:{other}->{agent.name}" for other in names if other != agent.name]
+            scheduler.add(f"closing:{agent.name}", closing_task(agent),
+                          deps=[f"opening:{agent.name}"] + received, pools=["closing"])
+        for agent in self.agents:
+            made = [f"rebuttal:{agent.name}->{other}" for other in names if other != agent.name]
+            received = [f"rebuttal:{other}->{agent.name}" for other in names if other != agent.name]
+            scheduler.add(f"summary:{agent.name}", summary_task(agent),
+                          deps=[f"opening:{agent.name}", f"closing:{agent.name}"] + made + received,
+                          pools=["summary"])
+        for judge in self.judges:
+            scheduler.add(f"judge:{judge.name}", judge_task(judge),
+                          deps=[f"summary:{name}" for name in names], pools=["judging"])
+
+        results = scheduler.run()
+
+        # --- Reassemble the transcript in the same order as the phased engines ---
+        transcript = []
+        opening_results = [results[f"opening:{name}"] for name in names if results[f"opening:{name}"]]
+        opening_statements = [(agent, response) for agent, response, _ in opening_results]
+        transcript.extend([log for _, _, log in opening_results])
+        pairs, _ = self._rebuttal_pairs(opening_statements)
+        pair_results = {
+            index: results[f"rebuttal:{agent.name}->{other_agent.name}"]
+            for index, (agent, other_agent, _) in enumerate(pairs)
+        }
+        rebuttals, rebuttal_logs = self._collect_rebuttals(opening_statements, pairs, pair_results)
+        transcript.extend(rebuttal_logs)
+        transcript.extend([results[f"closing:{name}"][2] for name in names if results[f"closing:{name}"]])
+        summary_results = [results[f"summary:{name}"] for name in names if results[f"summary:{name}"]]
+        agent_summaries = {name: summary for name, summary, _ in summary_results}
+        transcript.extend([log for _, _, log in summary_results])
+        self._print_agent_summaries(agent_summaries)
+        judge_results = [results[f"judge:{judge.name}"] for judge in self.judges if results[f"judge:{judge.name}"]]
+
+        outcome = self._tally_judging(judge_results, transcript)
+        self._print_token_summary(token_usage)
+        schedule = scheduler.report()
+        self._print_schedule_report(schedule)
+
+        # --- Final Debate Win Summary ---
+        print("\n=== Final Debate Summary ===")
+        final_summary_input = self._final_summary_input(prompt, agent_summaries, outcome)
+        try:
+            final_summary_result = call_openai(final_summarizer_prompt, final_summary_input, return_usage=True)
+        except RateLimitExceeded as e:
+            final_summary_result = self._skip_turn(failed_turns, "final-summary", "Final summarizer", e)
 
+        log_entry = self._complete_debate(
+            prompt, opening_statements, rebuttals, agent_summaries, outcome,
+            transcript, final_summary_result
+        )
+        self._persist_debate(prompt, log_entry)
+        return dict(log_entry, token_usage=token_usage, failed_turns=failed_turns, schedule=schedule)
+
+    @staticmethod
+    def _print_schedule_report(schedule: Dict[str, Any]) -> None:
+        print("\n=== Schedule Report ===")
+        print(f"Wall time: {schedule['wall_time']:.2f}s")
+        print(f"Critical path: {schedule['critical_path_time']:.2f}s over {len(schedule['critical_path'])} calls "
+              f"({' -> '.join(schedule['critical_path'])})")
+        print(f"Phase-barrier estimate: {schedule['barrier_estimate']:.2f}s "
+              f"(barriers would add {schedule['barrier_cost']:.2f}s)")
+        slowest = sorted(schedule["timings"], key=lambda t: t["duration"], reverse=True)[:5]
+        for timing in slowest:
+            print(f"  {timing['node']}: {timing['duration']:.2f}s (queued {timing['queued'] or 0:.2f}s)")
+
+    # --- Prompt construction shared by every execution engine ---
+
+    def _opening_prompts(self, agent, prompt: str) -> Tuple[str, str]:
+        """Return (system_prompt, user_prompt) for an agent's opening statement."""
+        if hasattr(agent, 'opening_statement'):
+            return agent.opening_prompt, prompt
+        return agent.analysis_prompt, prompt
+
+    def _rebuttal_prompts(self, agent, other_opening: str) -> Tuple[str, str]:
+        """Return (system_prompt, user_prompt) for an agent rebutting another agent's opening."""
+        if hasattr(agent, 'rebuttal'):
+            return agent.rebuttal_prompt, other_opening
+        return agent.critique_prompt, other_opening
+
+    @staticmethod
+    def _rebuttal_pairs(opening_statements) -> Tuple[List[Tuple[Any, Any, str]], List[int]]:
+        """
+        List every (critic, target, target_opening) pair and the order to schedule them in.
+        Pairs are listed in transcript order (grouped by critic); the schedule interleaves
+        critics round-robin so per-agent caps rarely leave workers waiting on one critic.
+        Returns:
+            (pairs, schedule): schedule is a permutation of indexes into pairs
+        """
+        n = len(opening_statements)
+        pairs = []
+        order_keys = []
+        for i, (agent, _) in enumerate(opening_statements):
+            for j, (other_agent, other_opening) in enumerate(opening_statements):
+                if agent != other_agent:
+                    pairs.append((agent, other_agent, other_opening))
+                    order_keys.append(((j - i) % n, i))
+        schedule = sorted(range(len(pairs)), key=lambda index: order_keys[index])
+        return pairs, schedule
+
+    def _per_agent_limits(self, per_agent_parallel: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+        """
+        Resolve per-critic rebuttal caps: explicit per_agent_parallel entries win over the
+        PARALLEL_REBUTTALS_PER_AGENT default. Agents without a positive cap are omitted.
+        """
+        default = get_rebuttal_per_agent_parallel()
+        overrides = per_agent_parallel or {}
+        limits = {}
+        for agent in self.agents:
+            limit = overrides.get(agent.name, default)
+            if limit and limit > 0:
+                limits[agent.name] = limit
+        return limits
+
+    @staticmethod
+    def _collect_rebuttals(opening_statements, pairs, pair_results) -> Tuple[Dict[str, List[Dict[str, str]]], List[Dict[str, Any]]]:
+        """
+        Reassemble per-pair rebuttal results into the {critic: [rebuttals]} map and transcript
+        logs, in the same critic-by-critic order regardless of completion order. Pairs whose result
+        is None (the call was skipped) are left out.
+        """
+        rebuttals = {agent.name: [] for agent, _ in opening_statements}
+        logs = []
+        for index, (agent, _, _) in enumerate(pairs):
+            if pair_results[index] is None:
+                continue
+            entry, log = pair_results[index]
+            rebuttals[agent.name].append(entry)
+            logs.append(log)
+        return rebuttals, logs
+
+    @staticmethod
+    def _rebuttals_against(agent_name: str, rebuttals: Dict[str, List[Dict[str, str]]]) -> List[Dict[str, str]]:
+        """Collect every rebuttal targeting agent_name as {"from": ..., "text": ...} entries."""
+        rebuttals_against = []
+        for other_agent, rebuttal_list in rebuttals.items():
+            for r in rebuttal_list:
+                if r["target"] == agent_name:
+                    rebuttals_against.append({"from": other_agent, "text": r["text"]})
+        return rebuttals_against
+
+    def _closing_prompts(self, agent, opening: str, rebuttals: Dict[str, List[Dict[str, str]]]) -> Tuple[str, str]:
+        """Return (system_prompt, user_prompt) for an agent's closing statement."""
+        rebuttals_against = self._rebuttals_against(agent.name, rebuttals)
+        # Compose worldview string (from agent definition)
+        worldview = getattr(agent, "worldview", None)
+        if worldview is None and hasattr(agent, "archetype"):
+            worldview = f"Archetype: {agent.archetype}"
+        closing_prompt = (
+            "You are to provide a closing response to the debate. "
+            "Consider your worldview, your opening statement, and the rebuttals you received. "
+            "Summarize your final position and address the main challenges raised against you.\n\n"
+            f"Worldview: {worldview}\n"
+            f"Opening Statement: {opening}\n"
+            f"Rebuttals Against You: {'; '.join([r['text'] for r in rebuttals_against])}"
+        )
+        # Use the agent's critique_prompt for closing, or fallback to analysis_prompt
+        prompt_to_use = getattr(agent, "closing_prompt", None) or getattr(agent, "critique_prompt", None) or getattr(agent, "analysis_prompt", None)
+        return prompt_to_use, closing_prompt
+
+    def _summary_input(self, agent, opening: str, rebuttals: Dict[str, List[Dict[str, str]]],
+                       agent_closings: Dict[str, str]) -> str:
+        """Build the summarizer input for one agent's debate contributions."""
+        agent_rebuttals = rebuttals[agent.name]
+        rebuttals_against = self._rebuttals_against(agent.name, rebuttals)
+        return (
+            f"Opening Statement: {opening}\n"
+            f"Rebuttals made: {'; '.join([r['text'] for r in agent_rebuttals])}\n"
+            f"Rebuttals received: {'; '.join([r['text'] for r in rebuttals_against])}"
+            f"\nClosing Statement: {agent_closings.get(agent.name, '')}"
+        )
+
+    def _final_summary_input(self, prompt: str, agent_summaries: Dict[str, str], outcome: Dict[str, Any]) -> str:
+        """Build the input for the final debate summary."""
+        judge_rationales = outcome["judge_rationales"]
+        winner = outcome["winner"]
+        return (
+            f"Debate Topic: {prompt}\n\n"
+            f"Agent Summaries:\n" + '\n'.join([f"{name}: {summary}" for name, summary in agent_summaries.items()]) + "\n\n"
+            f"Judge Rationales:\n" + '\n'.join([f"{j['judge']} ({j['rank']}): {j['agent']} - {j['rationale']} (+{j['points']} pts)" for j in judge_rationales]) + "\n\n"
+            f"Winner: {winner if winner else 'Tie'}\n"
+        )
+
+    def _load_summarizer_prompts(self) -> Tuple[str, str]:
+        """
+        Load the per-agent summarizer prompt and the final debate summarizer prompt.
+        Definitions are read from disk once per orchestrator.
+        Returns:
+            (summarizer_prompt, final_summarizer_prompt)
+        """
+        if self._summarizer_prompts is None:
+            self._summarizer_prompts = self._read_summarizer_prompts()
+        return self._summarizer_prompts
+
+    @staticmethod
+    def _read_summarizer_prompts() -> Tuple[str, str]:
+        project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        summarizer_definitions_dir = os.path.join(project_root, "summarizer_definitions")
+        summarizer_name, summarizer_prompt = load_summarizer_from_directory(summarizer_definitions_dir)
+        # Try to load FinalDebateSummary.md directly
+        final_summarizer_path = os.path.join(summarizer_definitions_dir, "FinalDebateSummary.md")
+        if os.path.exists(final_summarizer_path):
+            with open(final_summarizer_path, 'r') as f:
+                lines = f.readlines()
+                final_summarizer_name = lines[0].strip().lstrip('#').strip()
+                prompt_lines = []
+                in_code = False
+                for line in lines:
+                    if line.strip().startswith('```'):
+                        in_code = not in_code
+                        continue
+                    if in_code:
+                        prompt_lines.append(line)
+                final_summarizer_prompt = ''.join(prompt_lines).strip()
+        else:
+            final_summarizer_name, final_summarizer_prompt = load_summarizer_from_directory(summarizer_definitions_dir)
+        return summarizer_prompt, final_summarizer_prompt
+
+    # --- Result recording shared by every execution engine ---
+
+    _skip_turn = staticmethod(skip_turn)
+
+    @staticmethod
+    def _closed(opening_statements, agent_closings):
+        """The (agent, opening) pairs of the agents that made a closing statement."""
+        return [(agent, opening) for agent, opening in opening_statements if agent.name in agent_closings]
+
+    @staticmethod
+    def _print_usage(usage: Dict[str, Any]) -> None:
+        if usage:
+            ttft = f", first token={usage['time_to_first_token']:.2f}s" if "time_to_first_token" in usage else ""
+            print(f"  [Tokens: prompt={usage.get('prompt_tokens', 0)}, completion={usage.get('completion_tokens', 0)}, total={usage.get('total_tokens', 0)}{ttft}]")
+
+    @staticmethod
+    def _open_stream(printer, agent, phase):
+        """Live token sink for one agent's statement, or None when streaming is off."""
+        return printer.open(f"{agent.name} [{phase}]") if printer else None
+
+    def _record_opening(self, agent, result, token_usage, live=None):
+        response = result['response']
+        usage = result.get('usage', {})
+        token_usage["opening"].append(usage)
+        if live:
+            live.close()  # Text was already printed as it streamed
+        else:
+            print(f"{agent.name} ({agent.archetype}) [Opening]: {response}")
+        self._print_usage(usage)
+        return (agent, response, {"phase": "opening", "agent": agent.name, "text": response})
+
+    def _record_rebuttal(self, agent, other_agent, result, token_usage):
+        rebuttal = result['response']
+        usage = result.get('usage', {})
+        token_usage["rebuttal"].append(usage)
+        print(f"{agent.name} rebuts {other_agent.name}: {rebuttal}")
+        self._print_usage(usage)
+        return (
+            {"target": other_agent.name, "text": rebuttal},
+            {"phase": "rebuttal", "agent": agent.name, "target": other_agent.name, "text": rebuttal},
+        )
+
+    def _record_closing(self, agent, result, token_usage, live=None):
+        closing = result['response']
+        usage = result.get('usage', {})
+        token_usage["closing"].append(usage)
+        if live:
+            live.close()
+        else:
+            print(f"{agent.name} Closing: {closing}")
+        self._print_usage(usage)
+        return agent.name, closing, {"phase": "closing", "agent": agent.name, "text": closing, "token_usage": usage}
+
+    def _record_summary(self, agent, result, token_usage):
+        summary = result['response']
+        usage = result.get('usage', {})
+        token_usage["summary"].append(usage)
+        print(f"{agent.name} Summary: {summary}")
+        self._print_usage(usage)
+        return agent.name, summary, {"phase": "summary", "agent": agent.name, "text": summary, "token_usage": usage}
+
+    def _record_judge_result(self, judge, judge_result, token_usage):
+        result = judge_result['result']
+        usage = judge_result.get('usage', {})
+        token_usage["judge"].append(usage)
+        print(f"{judge.name} Judge Result:")
+        self._print_usage(usage)
+        return judge.name, result, usage
+
+    @staticmethod
+    def _print_agent_summaries(agent_summaries: Dict[str, str]) -> None:
         # Output all agent summaries to the console before judging
         print("\n=== Agent Summaries ===")
         for name, summary in agent_summaries.items():
             print(f"Summary for {name}:\n{summary}\n")
 
-        # --- Judging Phase ---
-        # Judges receive ONLY agent_summaries (not full transcript or debate data) for evaluation
+    def _tally_judging(self, judge_results, transcript) -> Dict[str, Any]:
+        """
+        Score ranked-choice judge votes and append votes and the result to the transcript.
+        Returns:
+            dict: {"judge_rationales": [...], "scores": {...}, "winner": str or None, "is_tie": bool}
+        """
         # --- Ranked-Choice Judging Phase ---
-        judge_ranks = []
         judge_rationales = []
-        from collections import defaultdict
         score_board = defaultdict(int)
-        agent_names = list(agent_summaries.keys())
-
-        def get_judge_result(judge):
-            judge_result = judge.judge(agent_summaries, transcript, return_usage=True)
-            result = judge_result['result']
-            usage = judge_result.get('usage', {})
-            token_usage["judge"].append(usage)
-            print(f"{judge.name} Judge Result:")
-            if usage:
-                print(f"  [Tokens: prompt={usage.get('prompt_tokens', 0)}, completion={usage.get('completion_tokens', 0)}, total={usage.get('total_tokens', 0)}]")
-            return judge.name, result, usage
-
-        with concurrent.futures.ThreadPoolExecutor(max_workers=get_phase_parallel("judging", max_parallel)) as executor:
-            judge_results = list(executor.map(get_judge_result, self.judges)) # Judging phase parallelism
 
         for judge_name, result, usage in judge_results:
             # Parse and display each rank
@@ -253,6 +789,7 @@ class OrchestratorAgent:
         for agent, score in sorted_scores:
             print(f"{agent}: {score} points")
         # Winner logic: agent with highest score, tie if two or more agents have the exact same top score
+        top_score = 0
         if not sorted_scores:
             winner = None
             is_tie = True
@@ -269,13 +806,16 @@ class OrchestratorAgent:
                 is_tie = True
         print(f"Judging result: {'Tie (no majority)' if is_tie else f'Winner is {winner} with {top_score} points.'}")
         transcript.append({"phase": "judging-result", "winner": winner, "scores": dict(score_board), "is_tie": is_tie, "judge_rationales": judge_rationales})
+        return {"judge_rationales": judge_rationales, "scores": dict(score_board), "winner": winner, "is_tie": is_tie}
 
+    @staticmethod
+    def _print_token_summary(token_usage: Dict[str, List[Dict[str, Any]]]) -> None:
         # --- Output total token usage summary ---
         def sum_tokens(usage_list, key):
             return sum(u.get(key, 0) for u in usage_list if u)
         print("\n=== Token Usage Summary ===")
         total_prompt = total_completion = total_total = 0
-        for phase in ["opening", "rebuttal", "summary", "judge"]:
+        for phase in TOKEN_USAGE_PHASES:
             phase_prompt = sum_tokens(token_usage[phase], "prompt_tokens")
             phase_completion = sum_tokens(token_usage[phase], "completion_tokens")
             phase_total = sum_tokens(token_usage[phase], "total_tokens")
@@ -283,46 +823,44 @@ class OrchestratorAgent:
             total_completion += phase_completion
             total_total += phase_total
             print(f"{phase.title()}: prompt={phase_prompt}, completion={phase_completion}, total={phase_total}")
-        print(f"TOTAL: prompt={total_prompt}, completion={total_completion}, total={total_total}\n")
+        print(f"TOTAL: prompt={total_prompt}, completion={total_completion}, total={total_total}")
+        # Response cache: entries carry cached=True/False only when LLM_CACHE is enabled
+        cache_flags = [u for phase in TOKEN_USAGE_PHASES for u in token_usage[phase] if u and "cached" in u]
+        if cache_flags:
+            hits = [u for u in cache_flags if u["cached"]]
+            print(f"Cache: hits={len(hits)}, misses={len(cache_flags) - len(hits)}, "
+                  f"tokens saved={sum_tokens(hits, 'total_tokens')}")
+        # Perceived latency: time to first token per phase (whole-response latency for non-streamed calls)
+        latencies = {
+            phase: [u["time_to_first_token"] for u in token_usage[phase] if u and "time_to_first_token" in u]
+            for phase in TOKEN_USAGE_PHASES
+        }
+        if any(latencies.values()):
+            print("Time to first token: " + ", ".join(
+                f"{phase} mean={sum(values) / len(values):.2f}s max={max(values):.2f}s"
+                for phase, values in latencies.items() if values
+            ))
+        # Rate limiter: time this debate's calls spent waiting on quotas, the concurrency window or backoff
+        throttled = [u for phase in TOKEN_USAGE_PHASES for u in token_usage[phase] if u and u.get("throttle_seconds")]
+        if throttled:
+            from .llm_utils import get_rate_limiter
+            limiter = get_rate_limiter().stats()
+            print(f"Throttled: calls={len(throttled)}, wait={sum_tokens(throttled, 'throttle_seconds'):.1f}s, "
+                  f"429s so far={limiter['rate_limited']}, concurrency window={limiter['concurrency_limit']}")
+        print()
 
-        # --- Final Debate Win Summary ---
-        print("\n=== Final Debate Summary ===")
-        summarizer_definitions_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "summarizer_definitions")
-        # Try to load FinalDebateSummary.md directly
-        final_summarizer_path = os.path.join(summarizer_definitions_dir, "FinalDebateSummary.md")
-        if os.path.exists(final_summarizer_path):
-            with open(final_summarizer_path, 'r') as f:
-                lines = f.readlines()
-                final_summarizer_name = lines[0].strip().lstrip('#').strip()
-                prompt_lines = []
-                in_code = False
-                for line in lines:
-                    if line.strip().startswith('```'):
-                        in_code = not in_code
-                        continue
-                    if in_code:
-                        prompt_lines.append(line)
-                final_summarizer_prompt = ''.join(prompt_lines).strip()
-        else:
-            final_summarizer_name, final_summarizer_prompt = load_summarizer_from_directory(summarizer_definitions_dir)
-        # Compose input for final summary
-        final_summary_input = (
-            f"Debate Topic: {prompt}\n\n"
-            f"Agent Summaries:\n" + '\n'.join([f"{name}: {summary}" for name, summary in agent_summaries.items()]) + "\n\n"
-            f"Judge Rationales:\n" + '\n'.join([f"{j['judge']} ({j['rank']}): {j['agent']} - {j['rationale']} (+{j['points']} pts)" for j in judge_rationales]) + "\n\n"
-            f"Winner: {winner if winner else 'Tie'}\n"
-        )
-        from .llm_utils import call_openai
-        final_summary_result = call_openai(final_summarizer_prompt, final_summary_input, return_usage=True)
-        final_summary = final_summary_result["response"]
-        final_summary_usage = final_summary_result.get("usage", {})
-        print(final_summary)
-        if final_summary_usage:
-            print(f"  [Tokens: prompt={final_summary_usage.get('prompt_tokens', 0)}, completion={final_summary_usage.get('completion_tokens', 0)}, total={final_summary_usage.get('total_tokens', 0)}]")
-        transcript.append({"phase": "final-summary", "text": final_summary, "token_usage": final_summary_usage})
-
-        # --- Persistent memory: log debate history ---
-        log_entry = {
+    def _complete_debate(self, prompt, opening_statements, rebuttals, agent_summaries, outcome,
+                         transcript, final_summary_result) -> Dict[str, Any]:
+        """Record the final summary (None if its call was skipped) and build the debate log entry."""
+        final_summary = None
+        if final_summary_result is not None:
+            final_summary = final_summary_result["response"]
+            final_summary_usage = final_summary_result.get("usage", {})
+            print(final_summary)
+            self._print_usage(final_summary_usage)
+            transcript.append({"phase": "final-summary", "text": final_summary, "token_usage": final_summary_usage})
+
+        return {
             "prompt": prompt,
             "opening_statements": [
                 {"agent": agent.name, "archetype": agent.archetype, "text": opening}
@@ -330,33 +868,23 @@ class OrchestratorAgent:
             ],
             "rebuttals": rebuttals,
             "agent_summaries": agent_summaries,
-            "judge_rationales": judge_rationales,
-            "winner": winner,
-            "is_tie": is_tie,
+            "judge_rationales": outcome["judge_rationales"],
+            "winner": outcome["winner"],
+            "is_tie": outcome["is_tie"],
             "transcript": transcript,
             "final_summary": final_summary
         }
-        log_path = os.path.join(os.path.dirname(__file__), "../../debate_history.jsonl")
-        with open(log_path, "a") as f:
-            # Persistent log step: write debate log entry
-            f.write(json.dumps(log_entry) + "\n")
-        
+
+    def _persist_debate(self, prompt: str, log_entry: Dict[str, Any]) -> None:
+        """Save the debate (record, indexes, agent memories and history log line) and compute its metrics."""
+        # --- Persistent memory: one write of the debate through the memory store ---
+        debate_id = self.memory_manager.save_debate(log_entry)
+        print(f"Debate saved with ID: {debate_id}")
+
         # --- Metrics Calculation: Automatically compute and print metrics for this debate ---
         try:
             from src.metrics.debate_metrics import DebateMetricsCalculator
-            import hashlib
-            # Generate a debate_id (hash of prompt + winner + date if available)
-            base_id = f"{prompt}-{winner}-{log_entry.get('date', '')}"
-            debate_id = hashlib.sha1(base_id.encode()).hexdigest()[:12]
-            # Save a debate record in memory/debates for metrics
-            import os
-            memory_dir = os.path.join(os.path.dirname(__file__), '../../memory')
-            os.makedirs(os.path.join(memory_dir, 'debates'), exist_ok=True)
-            debate_file = os.path.join(memory_dir, 'debates', f"{debate_id}.json")
-            with open(debate_file, "w") as df:
-                json.dump(log_entry, df, indent=2)
-            # Calculate and print metrics
-            metrics_calc = DebateMetricsCalculator(memory_dir=memory_dir)
+            metrics_calc = DebateMetricsCalculator(memory_manager=self.memory_manager)
             metrics_calc.calculate_metrics_for_debate(debate_id)
         except Exception as e:
             print(f"[Warning] Could not calculate metrics for debate: {e}")
@@ -367,15 +895,8 @@ class OrchestratorAgent:
         Keeps the agent's original tone and worldview.
         """
         # Find all rebuttals made against this agent
-        rebuttals_against = []
-        for other_agent, rebuttal_list in all_rebuttals.items():
-            for r in rebuttal_list:
-                if r["target"] == agent.name:
-                    rebuttals_against.append({"from": other_agent, "text": r["text"]})
+        rebuttals_against = self._rebuttals_against(agent.name, all_rebuttals)
         summary = f"Opening Statement: {opening}\n"
         summary += "Rebuttals made: " + "; ".join([r["text"] for r in agent_rebuttals]) + "\n"
         summary += "Rebuttals received: " + "; ".join([r["text"] for r in rebuttals_against])
         return summary
-
-        # Write debate log entry (fixed indentation)
-        # f.write(json.dumps(log_entry) + "\n")  # Removed this line as it was incorrectly indented
@@ -12,6 +12,9 @@ from pathlib import Path
 from .base import BaseAgent
 from .synthesis import SynthesisAgent
 from .agent_loader import load_agents_from_directory
+from .memory_context import MemoryContextBuilder
+from .orchestrator_dynamic import skip_turn
+from .rate_limiter import RateLimitExceeded
 from ..memory.memory_manager import MemoryManager
 
 
@@ -43,6 +46,8 @@ class OrchestratorWithMemory:
         
         # Initialize memory manager
         self.memory_manager = MemoryManager(memory_dir)
+        # Token-budgeted memory context per agent, cached per (agent, prompt) until a debate is saved
+        self.context_builder = MemoryContextBuilder(self.memory_manager)
         
     def run(self, prompt: str, max_parallel: int = 1):
         """
@@ -51,13 +56,17 @@ class OrchestratorWithMemory:
         Args:
             prompt (str): The philosophical prompt to debate
             max_parallel (int): Maximum number of parallel API calls (default: 1)
+
+        Returns:
+            dict: debate_id, responses, summary, memory_context and the failed_turns left out of the debate
         """
         # Find relevant past debates for context
         relevant_debates = self.memory_manager.get_relevant_debates(prompt)
-        debate_context = self._prepare_debate_context(relevant_debates)
+        context_stats = []
         
         responses = []
         critiques = []
+        failed_turns = []
         
         # Analysis phase: each agent responds to the prompt (potentially in parallel)
         if max_parallel <= 1:
@@ -68,10 +77,14 @@ class OrchestratorWithMemory:
                 
                 # Enhanced prompt with memory context
                 contextualized_prompt = self._enhance_prompt_with_memory(
-                    prompt, agent.name, debate_context, agent_memory
+                    prompt, agent.name, relevant_debates, agent_memory, context_stats
                 )
                 
-                response = agent.analyze_prompt(contextualized_prompt)
+                try:
+                    response = agent.analyze_prompt(contextualized_prompt)
+                except RateLimitExceeded as e:
+                    skip_turn(failed_turns, "analysis", agent.name, e)
+                    continue
                 print(f"{agent.name} ({agent.archetype}): {response}")
                 responses.append((agent, response))
         else:
@@ -86,7 +99,7 @@ class OrchestratorWithMemory:
                     
                     # Enhanced prompt with memory context
                     contextualized_prompt = self._enhance_prompt_with_memory(
-                        prompt, agent.name, debate_context, agent_memory
+                        prompt, agent.name, relevant_debates, agent_memory, context_stats
                     )
                     
                     future = executor.submit(agent.analyze_prompt, contextualized_prompt)
@@ -99,6 +112,8 @@ class OrchestratorWithMemory:
                         response = future.result()
                         print(f"{agent.name} ({agent.archetype}): {response}")
                         responses.append((agent, response))
+                    except RateLimitExceeded as e:
+                        skip_turn(failed_turns, "analysis", agent.name, e)
                     except Exception as e:
                         print(f"{agent.name} generated an error: {e}")
         
@@ -110,7 +125,11 @@ class OrchestratorWithMemory:
                     if agent != other_agent:
                         # Add context about agent's past critiques of this agent/position
                         critique_context = self._get_critique_context(agent.name, other_agent.name)
-                        critique = agent.critique(other_response + "\n\n" + critique_context)
+                        try:
+                            critique = agent.critique(other_response + "\n\n" + critique_context)
+                        except RateLimitExceeded as e:
+                            skip_turn(failed_turns, "critique", agent.name, e, target=other_agent.name)
+                            continue
                         print(f"{agent.name} critiques {other_agent.name}: {critique}")
                         critiques.append((agent, other_agent, critique))
         else:
@@ -137,6 +156,8 @@ class OrchestratorWithMemory:
                         critique = future.result()
                         print(f"{agent.name} critiques {other_agent.name}: {critique}")
                         critiques.append((agent, other_agent, critique))
+                    except RateLimitExceeded as e:
+                        skip_turn(failed_turns, "critique", agent.name, e, target=other_agent.name)
                     except Exception as e:
                         print(f"{agent.name} generated an error while critiquing {other_agent.name}: {e}")
         
@@ -160,88 +181,63 @@ class OrchestratorWithMemory:
         }
         
         debate_id = self.memory_manager.save_debate(debate_data)
+        self.context_builder.invalidate()
         print(f"\nDebate saved with ID: {debate_id}")
         
+        memory_context = self._report_context_tokens(context_stats)
+        
         return {
             "debate_id": debate_id,
             "responses": responses,
-            "summary": summary
+            "summary": summary,
+            "memory_context": memory_context,
+            "failed_turns": failed_turns
         }
     
-    def _prepare_debate_context(self, relevant_debates: List[Dict[str, Any]]) -> str:
+    def _enhance_prompt_with_memory(self, prompt: str, agent_name: str, relevant_debates: List[Dict[str, Any]],
+                                   agent_memory: Dict[str, Any], context_stats: Optional[List[Dict[str, Any]]] = None) -> str:
         """
-        Prepare a concise context summary from relevant past debates.
+        Enhance a prompt with memory context for a particular agent.
         
         Args:
-            relevant_debates: List of relevant debate data
+            prompt: Original debate prompt
+            agent_name: Name of the agent
+            relevant_debates: Past debates relevant to the prompt, most relevant first
+            agent_memory: Agent's memory data
+            context_stats: If given, the context's token statistics are appended to it
             
         Returns:
-            String with debate context information
+            Enhanced prompt with memory context, packed under the MEMORY_CONTEXT_TOKENS budget
         """
-        if not relevant_debates:
-            return ""
-            
-        context_parts = ["Previous relevant debates on this topic:"]
-        for i, debate in enumerate(relevant_debates, 1):
-            prompt = debate.get("prompt", "")
-            if len(prompt) > 100:
-                prompt = prompt[:97] + "..."
-                
-            context_parts.append(f"{i}. Prompt: \"{prompt}\"")
-            
-            # Add a few key positions from this debate
-            responses = debate.get("responses", [])
-            if responses:
-                context_parts.append("   Key positions:")
-                for j, resp in enumerate(responses[:3], 1):  # Limit to 3 responses
-                    agent = resp.get("agent", "Unknown")
-                    response = resp.get("response", "")
-                    if len(response) > 100:
-                        response = response[:97] + "..."
-                    context_parts.append(f"   {j}. {agent}: \"{response}\"")
-        
-        return "\n".join(context_parts)
+        context, stats = self.context_builder.build(agent_name, prompt, relevant_debates, agent_memory)
+        if context_stats is not None:
+            context_stats.append(stats)
+        if not context:
+            return prompt
+        return "\n".join([prompt, "\n", context])
     
-    def _enhance_prompt_with_memory(self, prompt: str, agent_name: str, 
-                                   debate_context: str, agent_memory: Dict[str, Any]) -> str:
+    def _report_context_tokens(self, context_stats: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
-        Enhance a prompt with memory context for a particular agent.
+        Print and return the memory context token usage of a debate.
         
         Args:
-            prompt: Original debate prompt
-            agent_name: Name of the agent
-            debate_context: Context from relevant debates
-            agent_memory: Agent's memory data
+            context_stats: Statistics of each agent's context (see MemoryContextBuilder.build)
             
         Returns:
-            Enhanced prompt with memory context
+            Totals over the agents: {"agents", "budget", "candidate_tokens", "context_tokens", "tokens_saved", "cache_hits"}
         """
-        # Extract topics from prompt
-        topics = self.memory_manager._extract_topics(prompt)
-        
-        context_parts = [prompt, "\n"]
-        
-        # Add context about relevant debates, if available
-        if debate_context:
-            context_parts.append("\n===== DEBATE CONTEXT =====")
-            context_parts.append(debate_context)
-        
-        # Add context about agent's past positions on related topics, if available
-        past_positions = []
-        for topic in topics:
-            position = self.memory_manager.get_agent_position(agent_name, topic)
-            if position:
-                if len(position) > 150:  # Limit length for brevity
-                    position = position[:147] + "..."
-                past_positions.append(f"- On \"{topic}\": {position}")
-        
-        if past_positions:
-            context_parts.append("\n===== YOUR PAST POSITIONS =====")
-            context_parts.append("You have previously expressed these views:")
-            context_parts.extend(past_positions)
-            context_parts.append("\nYou should maintain philosophical consistency with these positions unless you have a strong reason to evolve your thinking.")
-        
-        return "\n".join(context_parts)
+        totals = {
+            "agents": len(context_stats),
+            "budget": self.context_builder.token_budget,
+            "candidate_tokens": sum(stats["candidate_tokens"] for stats in context_stats),
+            "context_tokens": sum(stats["context_tokens"] for stats in context_stats),
+            "tokens_saved": sum(stats["tokens_saved"] for stats in context_stats),
+            "cache_hits": sum(1 for stats in context_stats if stats["cached"]),
+        }
+        print(f"Memory context: {totals['context_tokens']} tokens for {totals['agents']} agents "
+              f"(budget {totals['budget']} each) out of {totals['candidate_tokens']} candidate tokens; "
+              f"{totals['tokens_saved']} tokens saved")
+        return totals
     
     def _get_critique_context(self, critic_name: str, target_name: str) -> str:
         """
@@ -0,0 +1,284 @@
+"""
+rate_limiter.py - Client-side rate limiting and adaptive concurrency for LLM calls.
+
+A single AdaptiveLimiter is shared by every call_openai/async_call_openai in the process. It
+combines token buckets for requests-per-minute and tokens-per-minute with an AIMD concurrency
+window: the window grows by one slot per window of successful calls and halves on a 429, and
+shrinks gently when latency climbs well above its running baseline. Throttled and transient
+failures are retried with jittered exponential backoff, honouring Retry-After when present.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import openai
+
+# Errors worth retrying: throttling, timeouts, dropped connections and provider-side failures
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+
+class RateLimitExceeded(RuntimeError):
+    """Raised when a call is still throttled after every retry has been used."""
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at rate_per_minute. Reservations may overdraw the bucket;
+    the caller is told how long to wait until its reservation is covered. The default burst is one
+    second's worth, since providers enforce per-minute quotas over shorter windows.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else max(1.0, self.rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, amount: float) -> float:
+        """
+        Take `amount` tokens.
+        Returns:
+            Seconds the caller must wait before the reservation is covered (0 if available now)
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= min(amount, self.capacity)
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def adjust(self, delta: float) -> None:
+        """Return (positive) or charge (negative) tokens after the true cost is known."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.capacity, self.tokens + delta)
+
+
+class AdaptiveLimiter:
+    """Shared RPM/TPM limiter with an AIMD concurrency window and retry/backoff."""
+
+    def __init__(self, rpm: int = 0, tpm: int = 0, max_concurrency: int = 16, min_concurrency: int = 1,
+                 max_retries: int = 8, base_delay: float = 1.0, max_delay: float = 60.0,
+                 latency_factor: float = 3.0):
+        """
+        Args:
+            rpm: Requests per minute quota (0 = unlimited)
+            tpm: Tokens per minute quota (0 = unlimited)
+            max_concurrency: Upper bound of the concurrency window
+            min_concurrency: Lower bound of the concurrency window
+            max_retries: Retries per call for throttled or transient failures
+            base_delay: First backoff delay in seconds (doubled per attempt, with full jitter)
+            max_delay: Cap on a single backoff delay
+            latency_factor: Shrink the window when a call takes this many times the baseline latency
+        """
+        self.request_bucket = TokenBucket(rpm) if rpm else None
+        self.token_bucket = TokenBucket(tpm) if tpm else None
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.latency_factor = latency_factor
+
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self.latency_baseline: Optional[float] = None
+        self._cond = threading.Condition()
+        # Coroutines waiting for a slot, as (loop, future): the limiter is shared by threads and by
+        # event loops in any thread, so a release wakes them through their own loop
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._stats = {"calls": 0, "retries": 0, "rate_limited": 0, "throttle_seconds": 0.0}
+
+    # --- Concurrency window ---
+
+    def _acquire_slot(self) -> float:
+        start = time.monotonic()
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+        return time.monotonic() - start
+
+    async def _async_acquire_slot(self) -> float:
+        start = time.monotonic()
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._cond:
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return time.monotonic() - start
+                waiter = (loop, loop.create_future())
+                self._async_waiters.append(waiter)
+            try:
+                await waiter[1]
+            finally:
+                with self._cond:
+                    if waiter in self._async_waiters:
+                        self._async_waiters.remove(waiter)
+
+    @staticmethod
+    def _wake(future: asyncio.Future) -> None:
+        if not future.done():
+            future.set_result(None)
+
+    def _release_slot(self, latency: Optional[float], rate_limited: bool) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            if rate_limited:
+                # Multiplicative decrease on throttling
+                self.limit = max(self.min_concurrency, self.limit / 2)
+            elif latency is not None:
+                if self.latency_baseline is None:
+                    self.latency_baseline = latency
+                elif latency > self.latency_factor * self.latency_baseline:
+                    # Latency far above baseline: back off gently before the provider starts returning 429s
+                    self.limit = max(self.min_concurrency, self.limit * 0.9)
+                else:
+                    # Additive increase: about one extra slot per window of successful calls
+                    self.limit = min(self.max_concurrency, self.limit + 1.0 / self.limit)
+                    self.latency_baseline = 0.9 * self.latency_baseline + 0.1 * latency
+            self._cond.notify_all()
+            waiters, self._async_waiters = self._async_waiters, []
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(self._wake, future)
+            except RuntimeError:
+                pass  # Loop already closed
+
+    # --- Quotas ---
+
+    def _reserve_quota(self, estimated_tokens: int) -> float:
+        wait = 0.0
+        if self.request_bucket:
+            wait = max(wait, self.request_bucket.reserve(1))
+        if self.token_bucket and estimated_tokens:
+            wait = max(wait, self.token_bucket.reserve(estimated_tokens))
+        return wait
+
+    def _settle_tokens(self, estimated_tokens: int, actual_tokens: Optional[int]) -> None:
+        if self.token_bucket and estimated_tokens and actual_tokens is not None:
+            # reserve() charged at most one bucket's worth; settle against what was actually taken
+            charged = min(estimated_tokens, self.token_bucket.capacity)
+            self.token_bucket.adjust(charged - actual_tokens)
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """Full-jitter exponential backoff, never shorter than the provider's Retry-After."""
+        retry_after = 0.0
+        response = getattr(error, "response", None)
+        if response is not None:
+            try:
+                retry_after = float(response.headers.get("retry-after"))
+            except (TypeError, ValueError):
+                retry_after = 0.0
+        jitter = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        return min(self.max_delay, retry_after + jitter)
+
+    def _record(self, throttled: float, retries: int = 0, rate_limited: int = 0) -> None:
+        with self._cond:
+            self._stats["throttle_seconds"] += throttled
+            self._stats["retries"] += retries
+            self._stats["rate_limited"] += rate_limited
+
+    def _retry_or_raise(self, attempt: int, error: Exception, throttled: float) -> None:
+        """Count a failed attempt; raise once it was the last one allowed."""
+        rate_limited = isinstance(error, openai.RateLimitError)
+        self._record(0.0, retries=1, rate_limited=int(rate_limited))
+        if attempt == self.max_retries:
+            self._record(throttled)
+            if rate_limited:
+                raise RateLimitExceeded(f"Still rate limited after {self.max_retries} retries: {error}") from error
+            raise error
+
+    # --- Public API ---
+
+    def call(self, fn: Callable[[], Any], estimated_tokens: int = 0,
+             usage_tokens: Callable[[Any], Optional[int]] = lambda result: None):
+        """
+        Run fn() under the limiter, retrying throttled/transient failures.
+        Args:
+            fn: Zero-argument callable performing one LLM request
+            estimated_tokens: Tokens to reserve against the TPM quota up front
+            usage_tokens: Extracts the real token count from fn's result to settle the reservation
+        Returns:
+            (result, throttle_seconds): fn's result and the time this call spent throttled
+        Raises:
+            RateLimitExceeded: still rate limited after max_retries
+            Exception: the last transient error after max_retries, or any non-retryable error
+        """
+        throttled = 0.0
+        for attempt in range(self.max_retries + 1):
+            throttled += self._acquire_slot()
+            wait = self._reserve_quota(estimated_tokens)
+            if wait:
+                time.sleep(wait)
+                throttled += wait
+            start = time.monotonic()
+            latency, error = None, None
+            try:
+                result = fn()
+                latency = time.monotonic() - start
+            except RETRYABLE_ERRORS as e:
+                error = e
+            finally:
+                # Also on errors that are not retried and on KeyboardInterrupt/SystemExit
+                self._release_slot(latency, isinstance(error, openai.RateLimitError))
+            if error is not None:
+                self._retry_or_raise(attempt, error, throttled)
+                delay = self._backoff(attempt, error)
+                time.sleep(delay)
+                throttled += delay
+                continue
+            self._settle_tokens(estimated_tokens, usage_tokens(result))
+            with self._cond:
+                self._stats["calls"] += 1
+            self._record(throttled)
+            return result, throttled
+
+    async def acall(self, coro_fn: Callable[[], Awaitable[Any]], estimated_tokens: int = 0,
+                    usage_tokens: Callable[[Any], Optional[int]] = lambda result: None):
+        """Asynchronous counterpart of call(); coro_fn returns a fresh awaitable per attempt."""
+        throttled = 0.0
+        for attempt in range(self.max_retries + 1):
+            throttled += await self._async_acquire_slot()
+            wait = self._reserve_quota(estimated_tokens)
+            if wait:
+                await asyncio.sleep(wait)
+                throttled += wait
+            start = time.monotonic()
+            latency, error = None, None
+            try:
+                result = await coro_fn()
+                latency = time.monotonic() - start
+            except RETRYABLE_ERRORS as e:
+                error = e
+            finally:
+                self._release_slot(latency, isinstance(error, openai.RateLimitError))
+            if error is not None:
+                self._retry_or_raise(attempt, error, throttled)
+                delay = self._backoff(attempt, error)
+                await asyncio.sleep(delay)
+                throttled += delay
+                continue
+            self._settle_tokens(estimated_tokens, usage_tokens(result))
+            with self._cond:
+                self._stats["calls"] += 1
+            self._record(throttled)
+            return result, throttled
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters since creation plus the current concurrency window."""
+        with self._cond:
+            return dict(self._stats, concurrency_limit=int(self.limit), in_flight=self.in_flight)
@@ -0,0 +1,5 @@
+"""
+Benchmarks for the Philosophical Multi-Agent Debate System.
+
+Each module is runnable with `python -m src.benchmarks.<name>` and prints its results.
+"""
@@ -0,0 +1,119 @@
+"""
+Benchmark: keyword scoring in DebateMetricsCalculator on debates with many agents.
+
+Compares the previous perspective diversity and philosophical depth scoring (one lowercase and
+str.count pass per keyword and agent, and a pairwise agent loop re-lowercasing both analyses for
+every pair) with the current one (KEYWORD_SCANNER features computed once per debate and shared by
+both metrics), on synthetic debates whose agents write analyses of --chars characters, and checks
+that both give the same scores.
+
+Usage:
+    python -m src.benchmarks.debate_metrics [--agents 4,16,64,256] [--chars N] [--debates N]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+
+from src.metrics.debate_metrics import CONCEPTS, PHILOSOPHERS, TRADITIONS, DebateMetricsCalculator
+
+FILLER = ("the question of whether we ought to act depends on how one weighs duties against outcomes "
+          "and what reasons we can give to others when we explain our choices in public life").split()
+
+
+def _analysis(rng: random.Random, chars: int, disagrees: bool) -> str:
+    """Prose of about `chars` characters with a sprinkling of metric keywords, mixed case."""
+    keywords = PHILOSOPHERS + CONCEPTS + TRADITIONS
+    words, size = [], 0
+    while size < chars:
+        word = rng.choice(keywords) if rng.random() < 0.04 else rng.choice(FILLER)
+        word = word.capitalize() if rng.random() < 0.1 else word
+        words.append(word)
+        size += len(word) + 1
+    if disagrees:
+        words.insert(rng.randrange(len(words)), "I disagree")
+    return " ".join(words)
+
+
+def _debate(rng: random.Random, agents: int, chars: int) -> dict:
+    # Only the last agent disagrees: the previous pairwise loop scans almost every pair
+    return {"agents": [{"name": f"Agent{i:03d}", "analysis": _analysis(rng, chars, i == agents - 1)}
+                       for i in range(agents)]}
+
+
+def previous_diversity(debate: dict) -> float:
+    """calculate_perspective_diversity before KEYWORD_SCANNER."""
+    agents = debate.get("agents", [])
+    if not agents:
+        return 0.0
+    traditions = set()
+    for agent in agents:
+        analysis = agent.get("analysis", "").lower()
+        for keyword in TRADITIONS:
+            if keyword in analysis:
+                traditions.add(keyword)
+    diversity_score = min(len(traditions) / 8, 1.0)
+    has_disagreement = False
+    for agent in agents:
+        for other_agent in agents:
+            if agent != other_agent:
+                if "disagree" in agent.get("analysis", "").lower() or "contrary" in agent.get("analysis", "").lower():
+                    has_disagreement = True
+                    break
+    if has_disagreement:
+        diversity_score = min(diversity_score + 0.2, 1.0)
+    return diversity_score
+
+
+def previous_depth(debate: dict) -> float:
+    """calculate_philosophical_depth before KEYWORD_SCANNER."""
+    philosopher_mentions = 0
+    concept_mentions = 0
+    for agent in debate.get("agents", []):
+        analysis = agent.get("analysis", "").lower()
+        for philosopher in PHILOSOPHERS:
+            philosopher_mentions += analysis.count(philosopher)
+        for concept in CONCEPTS:
+            concept_mentions += analysis.count(concept)
+    return min(philosopher_mentions / 5, 1.0) * 0.5 + min(concept_mentions / 10, 1.0) * 0.5
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark debate keyword metrics")
+    parser.add_argument("--agents", default="4,16,64,256", help="Comma-separated agent counts")
+    parser.add_argument("--chars", type=int, default=2700, help="Characters per agent analysis")
+    parser.add_argument("--debates", type=int, default=5, help="Debates timed per agent count")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as memory_dir:
+        calculator = DebateMetricsCalculator(memory_dir)
+
+        def current(debate: dict) -> tuple:
+            features = calculator.keyword_features(debate)
+            return (calculator.calculate_perspective_diversity(debate, features),
+                    calculator.calculate_philosophical_depth(debate, features))
+
+        def previous(debate: dict) -> tuple:
+            return previous_diversity(debate), previous_depth(debate)
+
+        print(f"{'agents':>6} {'previous ms':>12} {'current ms':>11} {'speedup':>8}")
+        mismatches = 0
+        for agents in (int(n) for n in args.agents.split(",")):
+            debates = [_debate(rng, agents, args.chars) for _ in range(args.debates)]
+            timings = {}
+            for name, score in (("previous", previous), ("current", current)):
+                start = time.perf_counter()
+                scores = [score(debate) for debate in debates]
+                timings[name] = (time.perf_counter() - start) / len(debates) * 1000
+                if name == "previous":
+                    expected = scores
+            mismatches += sum(score != exp for score, exp in zip(scores, expected))
+            print(f"{agents:>6} {timings['previous']:>12.2f} {timings['current']:>11.2f} "
+                  f"{timings['previous'] / timings['current']:>7.1f}x")
+        print("Scores identical" if not mismatches else f"FAILED: {mismatches} debates scored differently")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark: per-call latency of a fresh OpenAI client per call vs the pooled client registry.
+
+Usage:
+    python -m src.benchmarks.llm_client_pool [--calls N] [--latency SECONDS]
+"""
+
+import argparse
+import statistics
+import time
+
+from openai import OpenAI
+
+from src.config import settings
+from src.agents import llm_utils
+from src.benchmarks.mock_llm_server import MockLLMServer
+
+
+def _time_calls(fn, calls: int):
+    """Run fn `calls` times and return per-call latencies in milliseconds."""
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def _report(label: str, latencies) -> None:
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:<22} mean={statistics.mean(latencies):7.2f}ms  "
+          f"p50={statistics.median(latencies):7.2f}ms  p95={p95:7.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pooled vs per-call OpenAI clients")
+    parser.add_argument("--calls", type=int, default=200, help="Number of calls per variant")
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated server latency in seconds")
+    args = parser.parse_args()
+
+    with MockLLMServer(latency=args.latency) as server:
+        settings.LLM_CONFIG.update({"api_key": "mock-key", "base_url": server.base_url, "model_name": "gpt-3.5-turbo"})
+        messages = [{"role": "system", "content": "You are a Stoic."}, {"role": "user", "content": "What is virtue?"}]
+
+        def fresh_client_call():
+            client = OpenAI(api_key="mock-key", base_url=server.base_url)
+            client.chat.completions.create(model="gpt-3.5-turbo", messages=messages, max_tokens=64)
+
+        def pooled_call():
+            llm_utils.call_openai("You are a Stoic.", "What is virtue?")
+
+        # Warm up both paths once so imports and first-connection cost are excluded
+        fresh_client_call()
+        pooled_call()
+
+        print(f"Mock server at {server.base_url}, {args.calls} calls each\n")
+        fresh = _time_calls(fresh_client_call, args.calls)
+        pooled = _time_calls(pooled_call, args.calls)
+        _report("fresh client per call", fresh)
+        _report("pooled client", pooled)
+        print(f"\nSpeedup (mean): {statistics.mean(fresh) / statistics.mean(pooled):.2f}x")
+
+    llm_utils.close_clients()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark: MemoryManager startup cost with eager vs lazy cache loading.
+
+Builds a synthetic memory directory in the JSON layout (agent memories and both indexes for --debates
+debates; debate files are not needed for startup and are not written), then measures, each in a fresh
+process so peak RSS is comparable: constructing MemoryManager, the first get_agent_memory call, and
+a get_relevant_debates call that needs the relevance index.
+
+Usage:
+    python -m src.benchmarks.memory_startup [--debates N] [--agents N] [--dir PATH] [--backend json|segment|sqlite]
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+TOPICS = ["free will", "justice", "consciousness", "virtue", "truth", "beauty", "death", "god", "mind", "language"]
+
+
+def build_memory_dir(memory_dir: str, debates: int, agents: int, per_debate: int = 4, response_chars: int = 200) -> None:
+    """Write agent memories and indexes for a synthetic debate history, as MemoryManager.save_debate would."""
+    for sub in ("agents", "debates", "indexes"):
+        os.makedirs(os.path.join(memory_dir, sub), exist_ok=True)
+    names = [f"Agent{i:02d}" for i in range(agents)]
+    memories = {name: {"name": name, "debates": [], "positions": {}, "topics_addressed": []} for name in names}
+    debate_index, topic_index = [], {}
+    for d in range(debates):
+        debate_id = f"debate_{d:06d}"
+        timestamp = f"2025{(d // 28 // 24) % 12 + 1:02d}{d // 24 % 28 + 1:02d}_{d % 24:02d}0000"
+        topic = f"What about {TOPICS[d % len(TOPICS)]} in case {d % 500}"
+        keywords = sorted({TOPICS[d % len(TOPICS)].split()[0], f"case{d % 500}", "about"})
+        participants = [names[(d + i) % agents] for i in range(per_debate)]
+        debate_index.append({
+            "debate_id": debate_id, "id": debate_id, "timestamp": timestamp, "date": "Unknown",
+            "prompt": topic + ". Discuss.", "topic": topic, "topics": keywords, "agent_count": per_debate,
+            "agents": participants, "file_path": os.path.join(memory_dir, "debates", f"{debate_id}.json"),
+        })
+        for keyword in keywords:
+            topic_index.setdefault(keyword, []).append(debate_id)
+        for name in participants:
+            response = (f"{name} on {topic}: " + "reasoned argument " * response_chars)[:response_chars]
+            memory = memories[name]
+            memory["debates"].append({"debate_id": debate_id, "topic": topic, "prompt": topic + ". Discuss.",
+                                      "response": response, "timestamp": timestamp, "date": "Unknown"})
+            memory["positions"].setdefault(topic, []).append(
+                {"debate_id": debate_id, "date": "Unknown", "timestamp": timestamp, "position": response})
+            if topic not in memory["topics_addressed"]:
+                memory["topics_addressed"].append(topic)
+    for name, memory in memories.items():
+        with open(os.path.join(memory_dir, "agents", f"{name}.json"), "w") as f:
+            json.dump(memory, f, indent=2)
+    with open(os.path.join(memory_dir, "indexes", "debate_index.json"), "w") as f:
+        json.dump(debate_index, f, indent=2)
+    with open(os.path.join(memory_dir, "indexes", "topic_index.json"), "w") as f:
+        json.dump(topic_index, f, indent=2)
+
+
+def _measure(memory_dir: str, backend: str, lazy: bool) -> dict:
+    """Run in a child process: time startup and first lookups, report peak RSS."""
+    from src.memory import MemoryManager
+    start = time.perf_counter()
+    manager = MemoryManager(memory_dir, backend=backend, lazy=lazy)
+    startup = time.perf_counter() - start
+    start = time.perf_counter()
+    manager.get_agent_memory("Agent00")
+    first_agent = time.perf_counter() - start
+    start = time.perf_counter()
+    manager.get_relevant_debates("What about justice in case 7?", limit=0)
+    relevance_lookup = time.perf_counter() - start
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # KiB on Linux
+    return {"startup": startup, "first_agent": first_agent, "relevance_lookup": relevance_lookup, "rss_mb": rss_kb / 1024}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark eager vs lazy MemoryManager startup")
+    parser.add_argument("--debates", type=int, default=50000, help="Debates in the synthetic history")
+    parser.add_argument("--agents", type=int, default=12, help="Agents sharing the history (4 per debate)")
+    parser.add_argument("--dir", help="Memory directory to build or reuse (default: a temporary directory)")
+    parser.add_argument("--backend", choices=["json", "segment", "sqlite"], default="json", help="Storage backend")
+    parser.add_argument("--child", choices=["build", "eager", "lazy"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child == "build":
+        build_memory_dir(args.dir, args.debates, args.agents)
+        return
+    if args.child:
+        print(json.dumps(_measure(args.dir, args.backend, args.child == "lazy")))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        memory_dir = args.dir or os.path.join(tmp, "memory")
+        if not os.path.exists(os.path.join(memory_dir, "indexes", "debate_index.json")):
+            start = time.perf_counter()
+            # In a child process: peak RSS carries over from parent to child, so the parent stays small
+            subprocess.run([sys.executable, "-m", "src.benchmarks.memory_startup", "--dir", memory_dir,
+                            "--debates", str(args.debates), "--agents", str(args.agents), "--child", "build"],
+                           check=True)
+            print(f"Built {args.debates} debates for {args.agents} agents in {memory_dir} "
+                  f"({time.perf_counter() - start:.1f}s)")
+        if args.backend != "json":
+            # Migrate once up front so neither variant pays for it
+            subprocess.run([sys.executable, "-m", "src.utils.memory_store", "--memory-dir", memory_dir,
+                            "--backend", args.backend, "migrate"], check=True, stdout=subprocess.DEVNULL)
+
+        print(f"\n{'mode':<6} {'startup':>10} {'1st agent':>10} {'relevance':>10} {'peak RSS':>10}")
+        for mode in ("eager", "lazy"):
+            output = subprocess.run(
+                [sys.executable, "-m", "src.benchmarks.memory_startup", "--dir", memory_dir,
+                 "--backend", args.backend, "--child", mode],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{mode:<6} {result['startup'] * 1000:>8.1f}ms {result['first_agent'] * 1000:>8.1f}ms "
+                  f"{result['relevance_lookup'] * 1000:>8.1f}ms {result['rss_mb']:>8.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Stress test: several processes saving debates into one memory directory at once.
+
+Starts --writers processes (as several main_with_memory.py containers sharing a memory/ volume would),
+each saving --debates debates from --threads threads, all released at the same instant so many saves
+fall within the same second and contend for the same index and agent files. Afterwards a fresh
+MemoryManager checks that nothing was lost or overwritten: every debate has a distinct ID, a debate
+file, a debate index entry and topic index references, every agent memory lists every debate, and
+the relevance and vector indexes cover all of them. Exits with status 1 if a check fails.
+
+Usage:
+    python -m src.benchmarks.memory_writers [--writers N] [--threads N] [--debates N]
+                                            [--backend json|segment|sqlite] [--dir PATH]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+AGENTS = ["Stoic", "Skeptic", "Utilitarian"]  # Every debate involves all of them: worst-case contention
+
+
+def _prompt(writer: int, thread: int, number: int) -> str:
+    return f"Is marker w{writer}t{thread}n{number} compatible with shared stress testing?"
+
+
+def _write(memory_dir: str, backend: str, writer: int, threads: int, debates: int, start_at: float) -> dict:
+    """Run in a child process: save debates from several threads, report timings."""
+    from src.memory import MemoryManager
+    manager = MemoryManager(memory_dir, backend=backend, lazy=True, retain_entries=0)
+    errors = []
+
+    def run(thread: int) -> None:
+        for number in range(debates):
+            try:
+                manager.save_debate({
+                    "prompt": _prompt(writer, thread, number),
+                    "responses": [{"agent": agent, "response": f"{agent} answers w{writer}t{thread}n{number}."}
+                                  for agent in AGENTS],
+                    "critiques": [],
+                    "summary": "Stress test debate.",
+                })
+            except Exception as e:
+                errors.append(repr(e))
+
+    time.sleep(max(0.0, start_at - time.time()))
+    start = time.perf_counter()
+    workers = [threading.Thread(target=run, args=(thread,)) for thread in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    journal = getattr(manager.store, "journal", None)
+    manager.store.close()
+    return {"elapsed": elapsed, "errors": errors,
+            "commits": journal.commits if journal else None, "batches": journal.batches if journal else None}
+
+
+def _verify(memory_dir: str, backend: str, writers: int, threads: int, debates: int) -> list:
+    """Check the shared memory directory after all writers finished; returns failed checks."""
+    from src.memory import MemoryManager
+    manager = MemoryManager(memory_dir, backend=backend, lazy=True, retain_entries=0)
+    expected = writers * threads * debates
+    failures = []
+
+    def check(condition: bool, message: str) -> None:
+        if not condition:
+            failures.append(message)
+
+    debate_ids = manager.list_debate_ids()
+    check(len(debate_ids) == expected, f"{len(debate_ids)} debates stored, expected {expected}")
+    check(len(set(debate_ids)) == len(debate_ids), "duplicate debate IDs")
+    prompts = {manager.get_debate(debate_id)["prompt"] for debate_id in debate_ids}
+    check(len(prompts) == expected, f"{len(prompts)} distinct debates stored, expected {expected}")
+
+    index_ids = [entry["debate_id"] for entry in manager.store.load_debate_index()]
+    check(sorted(index_ids) == sorted(debate_ids), f"debate index has {len(index_ids)} entries for {len(debate_ids)} debates")
+    topic_refs = manager.store.load_topic_index().get("stress", [])
+    check(sorted(topic_refs) == sorted(debate_ids), f"topic index references {len(topic_refs)} of {len(debate_ids)} debates")
+    for agent in AGENTS:
+        entries = [entry["debate_id"] for entry in manager.get_agent_memory(agent).get("debates", [])]
+        check(sorted(entries) == sorted(debate_ids), f"{agent} memory lists {len(entries)} of {len(debate_ids)} debates")
+
+    # The last debate of each writer thread must be found by its unique marker
+    for writer in range(writers):
+        for thread in range(threads):
+            prompt = _prompt(writer, thread, debates - 1)
+            found = [debate.get("prompt") for debate in manager.get_relevant_debates(prompt, limit=1)]
+            check(found == [prompt], f"relevance search misses {prompt!r}")
+    if manager.debate_vectors is not None:
+        check(len(manager.debate_vectors) == expected,
+              f"vector index holds {len(manager.debate_vectors)} of {expected} debates")
+    manager.store.close()
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stress test concurrent MemoryManager writers")
+    parser.add_argument("--writers", type=int, default=4, help="Writer processes")
+    parser.add_argument("--threads", type=int, default=2, help="Saving threads per writer")
+    parser.add_argument("--debates", type=int, default=25, help="Debates saved per thread")
+    parser.add_argument("--backend", choices=["json", "segment", "sqlite"], default="json", help="Storage backend")
+    parser.add_argument("--dir", help="Memory directory (default: a new temporary directory)")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--start-at", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        print(json.dumps(_write(args.dir, args.backend, args.child, args.threads, args.debates, args.start_at)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        memory_dir = args.dir or os.path.join(tmp, "memory")
+        start_at = time.time() + 2  # Time for every child to import and open the store
+        children = [
+            subprocess.Popen([sys.executable, "-m", "src.benchmarks.memory_writers", "--dir", memory_dir,
+                              "--backend", args.backend, "--threads", str(args.threads), "--debates", str(args.debates),
+                              "--child", str(writer), "--start-at", str(start_at)],
+                             stdout=subprocess.PIPE, text=True)
+            for writer in range(args.writers)
+        ]
+        results = []
+        for child in children:
+            output, _ = child.communicate()
+            if child.returncode != 0:
+                print(f"Writer exited with status {child.returncode}")
+                sys.exit(1)
+            results.append(json.loads(output.strip().splitlines()[-1]))
+
+        total = args.writers * args.threads * args.debates
+        elapsed = max(result["elapsed"] for result in results)
+        print(f"{args.writers} writers x {args.threads} threads saved {total} debates ({args.backend}) "
+              f"in {elapsed:.2f}s: {total / elapsed:.0f} debates/s")
+        if results[0]["commits"] is not None:
+            commits = sum(result["commits"] for result in results)
+            batches = sum(result["batches"] for result in results)
+            print(f"Journal: {commits} commits flushed in {batches} group commits")
+        errors = [error for result in results for error in result["errors"]]
+        failures = _verify(memory_dir, args.backend, args.writers, args.threads, args.debates)
+        for message in errors + failures:
+            print(f"FAILED: {message}")
+        if errors or failures:
+            sys.exit(1)
+        print("All checks passed: no lost or colliding debates")
+
+
+if __name__ == "__main__":
+    main()
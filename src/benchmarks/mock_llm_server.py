@@ -0,0 +1,150 @@
+"""
+Minimal OpenAI-compatible HTTP server for local benchmarks.
+
+Serves POST /v1/chat/completions with a canned completion (plain or streamed) over HTTP/1.1 keep-alive,
+so client-side overhead (connection setup, pooling, scheduling) can be measured
+without calling a real provider. An optional requests-per-second quota makes it answer
+429 with Retry-After like a throttling provider.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+MOCK_CONTENT = "Mock response."
+MOCK_USAGE = {"prompt_tokens": 10, "completion_tokens": 3, "total_tokens": 13}
+
+
+class _ChatCompletionHandler(BaseHTTPRequestHandler):
+    """Request handler returning a fixed chat completion."""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        retry_after = self.server.admit()
+        if retry_after:
+            self.server.throttled_count += 1
+            self._send_json(429, {"error": {"message": "Rate limit reached", "type": "rate_limit_error"}},
+                            {"Retry-After": f"{retry_after:.3f}"})
+            return
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.server.request_count += 1
+        if body.get("stream"):
+            self._send_stream(body)
+            return
+        self._send_json(200, {
+            "id": "chatcmpl-mock",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": MOCK_CONTENT},
+                "finish_reason": "stop",
+            }],
+            "usage": MOCK_USAGE,
+        })
+
+    def _send_stream(self, body):
+        """Answer a stream=True request with server-sent event chunks, one word per chunk."""
+        words = MOCK_CONTENT.split(" ")
+        chunks = [{"role": "assistant", "content": ""}] + [
+            {"content": word if i == 0 else " " + word} for i, word in enumerate(words)
+        ]
+        events = [
+            {"id": "chatcmpl-mock", "object": "chat.completion.chunk", "created": int(time.time()),
+             "model": body.get("model", "mock"), "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}
+            for delta in chunks
+        ]
+        if (body.get("stream_options") or {}).get("include_usage"):
+            events.append({"id": "chatcmpl-mock", "object": "chat.completion.chunk", "created": int(time.time()),
+                           "model": body.get("model", "mock"), "choices": [], "usage": MOCK_USAGE})
+        payload = "".join(f"data: {json.dumps(event)}\n\n" for event in events) + "data: [DONE]\n\n"
+        payload = payload.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _send_json(self, status, body, headers=None):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockLLMServer:
+    """Runs the mock server on a background thread; use as a context manager."""
+
+    def __init__(self, latency: float = 0.0, port: int = 0, max_rps: float = 0.0):
+        """
+        Args:
+            latency: Artificial per-request server delay in seconds
+            port: Port to bind on localhost (0 picks a free port)
+            max_rps: Requests per second accepted before answering 429 (0 = unlimited)
+        """
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), _ChatCompletionHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.latency = latency
+        self.httpd.request_count = 0
+        self.httpd.throttled_count = 0
+        self.httpd.admit = self._admit
+        self.max_rps = max_rps
+        self._allowance = max_rps
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def request_count(self) -> int:
+        return self.httpd.request_count
+
+    @property
+    def throttled_count(self) -> int:
+        return self.httpd.throttled_count
+
+    def _admit(self) -> float:
+        """Token bucket of max_rps per second; returns 0 to accept or the seconds until a slot frees up."""
+        if not self.max_rps:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._allowance = min(self.max_rps, self._allowance + (now - self._last) * self.max_rps)
+            self._last = now
+            if self._allowance >= 1:
+                self._allowance -= 1
+                return 0.0
+            return (1 - self._allowance) / self.max_rps
+
+    def start(self) -> "MockLLMServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
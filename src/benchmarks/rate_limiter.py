@@ -0,0 +1,62 @@
+"""
+Benchmark: throughput against a throttling provider with and without the client-side RPM budget.
+
+The mock server accepts --quota requests per second and answers 429 (with Retry-After) beyond it.
+"retry only" relies on the AIMD window and backoff alone; "rpm budget" also sets LLM_RPM to the quota.
+
+Usage:
+    python -m src.benchmarks.rate_limiter [--calls N] [--workers N] [--quota RPS] [--latency SECONDS]
+"""
+
+import argparse
+import concurrent.futures
+import os
+import time
+
+from src.config import settings
+from src.agents import llm_utils
+from src.agents.rate_limiter import AdaptiveLimiter
+from src.benchmarks.mock_llm_server import MockLLMServer
+
+
+def _run(server: MockLLMServer, limiter: AdaptiveLimiter, calls: int, workers: int) -> None:
+    llm_utils._rate_limiter = limiter
+    start_ok, start_429 = server.request_count, server.throttled_count
+    errors = 0
+    start = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        for response in executor.map(lambda i: llm_utils.call_openai("You are a Stoic.", f"Question {i}"), range(calls)):
+            errors += response.startswith("[LLM error")
+    elapsed = time.perf_counter() - start
+    stats = limiter.stats()
+    print(f"  throughput={(server.request_count - start_ok) / elapsed:6.2f} req/s  "
+          f"429s={server.throttled_count - start_429:4d}  errors={errors}  "
+          f"throttled={stats['throttle_seconds']:6.1f}s  final window={stats['concurrency_limit']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the adaptive LLM rate limiter against a throttling server")
+    parser.add_argument("--calls", type=int, default=200, help="Calls per variant")
+    parser.add_argument("--workers", type=int, default=32, help="Concurrent callers")
+    parser.add_argument("--quota", type=float, default=20.0, help="Server quota in requests per second")
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated server latency in seconds")
+    args = parser.parse_args()
+    os.environ["LLM_POOL_SIZE"] = str(args.workers)  # Keep the connection pool from being the bottleneck
+
+    with MockLLMServer(latency=args.latency, max_rps=args.quota) as server:
+        settings.LLM_CONFIG.update({"api_key": "mock-key", "base_url": server.base_url, "model_name": "gpt-3.5-turbo"})
+        print(f"Mock server at {server.base_url}: quota {args.quota:g} req/s, "
+              f"{args.calls} calls from {args.workers} workers\n")
+
+        print("retry only (AIMD + backoff):")
+        _run(server, AdaptiveLimiter(max_concurrency=args.workers), args.calls, args.workers)
+        time.sleep(1.0)  # Let the server's bucket refill between variants
+
+        print(f"rpm budget (LLM_RPM={int(args.quota * 60)}):")
+        _run(server, AdaptiveLimiter(rpm=int(args.quota * 60), max_concurrency=args.workers), args.calls, args.workers)
+
+    llm_utils.close_clients()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark: per-call overhead of prompt sizing in _build_request.
+
+Compares the previous estimate (a failing tiktoken.get_encoding(prompt) lookup on every call),
+an encoder loaded per call, the memoized encoder, and the memoized encoder with cached system
+prompt counts, over the persona prompts from agent_definitions/.
+
+Usage:
+    python -m src.benchmarks.tokenizer [--calls N] [--model NAME]
+"""
+
+import argparse
+import time
+
+from src.agents import llm_utils
+from src.agents.agent_loader import load_agents_from_directory
+
+
+def _time_per_call(fn, prompts, calls: int) -> float:
+    """Mean microseconds per fn(system, user) over `calls` calls cycling through prompts."""
+    start = time.perf_counter()
+    for i in range(calls):
+        system_prompt, user_prompt = prompts[i % len(prompts)]
+        fn(system_prompt, user_prompt)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark prompt token counting")
+    parser.add_argument("--calls", type=int, default=2000, help="Calls per variant")
+    parser.add_argument("--model", default="gpt-3.5-turbo", help="Model whose encoder is used")
+    args = parser.parse_args()
+
+    agents = load_agents_from_directory("agent_definitions")
+    user_prompt = "Is it ever right to break a promise? " * 20
+    prompts = [(prompt, user_prompt) for agent in agents for prompt in (agent.opening_prompt, agent.rebuttal_prompt)]
+
+    encoder = llm_utils.get_encoder(args.model)
+    if encoder is None:
+        print("tiktoken encoder unavailable (not installed or encoding files not downloadable); "
+              "counts fall back to len/4\n")
+    else:
+        print(f"Encoder for {args.model}: {encoder.name}\n")
+
+    def previous(system_prompt, user_prompt):
+        prompt = system_prompt + user_prompt
+        try:
+            return llm_utils.tiktoken.get_encoding(prompt).length
+        except Exception:
+            return len(prompt) // 4
+
+    def encoder_per_call(system_prompt, user_prompt):
+        llm_utils.get_encoder.cache_clear()
+        return llm_utils.estimate_prompt_size(system_prompt + user_prompt, args.model)
+
+    def memoized_encoder(system_prompt, user_prompt):
+        return llm_utils.estimate_prompt_size(system_prompt + user_prompt, args.model)
+
+    def cached_system_counts(system_prompt, user_prompt):
+        return llm_utils.count_message_tokens(system_prompt, user_prompt, args.model)
+
+    print(f"{len(prompts)} system prompts, {args.calls} calls per variant")
+    # The per-call loader is far slower; time fewer calls
+    for label, fn, calls in [
+        ("previous (failing lookup)", previous, args.calls),
+        ("encoder loaded per call", encoder_per_call, max(1, args.calls // 100)),
+        ("memoized encoder", memoized_encoder, args.calls),
+        ("memoized + cached system", cached_system_counts, args.calls),
+    ]:
+        fn(*prompts[0])  # Warm up
+        print(f"{label:<26} {_time_per_call(fn, prompts, calls):9.1f} us/call")
+
+
+if __name__ == "__main__":
+    main()
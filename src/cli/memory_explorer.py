@@ -156,15 +156,7 @@ class MemoryExplorerShell(cmd.Cmd):
     
     def do_agents(self, arg):
         """List all philosophical agents in the system"""
-        agent_memories_dir = Path(self.query_tool.memory_dir) / "agents"
-        
-        if not agent_memories_dir.exists():
-            print("No agent memories found.")
-            return
-        
-        agents = []
-        for agent_file in agent_memories_dir.glob("*.json"):
-            agents.append(agent_file.stem)
+        agents = self.query_tool.memory_manager.list_agents()
         
         if not agents:
             print("No agent memories found.")
@@ -176,17 +168,7 @@ class MemoryExplorerShell(cmd.Cmd):
     
     def do_topics(self, arg):
         """List all topics discussed in debates"""
-        debates_dir = Path(self.query_tool.memory_dir) / "debates"
-        
-        if not debates_dir.exists():
-            print("No debate records found.")
-            return
-        
-        topics = set()
-        for debate_file in debates_dir.glob("*.json"):
-            with open(debate_file, "r") as f:
-                debate_data = json.load(f)
-                topics.add(debate_data.get("topic", "Unknown"))
+        topics = self.query_tool.list_topics()
         
         if not topics:
             print("No topics found.")
@@ -16,6 +16,157 @@ LLM_CONFIG = {
     "max_tokens": int(os.getenv("OPENAI_MAX_TOKENS", 512)),
 }
 
+# Default ceiling of the adaptive LLM concurrency window (LLM_MAX_CONCURRENCY)
+DEFAULT_LLM_MAX_CONCURRENCY = 16
+
+# Phase name -> environment variable controlling its parallelism
+PHASE_PARALLEL_ENV = {
+    "opening": "PARALLEL_AGENTS_OPENING",
+    "rebuttal": "PARALLEL_AGENTS_REBUTTAL",
+    "closing": "PARALLEL_AGENTS_CLOSING",
+    "summary": "PARALLEL_AGENTS_SUMMARY",
+    "judging": "PARALLEL_AGENTS_JUDGING",
+}
+
 def get_llm_config():
     """Return a copy of the current LLM config."""
     return dict(LLM_CONFIG)
+
+def _env_int(name):
+    """Return an integer environment variable, or None if unset or invalid."""
+    val = os.environ.get(name)
+    if val is None:
+        return None
+    try:
+        return int(val)
+    except ValueError:
+        return None
+
+def get_phase_parallel(phase: str, default: int = 1) -> int:
+    """
+    Return the parallelism for a debate phase.
+    Tries the phase-specific PARALLEL_AGENTS_<PHASE> variable, then PARALLEL_AGENTS, then default.
+    """
+    val = _env_int(PHASE_PARALLEL_ENV.get(phase, ""))
+    if val is not None:
+        return val
+    val = _env_int("PARALLEL_AGENTS")
+    if val is not None:
+        return val
+    return default
+
+def get_llm_pool_size() -> int:
+    """
+    Return the connection pool size for the shared LLM HTTP client.
+    LLM_POOL_SIZE overrides; otherwise the pool is sized to the largest PARALLEL_AGENTS_* setting
+    so every concurrent worker of the busiest phase can hold a keep-alive connection.
+    """
+    val = _env_int("LLM_POOL_SIZE")
+    if val is not None and val > 0:
+        return val
+    return max(1, max(get_phase_parallel(phase) for phase in PHASE_PARALLEL_ENV))
+
+def get_rebuttal_per_agent_parallel() -> int:
+    """
+    Return the default cap on concurrent rebuttals written by any single agent
+    (PARALLEL_REBUTTALS_PER_AGENT). 0 means no per-agent cap.
+    """
+    val = _env_int("PARALLEL_REBUTTALS_PER_AGENT")
+    return val if val is not None and val > 0 else 0
+
+def get_cache_config():
+    """
+    Return LLM response cache settings.
+    LLM_CACHE=1 enables the cache; LLM_CACHE_PATH, LLM_CACHE_TTL (seconds), LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_MAX_MB and LLM_CACHE_MEMORY_ENTRIES tune it. 0 disables a TTL or size limit.
+    """
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    max_mb = _env_int("LLM_CACHE_MAX_MB") or 0
+    return {
+        "enabled": os.getenv("LLM_CACHE", "0").lower() in ("1", "true", "yes", "on"),
+        "path": os.getenv("LLM_CACHE_PATH") or os.path.join(project_root, "memory", "llm_cache.sqlite3"),
+        "ttl": _env_int("LLM_CACHE_TTL") or 0,
+        "max_entries": _env_int("LLM_CACHE_MAX_ENTRIES") or 10000,
+        "max_bytes": max_mb * 1024 * 1024,
+        "memory_entries": _env_int("LLM_CACHE_MEMORY_ENTRIES") or 256,
+    }
+
+def get_rate_limit_config():
+    """
+    Return client-side rate limit settings for LLM calls.
+    LLM_RPM and LLM_TPM are the provider's requests/tokens per minute quotas (0 = unlimited);
+    LLM_MAX_CONCURRENCY caps the adaptive concurrency window (defaults to DEFAULT_LLM_MAX_CONCURRENCY,
+    or the LLM pool size if that is larger);
+    LLM_MAX_RETRIES bounds retries of throttled or transient failures.
+    """
+    max_retries = _env_int("LLM_MAX_RETRIES")
+    return {
+        "rpm": max(0, _env_int("LLM_RPM") or 0),
+        "tpm": max(0, _env_int("LLM_TPM") or 0),
+        "max_concurrency": _env_int("LLM_MAX_CONCURRENCY") or max(DEFAULT_LLM_MAX_CONCURRENCY, get_llm_pool_size()),
+        "max_retries": max_retries if max_retries is not None and max_retries >= 0 else 8,
+    }
+
+def get_stream_output() -> bool:
+    """Return True when STREAM_OUTPUT asks for opening and closing statements to be streamed live."""
+    return os.getenv("STREAM_OUTPUT", "0").lower() in ("1", "true", "yes", "on")
+
+def get_memory_backend() -> str:
+    """
+    Return the MemoryManager storage backend: "json" (one file per debate/agent plus whole-file
+    indexes, the default), "segment" (append-only segment log under memory/store/) or "sqlite"
+    (indexed tables with full-text search in memory/memory.sqlite3).
+    """
+    return os.getenv("MEMORY_BACKEND", "json").strip().lower() or "json"
+
+def get_memory_cache_config():
+    """
+    Return MemoryManager caching settings.
+    MEMORY_LAZY_LOAD=0 restores eager loading of every agent memory and both indexes at startup;
+    MEMORY_AGENT_CACHE_SIZE bounds the LRU of agent memories kept in memory when loading lazily.
+    """
+    cache_size = _env_int("MEMORY_AGENT_CACHE_SIZE")
+    return {
+        "lazy": os.getenv("MEMORY_LAZY_LOAD", "1").lower() in ("1", "true", "yes", "on"),
+        "agent_cache_size": cache_size if cache_size is not None and cache_size > 0 else 32,
+    }
+
+def get_memory_retention() -> int:
+    """
+    Return MEMORY_RETAIN_ENTRIES: debate entries (and positions per topic) kept raw in each agent
+    memory; older entries are folded into per-topic digests. 0 keeps every entry.
+    """
+    retain = _env_int("MEMORY_RETAIN_ENTRIES")
+    return retain if retain is not None and retain >= 0 else 50
+
+def get_memory_context_budget() -> int:
+    """
+    Return MEMORY_CONTEXT_TOKENS: the token budget for the memory context (past debates, positions
+    and digests) added to each agent's prompt by OrchestratorWithMemory.
+    """
+    budget = _env_int("MEMORY_CONTEXT_TOKENS")
+    return budget if budget is not None and budget >= 0 else 1200
+
+def get_memory_fsync() -> bool:
+    """
+    Return MEMORY_FSYNC: whether the json memory backend flushes saved files and its write-ahead
+    journal to disk before a save completes. 0 keeps saves atomic but not durable across power loss.
+    """
+    return os.getenv("MEMORY_FSYNC", "1").lower() in ("1", "true", "yes", "on")
+
+def get_embedding_config():
+    """
+    Return settings for the debate embedding index used by semantic retrieval.
+    EMBEDDING_PROVIDER is "hashing" (local, deterministic; the default), "openai" (the embeddings
+    endpoint of OPENAI_BASE_URL with EMBEDDING_MODEL) or "none" to disable embeddings. EMBEDDING_DIM
+    is the vector size; EMBEDDING_IVF_THRESHOLD is the index size from which searches use an IVF
+    (clustered) index instead of brute force.
+    """
+    dim = _env_int("EMBEDDING_DIM")
+    threshold = _env_int("EMBEDDING_IVF_THRESHOLD")
+    return {
+        "provider": os.getenv("EMBEDDING_PROVIDER", "hashing").strip().lower() or "hashing",
+        "model": os.getenv("EMBEDDING_MODEL", "text-embedding-3-small"),
+        "dim": dim if dim is not None and dim > 0 else 256,
+        "ivf_threshold": threshold if threshold is not None and threshold > 0 else 20000,
+    }
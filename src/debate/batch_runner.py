@@ -0,0 +1,196 @@
+"""
+Offline debate sweeps through a batch backend.
+
+Every debate in a sweep advances one phase at a time: the requests of a phase for all prompts are
+written to one batch file, submitted, polled until done, and the results feed the next phase's
+prompts. Progress is checkpointed in work_dir/state.json after each step, so an interrupted sweep
+resumes where it stopped (a submitted batch is polled again rather than resubmitted).
+"""
+
+import json
+import os
+import time
+from typing import Any, Dict, List, Tuple
+
+from src.agents.batch import BatchBackend, COMPLETED, FAILED_STATES, read_batch_results, write_batch_file
+from src.agents.llm_utils import _text_result
+from src.agents.orchestrator_dynamic import TOKEN_USAGE_PHASES
+
+# Batch phases, in pipeline order
+BATCH_PHASES = ["opening", "rebuttal", "closing", "summary", "judging", "final"]
+
+
+class BatchDebateRunner:
+    """Runs many debates phase by phase through a BatchBackend instead of interactive calls."""
+
+    def __init__(self, orchestrator, backend: BatchBackend, work_dir: str, poll_interval: float = 60.0):
+        """
+        Args:
+            orchestrator: OrchestratorAgent providing agents, judges, prompts and persistence
+            backend: Where batch files are submitted
+            work_dir: Directory for batch files and the resumable sweep state
+            poll_interval: Seconds between status checks of a submitted batch
+        """
+        self.orchestrator = orchestrator
+        self.backend = backend
+        self.work_dir = work_dir
+        self.poll_interval = poll_interval
+        self.state_path = os.path.join(work_dir, "state.json")
+        os.makedirs(work_dir, exist_ok=True)
+
+    # --- Sweep state ---
+
+    def _load_state(self, prompts: List[str]) -> Dict[str, Any]:
+        if os.path.exists(self.state_path):
+            with open(self.state_path) as f:
+                state = json.load(f)
+            if state["prompts"] != prompts:
+                raise ValueError(f"{self.state_path} belongs to a different sweep; use a fresh work_dir")
+            return state
+        return {"prompts": prompts, "phases": {}, "persisted": []}
+
+    def _save_state(self, state: Dict[str, Any]) -> None:
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def _run_phase(self, state: Dict[str, Any], phase: str,
+                   requests: List[Tuple[str, str, str]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Submit (or resume) the batch for one phase and wait for its results.
+        Returns:
+            {custom_id: call_openai-shaped result}
+        """
+        entry = state["phases"].setdefault(phase, {})
+        output_path = os.path.join(self.work_dir, f"{phase}.output.jsonl")
+        if entry.get("status") != COMPLETED:
+            if not entry.get("batch_id"):
+                input_path = os.path.join(self.work_dir, f"{phase}.input.jsonl")
+                count = write_batch_file(input_path, requests)
+                entry.update(batch_id=self.backend.submit(input_path), status="submitted", requests=count)
+                self._save_state(state)
+                print(f"[batch] {phase}: submitted {count} requests as {entry['batch_id']}")
+            while True:
+                status = self.backend.status(entry["batch_id"])
+                if status == COMPLETED:
+                    break
+                if status in FAILED_STATES:
+                    raise RuntimeError(f"Batch {entry['batch_id']} for phase {phase} ended as {status}")
+                print(f"[batch] {phase}: {entry['batch_id']} is {status}; checking again in {self.poll_interval:g}s")
+                time.sleep(self.poll_interval)
+            self.backend.download(entry["batch_id"], output_path)
+            entry["status"] = COMPLETED
+            self._save_state(state)
+            print(f"[batch] {phase}: results downloaded")
+        results = read_batch_results(output_path)
+        missing = _text_result("[LLM error: missing batch result]", True)
+        return {custom_id: results.get(custom_id, missing) for custom_id, _, _ in requests}
+
+    # --- Pipeline ---
+
+    def run(self, prompts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Debate every prompt, one batch per phase.
+        Returns:
+            One result per prompt, shaped like OrchestratorAgent.run()
+        """
+        orch = self.orchestrator
+        state = self._load_state(prompts)
+        summarizer_prompt, final_summarizer_prompt = orch._load_summarizer_prompts()
+        debates = range(len(prompts))
+        transcripts = [[] for _ in debates]
+        token_usage = [{phase: [] for phase in TOKEN_USAGE_PHASES} for _ in debates]
+
+        # --- Opening statements ---
+        requests = [
+            (f"{d}-opening-{i}", *orch._opening_prompts(agent, prompts[d]))
+            for d in debates for i, agent in enumerate(orch.agents)
+        ]
+        results = self._run_phase(state, "opening", requests)
+        opening_statements = []
+        for d in debates:
+            records = [orch._record_opening(agent, results[f"{d}-opening-{i}"], token_usage[d])
+                       for i, agent in enumerate(orch.agents)]
+            opening_statements.append([(agent, response) for agent, response, _ in records])
+            transcripts[d].extend(log for _, _, log in records)
+
+        # --- Rebuttals: every (critic, target) pair of every debate ---
+        pairs = [orch._rebuttal_pairs(opening_statements[d])[0] for d in debates]
+        requests = [
+            (f"{d}-rebuttal-{index}", *orch._rebuttal_prompts(agent, other_opening))
+            for d in debates for index, (agent, _, other_opening) in enumerate(pairs[d])
+        ]
+        results = self._run_phase(state, "rebuttal", requests)
+        rebuttals = []
+        for d in debates:
+            pair_results = {
+                index: orch._record_rebuttal(agent, other_agent, results[f"{d}-rebuttal-{index}"], token_usage[d])
+                for index, (agent, other_agent, _) in enumerate(pairs[d])
+            }
+            debate_rebuttals, logs = orch._collect_rebuttals(opening_statements[d], pairs[d], pair_results)
+            rebuttals.append(debate_rebuttals)
+            transcripts[d].extend(logs)
+
+        # --- Closing statements ---
+        requests = [
+            (f"{d}-closing-{i}", *orch._closing_prompts(agent, opening, rebuttals[d]))
+            for d in debates for i, (agent, opening) in enumerate(opening_statements[d])
+        ]
+        results = self._run_phase(state, "closing", requests)
+        agent_closings = []
+        for d in debates:
+            records = [orch._record_closing(agent, results[f"{d}-closing-{i}"], token_usage[d])
+                       for i, (agent, _) in enumerate(opening_statements[d])]
+            agent_closings.append({name: closing for name, closing, _ in records})
+            transcripts[d].extend(log for _, _, log in records)
+
+        # --- Summaries ---
+        requests = [
+            (f"{d}-summary-{i}", summarizer_prompt, orch._summary_input(agent, opening, rebuttals[d], agent_closings[d]))
+            for d in debates for i, (agent, opening) in enumerate(opening_statements[d])
+        ]
+        results = self._run_phase(state, "summary", requests)
+        agent_summaries = []
+        for d in debates:
+            records = [orch._record_summary(agent, results[f"{d}-summary-{i}"], token_usage[d])
+                       for i, (agent, _) in enumerate(opening_statements[d])]
+            agent_summaries.append({name: summary for name, summary, _ in records})
+            transcripts[d].extend(log for _, _, log in records)
+
+        # --- Judging ---
+        requests = [
+            (f"{d}-judge-{j}", judge.prompt, judge.build_user_prompt(agent_summaries[d]))
+            for d in debates for j, judge in enumerate(orch.judges)
+        ]
+        results = self._run_phase(state, "judging", requests)
+        outcomes = []
+        for d in debates:
+            judge_results = []
+            for j, judge in enumerate(orch.judges):
+                result = results[f"{d}-judge-{j}"]
+                judge_result = {"result": judge.parse_response(result["response"], agent_summaries[d]),
+                                "usage": result.get("usage", {})}
+                judge_results.append(orch._record_judge_result(judge, judge_result, token_usage[d]))
+            outcomes.append(orch._tally_judging(judge_results, transcripts[d]))
+            orch._print_token_summary(token_usage[d])
+
+        # --- Final summaries, then persist each debate once ---
+        requests = [
+            (f"{d}-final", final_summarizer_prompt, orch._final_summary_input(prompts[d], agent_summaries[d], outcomes[d]))
+            for d in debates
+        ]
+        results = self._run_phase(state, "final", requests)
+        debate_results = []
+        for d in debates:
+            print(f"\n=== Final Debate Summary ({d + 1}/{len(prompts)}): {prompts[d]} ===")
+            log_entry = orch._complete_debate(
+                prompts[d], opening_statements[d], rebuttals[d], agent_summaries[d], outcomes[d],
+                transcripts[d], results[f"{d}-final"]
+            )
+            if d not in state["persisted"]:
+                orch._persist_debate(prompts[d], log_entry)
+                state["persisted"].append(d)
+                self._save_state(state)
+            debate_results.append(dict(log_entry, token_usage=token_usage[d]))
+        return debate_results
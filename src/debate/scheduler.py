@@ -0,0 +1,200 @@
+"""
+Dependency-driven task scheduler for debate phases.
+
+Each task declares the tasks whose results it consumes. A task is started as soon as all of its
+inputs are ready (subject to per-pool concurrency limits) instead of waiting for a whole phase
+to finish. Per-task timings are recorded so the critical path and the cost of phase barriers
+can be reported after a run.
+"""
+
+import concurrent.futures
+import time
+from collections import defaultdict, deque
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class TaskNode:
+    """A unit of work in the DAG together with its timing record."""
+
+    def __init__(self, node_id: str, fn: Callable[[Dict[str, Any]], Any],
+                 deps: Iterable[str] = (), pools: Iterable[str] = ()):
+        """
+        Args:
+            node_id: Unique task identifier, conventionally "<phase>:<detail>"
+            fn: Callable receiving {dep_id: dep_result} and returning this task's result
+            deps: IDs of the tasks whose results this task needs
+            pools: Concurrency pools this task occupies while running
+        """
+        self.node_id = node_id
+        self.fn = fn
+        self.deps = list(deps)
+        self.pools = list(pools)
+        self.result = None
+        self.ready_at: Optional[float] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def phase(self) -> str:
+        return self.node_id.split(":", 1)[0]
+
+    @property
+    def duration(self) -> float:
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+
+class DAGScheduler:
+    """
+    Runs a DAG of TaskNodes on a thread pool, starting each node once its inputs are ready.
+    """
+
+    def __init__(self, max_workers: int = 1, pool_limits: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            max_workers: Total worker threads
+            pool_limits: Optional {pool_name: max concurrent tasks}; unlisted pools are unbounded
+        """
+        self.max_workers = max(1, max_workers)
+        self.pool_limits = {pool: max(1, limit) for pool, limit in (pool_limits or {}).items()}
+        self.nodes: Dict[str, TaskNode] = {}
+        self.wall_time = 0.0
+
+    def add(self, node_id: str, fn: Callable[[Dict[str, Any]], Any],
+            deps: Iterable[str] = (), pools: Iterable[str] = ()) -> str:
+        """Register a task. Dependencies must be added before the tasks that use them."""
+        if node_id in self.nodes:
+            raise ValueError(f"Duplicate task id: {node_id}")
+        node = TaskNode(node_id, fn, deps, pools)
+        missing = [dep for dep in node.deps if dep not in self.nodes]
+        if missing:
+            raise ValueError(f"Task {node_id} depends on unknown tasks: {missing}")
+        self.nodes[node_id] = node
+        return node_id
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Execute every task, honouring dependencies and pool limits.
+        Returns:
+            {node_id: result}
+        """
+        remaining = {node_id: len(node.deps) for node_id, node in self.nodes.items()}
+        dependents = defaultdict(list)
+        for node in self.nodes.values():
+            for dep in node.deps:
+                dependents[dep].append(node.node_id)
+
+        start = time.perf_counter()
+        ready = deque()
+        for node_id, count in remaining.items():
+            if count == 0:
+                self.nodes[node_id].ready_at = 0.0
+                ready.append(node_id)
+
+        running_per_pool = defaultdict(int)
+        running = {}
+
+        def has_capacity(node):
+            return all(
+                running_per_pool[pool] < self.pool_limits[pool]
+                for pool in node.pools if pool in self.pool_limits
+            )
+
+        def execute(node):
+            node.started_at = time.perf_counter() - start
+            inputs = {dep: self.nodes[dep].result for dep in node.deps}
+            try:
+                return node.fn(inputs)
+            finally:
+                node.finished_at = time.perf_counter() - start
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while ready or running:
+                # Launch every ready task whose pools have room, in readiness order
+                deferred = deque()
+                while ready and len(running) < self.max_workers:
+                    node = self.nodes[ready.popleft()]
+                    if not has_capacity(node):
+                        deferred.append(node.node_id)
+                        continue
+                    for pool in node.pools:
+                        running_per_pool[pool] += 1
+                    running[executor.submit(execute, node)] = node
+                ready.extendleft(reversed(deferred))
+
+                done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    for pool in node.pools:
+                        running_per_pool[pool] -= 1
+                    node.result = future.result()  # Re-raises task failures
+                    for child_id in dependents[node.node_id]:
+                        remaining[child_id] -= 1
+                        if remaining[child_id] == 0:
+                            self.nodes[child_id].ready_at = node.finished_at
+                            ready.append(child_id)
+
+        self.wall_time = time.perf_counter() - start
+        return {node_id: node.result for node_id, node in self.nodes.items()}
+
+    def timings(self) -> List[Dict[str, Any]]:
+        """Per-task timing records (seconds relative to the start of run())."""
+        return [
+            {
+                "node": node.node_id,
+                "phase": node.phase,
+                "ready": node.ready_at,
+                "start": node.started_at,
+                "end": node.finished_at,
+                "queued": (node.started_at - node.ready_at) if node.started_at is not None and node.ready_at is not None else None,
+                "duration": node.duration,
+            }
+            for node in self.nodes.values()
+        ]
+
+    def critical_path(self) -> Tuple[List[str], float]:
+        """
+        Longest chain of dependent tasks by measured duration.
+        Returns:
+            (node_ids along the path, summed duration in seconds)
+        """
+        best: Dict[str, float] = {}
+        via: Dict[str, Optional[str]] = {}
+        # self.nodes is insertion-ordered and deps are always inserted first, so this is a topological order
+        for node_id, node in self.nodes.items():
+            prev = max(node.deps, key=lambda dep: best[dep], default=None)
+            best[node_id] = node.duration + (best[prev] if prev else 0.0)
+            via[node_id] = prev
+        if not best:
+            return [], 0.0
+        end = max(best, key=best.get)
+        path = []
+        node_id = end
+        while node_id is not None:
+            path.append(node_id)
+            node_id = via[node_id]
+        return list(reversed(path)), best[end]
+
+    def barrier_estimate(self) -> float:
+        """
+        Makespan the same tasks would need with a barrier after every phase and unlimited workers:
+        the sum over phases of the slowest task in each phase.
+        """
+        slowest = {}
+        for node in self.nodes.values():
+            slowest[node.phase] = max(slowest.get(node.phase, 0.0), node.duration)
+        return sum(slowest.values())
+
+    def report(self) -> Dict[str, Any]:
+        """Summary of the run: wall time, critical path and the estimated cost of phase barriers."""
+        path, path_time = self.critical_path()
+        barrier_time = self.barrier_estimate()
+        return {
+            "wall_time": self.wall_time,
+            "critical_path": path,
+            "critical_path_time": path_time,
+            "barrier_estimate": barrier_time,
+            "barrier_cost": barrier_time - path_time,
+            "timings": self.timings(),
+        }
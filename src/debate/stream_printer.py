@@ -0,0 +1,68 @@
+"""
+Live console output for streamed LLM responses.
+
+Several agents may stream at once. Each stream is buffered separately and written out a line at a
+time behind its label, so concurrent responses interleave line by line rather than character by
+character.
+"""
+
+import sys
+import threading
+from typing import Dict, Optional, TextIO
+
+
+class LabeledStream:
+    """Token sink for one response: call it with each delta, then close() it when the response ends."""
+
+    def __init__(self, printer: "StreamPrinter", label: str):
+        self.printer = printer
+        self.label = label
+
+    def __call__(self, delta: str) -> None:
+        self.printer.write(self.label, delta)
+
+    def close(self) -> None:
+        self.printer.finish(self.label)
+
+
+class StreamPrinter:
+    """Line-buffered, label-prefixed printer shared by concurrent streams."""
+
+    def __init__(self, width: int = 100, out: Optional[TextIO] = None):
+        """
+        Args:
+            width: Wrap buffered text at a word boundary once a line reaches this many characters
+            out: Output stream (default sys.stdout)
+        """
+        self.width = width
+        self.out = out or sys.stdout
+        self._buffers: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def open(self, label: str) -> LabeledStream:
+        return LabeledStream(self, label)
+
+    def write(self, label: str, delta: str) -> None:
+        with self._lock:
+            lines = (self._buffers.get(label, "") + delta).split("\n")
+            buffer = lines.pop()
+            for line in lines:
+                self._emit(label, line)
+            while len(buffer) >= self.width:
+                cut = buffer.rfind(" ", 0, self.width)
+                if cut <= 0:
+                    cut = self.width
+                self._emit(label, buffer[:cut])
+                buffer = buffer[cut:].lstrip(" ")
+            self._buffers[label] = buffer
+
+    def finish(self, label: str) -> None:
+        """Flush whatever is left of a stream's last line."""
+        with self._lock:
+            buffer = self._buffers.pop(label, "")
+            if buffer:
+                self._emit(label, buffer)
+
+    def _emit(self, label: str, line: str) -> None:
+        self.out.write(f"{label} | {line}\n")
+        self.out.flush()
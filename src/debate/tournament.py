@@ -0,0 +1,160 @@
+"""
+Tournament runner: many debates in one process over one shared, bounded LLM worker pool.
+
+Agent, judge and summarizer definitions are loaded once into a single OrchestratorAgent. Debates
+run concurrently on one asyncio event loop through OrchestratorAgent.async_run, with a shared
+semaphore bounding the LLM calls of all debates together. Each finished debate is appended to a
+JSONL results file straight away, so an interrupted tournament keeps its results and resumes with
+the prompts that are still missing.
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+from src.agents.llm_utils import async_client_session, get_rate_limiter
+
+
+def _format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours}h{minutes:02d}m{seconds:02d}s" if hours else f"{minutes}m{seconds:02d}s"
+
+
+def _generated_tokens(token_usage: Dict[str, List[Dict[str, Any]]]) -> int:
+    """Tokens the provider actually processed for a debate (cache hits excluded)."""
+    return sum(
+        usage.get("total_tokens", 0)
+        for usages in token_usage.values() for usage in usages
+        if usage and not usage.get("cached")
+    )
+
+
+class TournamentRunner:
+    """Runs a list of prompts as concurrent debates and reports progress and throughput."""
+
+    def __init__(self, orchestrator, results_path: str, max_debates: int = 4, max_llm_calls: int = 16,
+                 max_parallel: int = 4, verbose: bool = False):
+        """
+        Args:
+            orchestrator: OrchestratorAgent shared by every debate
+            results_path: JSONL file receiving one line per finished debate
+            max_debates: Debates in flight at once
+            max_llm_calls: LLM calls in flight at once across all debates
+            max_parallel: Per-phase concurrency within one debate (see async_run)
+            verbose: Show each debate's full console output instead of progress lines only
+        """
+        self.orchestrator = orchestrator
+        self.results_path = results_path
+        self.max_debates = max(1, max_debates)
+        self.max_llm_calls = max(1, max_llm_calls)
+        self.max_parallel = max_parallel
+        self.verbose = verbose
+        self.out = sys.stderr  # Progress goes to stderr so it survives quiet mode
+
+    def _completed(self) -> Dict[int, Dict[str, Any]]:
+        """Results already in results_path, by prompt index."""
+        done = {}
+        if os.path.exists(self.results_path):
+            with open(self.results_path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        if not record.get("error"):
+                            done[record["index"]] = record
+        return done
+
+    def _report(self, finished: int, failed: int, total: int, tokens: int, start: float) -> None:
+        elapsed = time.perf_counter() - start
+        rate = finished / elapsed if elapsed else 0.0
+        eta = (total - finished) / rate if rate else 0.0
+        print(f"[tournament] {finished}/{total} debates ({failed} failed) | elapsed {_format_duration(elapsed)} | "
+              f"ETA {_format_duration(eta)} | {rate * 3600:.1f} debates/h | {tokens / elapsed if elapsed else 0:.0f} tokens/s",
+              file=self.out, flush=True)
+
+    async def run(self, prompts: List[str]) -> Dict[str, Any]:
+        """
+        Debate every prompt not yet in results_path.
+        Returns:
+            Throughput summary: {"debates", "failed", "skipped", "wall_time", "debates_per_hour", "tokens", "tokens_per_second", "wins"}
+        """
+        done = self._completed()
+        pending = [(index, prompt) for index, prompt in enumerate(prompts) if index not in done]
+        if done:
+            print(f"[tournament] {len(done)} debates already in {self.results_path}; running the other {len(pending)}",
+                  file=self.out, flush=True)
+
+        window = get_rate_limiter().max_concurrency
+        if self.max_llm_calls > window:
+            print(f"[tournament] warning: {self.max_llm_calls} LLM workers but the rate limiter allows {window} "
+                  f"calls in flight; set LLM_MAX_CONCURRENCY to use them all", file=self.out, flush=True)
+        debate_slots = asyncio.Semaphore(self.max_debates)
+        llm_slots = asyncio.Semaphore(self.max_llm_calls)
+        write_lock = asyncio.Lock()
+        stats = {"finished": 0, "failed": 0, "tokens": 0}
+        wins: Dict[str, int] = {}
+        start = time.perf_counter()
+        os.makedirs(os.path.dirname(os.path.abspath(self.results_path)), exist_ok=True)
+
+        async def debate(index: int, prompt: str) -> None:
+            async with debate_slots:
+                debate_start = time.perf_counter()
+                record = {"index": index, "prompt": prompt}
+                try:
+                    result = await self.orchestrator.async_run(prompt, max_parallel=self.max_parallel, llm_slots=llm_slots)
+                    tokens = _generated_tokens(result["token_usage"])
+                    record.update(result, tokens=tokens)
+                    stats["tokens"] += tokens
+                    if result["winner"]:
+                        wins[result["winner"]] = wins.get(result["winner"], 0) + 1
+                except Exception as e:
+                    record["error"] = f"{type(e).__name__}: {e}"
+                    stats["failed"] += 1
+                record["elapsed"] = round(time.perf_counter() - debate_start, 3)
+            async with write_lock:
+                line = json.dumps(record, ensure_ascii=False) + "\n"
+                await asyncio.to_thread(self._append, line)
+                stats["finished"] += 1
+                self._report(stats["finished"], stats["failed"], len(pending), stats["tokens"], start)
+
+        # Debate transcripts are long; unless verbose, keep them off the console (progress is on stderr).
+        # One client session spans the tournament, so the LLM connection pool outlives each debate
+        async with async_client_session():
+            with contextlib.ExitStack() as stack:
+                if not self.verbose:
+                    stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, "w"))))
+                await asyncio.gather(*(debate(index, prompt) for index, prompt in pending))
+
+        wall_time = time.perf_counter() - start
+        summary = {
+            "debates": stats["finished"] - stats["failed"],
+            "failed": stats["failed"],
+            "skipped": len(done),
+            "wall_time": wall_time,
+            "debates_per_hour": (stats["finished"] - stats["failed"]) / wall_time * 3600 if wall_time else 0.0,
+            "tokens": stats["tokens"],
+            "tokens_per_second": stats["tokens"] / wall_time if wall_time else 0.0,
+            "wins": dict(sorted(wins.items(), key=lambda item: -item[1])),
+        }
+        self.print_summary(summary)
+        return summary
+
+    def _append(self, line: str) -> None:
+        with open(self.results_path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+    def print_summary(self, summary: Dict[str, Any]) -> None:
+        print("\n=== Tournament Summary ===", file=self.out)
+        print(f"Debates: {summary['debates']} completed, {summary['failed']} failed, {summary['skipped']} from earlier runs",
+              file=self.out)
+        print(f"Wall time: {_format_duration(summary['wall_time'])}", file=self.out)
+        print(f"Throughput: {summary['debates_per_hour']:.1f} debates/hour, {summary['tokens_per_second']:.0f} tokens/second "
+              f"({summary['tokens']} tokens)", file=self.out)
+        for agent, count in summary["wins"].items():
+            print(f"  {agent}: {count} wins", file=self.out)
+        print(file=self.out, flush=True)
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Offline debate sweep through a batch backend.
+Reads one prompt per line from a file and debates every prompt phase by phase, one batch per phase.
+Re-running with the same work directory resumes an interrupted sweep.
+
+Usage:
+    python -m src.main_batch prompts.txt [--work-dir DIR] [--backend openai|local] [--poll-interval SECONDS]
+"""
+
+import argparse
+import os
+import sys
+
+# Add project root to path if needed for imports
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.agents.batch import LocalBatchBackend, OpenAIBatchBackend
+from src.agents.orchestrator_dynamic import OrchestratorAgent
+from src.debate.batch_runner import BatchDebateRunner
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a sweep of debates through a batch API")
+    parser.add_argument("prompts_file", help="Text file with one debate prompt per line")
+    parser.add_argument("--work-dir", default=os.path.join(project_root, "batches", "sweep"),
+                        help="Directory for batch files and resumable sweep state")
+    parser.add_argument("--backend", choices=["openai", "local"], default="openai",
+                        help="openai: provider Batch API; local: run the batch files through call_openai here")
+    parser.add_argument("--poll-interval", type=float, default=60.0, help="Seconds between batch status checks")
+    args = parser.parse_args()
+
+    with open(args.prompts_file, encoding="utf-8") as f:
+        prompts = [line.strip() for line in f if line.strip()]
+    if not prompts:
+        parser.error(f"No prompts found in {args.prompts_file}")
+
+    if args.backend == "local":
+        backend = LocalBatchBackend(os.path.join(args.work_dir, "local"))
+    else:
+        backend = OpenAIBatchBackend()
+
+    orchestrator = OrchestratorAgent(agent_definitions_dir=os.path.join(project_root, "agent_definitions"))
+    runner = BatchDebateRunner(orchestrator, backend, args.work_dir, poll_interval=args.poll_interval)
+    results = runner.run(prompts)
+    print(f"\nCompleted {len(results)} debates from {args.prompts_file}")
+
+
+if __name__ == "__main__":
+    main()
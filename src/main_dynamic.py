@@ -4,6 +4,7 @@ Main entry point for the Philosophical Multi-Agent Debate System with dynamic ag
 Loads philosophical agents from individual definition files.
 """
 
+import asyncio
 import os
 import sys
 from pathlib import Path
@@ -59,8 +60,16 @@ def main():
             print("Invalid PARALLEL_AGENTS setting, using sequential processing")
             pass
 
-    # Run the debate with optional parallelism    
-    orchestrator.run(prompt, max_parallel=max_parallel)
+    # Run the debate with optional parallelism.
+    # DEBATE_ENGINE=async runs every phase on one asyncio event loop instead of per-phase thread pools;
+    # DEBATE_ENGINE=dag starts each call as soon as its inputs are ready instead of at phase barriers.
+    engine = os.environ.get("DEBATE_ENGINE", "threaded").lower()
+    if engine == "async":
+        asyncio.run(orchestrator.async_run(prompt, max_parallel=max_parallel))
+    elif engine == "dag":
+        orchestrator.run_dag(prompt, max_parallel=max_parallel)
+    else:
+        orchestrator.run(prompt, max_parallel=max_parallel)
 
 
 if __name__ == "__main__":
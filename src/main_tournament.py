@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tournament entry point: debate every prompt in a file concurrently in one process.
+Definitions are loaded once; results are appended to a JSONL file as each debate finishes,
+and re-running with the same results file skips prompts that already have a result.
+
+Usage:
+    python -m src.main_tournament prompts.txt [--results FILE] [--debates N] [--workers N] [--verbose]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+# Add project root to path if needed for imports
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.agents.orchestrator_dynamic import OrchestratorAgent
+from src.config.settings import get_rate_limit_config
+from src.debate.tournament import TournamentRunner
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run many debates concurrently over a shared LLM worker pool")
+    parser.add_argument("prompts_file", help="Text file with one debate prompt per line")
+    parser.add_argument("--results", default=os.path.join(project_root, "logs", "tournament_results.jsonl"),
+                        help="JSONL file receiving one result per debate")
+    parser.add_argument("--debates", type=int, default=4, help="Debates running at once")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="LLM calls in flight across all debates; also sizes the connection pool and "
+                             "rate limiter window (default: LLM_MAX_CONCURRENCY)")
+    parser.add_argument("--max-parallel", type=int, default=4, help="Per-phase concurrency inside one debate")
+    parser.add_argument("--verbose", action="store_true", help="Print every debate's full output")
+    args = parser.parse_args()
+
+    with open(args.prompts_file, encoding="utf-8") as f:
+        prompts = [line.strip() for line in f if line.strip()]
+    if not prompts:
+        parser.error(f"No prompts found in {args.prompts_file}")
+
+    if args.workers:
+        # Size the shared client pool and rate limiter before the first LLM call creates them
+        os.environ["LLM_POOL_SIZE"] = str(args.workers)
+        os.environ["LLM_MAX_CONCURRENCY"] = str(args.workers)
+
+    orchestrator = OrchestratorAgent(agent_definitions_dir=os.path.join(project_root, "agent_definitions"))
+    runner = TournamentRunner(
+        orchestrator,
+        args.results,
+        max_debates=args.debates,
+        max_llm_calls=args.workers or get_rate_limit_config()["max_concurrency"],
+        max_parallel=args.max_parallel,
+        verbose=args.verbose,
+    )
+    asyncio.run(runner.run(prompts))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Append-only JSON Lines log of saved debates (debate_history.jsonl).
+
+MemoryManager appends one compact line per debate once the debate is committed to the store:
+{"debate_id", "timestamp", "date", "prompt", "topic", "agents", "winner", "is_tie"}. The full record is
+kept by the store only (MemoryManager.get_debate); lines written before debates went through the store
+carry the whole debate instead and no debate_id.
+
+read() streams the lines from a byte offset and follow() tails the log like `tail -f`; both stop
+before a final line that is still being written.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+# Debate fields copied into a log line
+LOG_FIELDS = ("debate_id", "timestamp", "date", "prompt", "topic", "winner", "is_tie")
+
+
+def log_entry(debate_data: Dict[str, Any]) -> Dict[str, Any]:
+    """The log line of a saved debate (one carrying debate_id, timestamp and the other metadata)."""
+    entry = {field: debate_data[field] for field in LOG_FIELDS if field in debate_data}
+    entry["agents"] = [statement.get("agent", "Unknown") for statement in
+                       debate_data.get("responses", []) + debate_data.get("opening_statements", [])]
+    return entry
+
+
+class DebateLog:
+    """A debate_history.jsonl file: appended by writers in any process, streamed by readers."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """Append one line, in a single write to a file opened for appending, so concurrent writers never interleave."""
+        line = (json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+        with self._lock:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+
+    def read(self, offset: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Stream the entries from a byte offset.
+        Yields:
+            (offset of the next line, entry); unparsable complete lines are skipped
+        """
+        if not self.path.exists():
+            return
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    return  # Still being written
+                offset += len(line)
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                yield offset, entry
+
+    def follow(self, offset: int = 0, poll_interval: float = 1.0,
+               stop: Optional[Callable[[], bool]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the entries from a byte offset, then wait for new ones (until stop() returns True).
+        A log truncated or replaced below the offset is read again from its start.
+        """
+        while stop is None or not stop():
+            for offset, entry in self.read(offset):
+                yield entry
+            try:
+                if os.path.getsize(self.path) < offset:
+                    offset = 0
+            except OSError:
+                offset = 0
+            time.sleep(poll_interval)
@@ -0,0 +1,112 @@
+"""
+Embedding providers for semantic debate retrieval.
+
+A provider turns texts into L2-normalized float32 vectors of a fixed size, so cosine similarity is
+a dot product. HashingEmbedder is local and deterministic (feature hashing of stemmed terms and
+adjacent-term pairs); OpenAIEmbedder calls the configured embeddings endpoint. get_embedding_provider
+picks one from EMBEDDING_PROVIDER and returns None when embeddings are disabled or NumPy is missing.
+"""
+
+import hashlib
+import math
+from functools import lru_cache
+from typing import List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # Semantic retrieval is disabled; keyword ranking still works
+    np = None
+
+from src.config.settings import get_embedding_config, get_llm_config
+from .search_index import tokenize
+
+# Characters of a text sent to an embeddings API (well inside the usual 8k-token input limit)
+MAX_API_CHARS = 16000
+
+
+@lru_cache(maxsize=200000)
+def _feature(feature: str) -> int:
+    """Stable 64-bit hash of a feature (Python's hash() is salted per process)."""
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32, copy=False)
+
+
+class EmbeddingProvider:
+    """Turns texts into unit-length vectors of `dim` float32 values."""
+
+    name = "base"
+
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    def embed(self, texts: List[str]):
+        """
+        Returns:
+            float32 array of shape (len(texts), dim), each row of unit length (or zero for empty text)
+        """
+        raise NotImplementedError
+
+
+class HashingEmbedder(EmbeddingProvider):
+    """
+    Signed feature hashing of stemmed terms and adjacent-term pairs with sublinear term frequency.
+    Deterministic and free: texts sharing vocabulary (after stemming and stopword removal) land close.
+    """
+
+    def __init__(self, dim: int = 256):
+        super().__init__(dim)
+        self.name = f"hashing-{dim}"
+
+    def embed(self, texts: List[str]):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            terms = tokenize(text or "")
+            counts = {}
+            for feature in terms + [f"{a} {b}" for a, b in zip(terms, terms[1:])]:
+                counts[feature] = counts.get(feature, 0) + 1
+            for feature, count in counts.items():
+                h = _feature(feature)
+                vectors[row, h % self.dim] += (1.0 + math.log(count)) * (1.0 if h >> 63 else -1.0)
+        return _normalize(vectors)
+
+
+class OpenAIEmbedder(EmbeddingProvider):
+    """Embeddings from the OpenAI-compatible endpoint in the LLM config (OPENAI_API_KEY/BASE_URL)."""
+
+    def __init__(self, model: str, dim: int = 256):
+        super().__init__(dim)
+        self.model = model
+        self.name = f"openai-{model}-{dim}"
+
+    def embed(self, texts: List[str]):
+        from src.agents.llm_utils import get_client  # Imported here: only this provider needs the client
+        cfg = get_llm_config()
+        client = get_client(cfg["api_key"], cfg.get("base_url"))
+        inputs = [(text or " ")[:MAX_API_CHARS] for text in texts]
+        response = client.embeddings.create(model=self.model, input=inputs, dimensions=self.dim)
+        vectors = np.array([item.embedding for item in sorted(response.data, key=lambda item: item.index)],
+                           dtype=np.float32)
+        return _normalize(vectors.reshape(len(texts), self.dim))
+
+
+def get_embedding_provider(config: Optional[dict] = None) -> Optional[EmbeddingProvider]:
+    """
+    The configured embedding provider (see get_embedding_config), or None when EMBEDDING_PROVIDER is
+    "none", the OpenAI provider has no API key, or NumPy is not installed.
+    """
+    config = config or get_embedding_config()
+    if np is None or config["provider"] in ("none", "off", "0"):
+        return None
+    if config["provider"] == "openai":
+        if not get_llm_config()["api_key"]:
+            print("EMBEDDING_PROVIDER=openai needs OPENAI_API_KEY; semantic retrieval is disabled")
+            return None
+        return OpenAIEmbedder(config["model"], config["dim"])
+    if config["provider"] != "hashing":
+        raise ValueError(f"Unknown embedding provider: {config['provider']!r} (expected hashing, openai or none)")
+    return HashingEmbedder(config["dim"])
@@ -0,0 +1,214 @@
+"""
+Crash-safe file replacement with a write-ahead journal and group commit.
+
+A commit replaces a set of files atomically, all or nothing:
+
+1. each new file content is written (and fsynced) to a staging file "<name>.<batch>.wal-tmp" beside it;
+2. one journal line {"batch", "files": [[staged, target], ...]} is appended and fsynced - the commit
+   point;
+3. the staging files are renamed over their targets and a {"batch", "done": true} line is appended.
+
+On startup, recover() rolls committed batches forward (renaming any staging file still present) and
+rolls uncommitted ones back (deleting their staging files), so a crash never leaves a torn file or
+half of a save. Commits from concurrent threads are grouped: while one thread flushes a batch, others
+queue their writes; the next batch then carries all of them, coalesced per file (the newest content
+wins), with one fsync per distinct file and one journal fsync for the whole group.
+"""
+
+import json
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Union
+
+STAGING_SUFFIX = ".wal-tmp"
+
+# Journal size beyond which it is emptied once every batch in it is done
+JOURNAL_MAX_BYTES = 1 << 20
+
+# New content for a file: bytes, or a callable producing them when the commit is queued
+Content = Union[bytes, Callable[[], bytes]]
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Persist renames in a directory (not supported on every platform)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write(path: Path, data: bytes, fsync: bool = True) -> None:
+    """Replace a file with new content via a staging file and rename; readers never see a torn file."""
+    path = Path(path)
+    staged = path.with_name(f"{path.name}.{uuid.uuid4().hex}{STAGING_SUFFIX}")
+    with open(staged, "wb") as f:
+        f.write(data)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(staged, path)
+    if fsync:
+        _fsync_dir(path.parent)
+
+
+class WriteJournal:
+    """Journaled, group-committed replacement of files under a root directory."""
+
+    def __init__(self, root: Path, journal_path: Path, fsync: bool = True):
+        """
+        Args:
+            root: Directory the journaled files live under (journal entries are relative to it)
+            journal_path: The journal file
+            fsync: Flush staged files and the journal to disk before committing (off: atomic but
+                   not durable across power loss)
+        """
+        self.root = Path(root)
+        self.journal_path = Path(journal_path)
+        self.fsync = fsync
+        self._cond = threading.Condition()
+        self._pending: Dict[Path, bytes] = {}
+        self._inflight: Dict[Path, bytes] = {}  # Batch being flushed
+        self._flushing = False
+        self._next_batch = 0      # Batch the next queued commit joins
+        self._done_batch = -1     # Last batch flushed
+        self._errors: Dict[int, BaseException] = {}
+        self.batches = 0          # Batches flushed (for group commit statistics)
+        self.commits = 0          # Commits queued
+
+    # --- Recovery ---
+
+    def recover(self, directories: Iterable[Path]) -> int:
+        """
+        Finish or undo saves interrupted by a crash, then empty the journal.
+        Args:
+            directories: Directories that may hold staging files
+        Returns:
+            Number of batches rolled forward
+        """
+        committed, done = {}, set()
+        if self.journal_path.exists():
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line) if line.endswith("\n") else None
+                    except ValueError:
+                        record = None
+                    if record is None:
+                        break  # Torn last line: that batch never committed
+                    if record.get("done"):
+                        done.add(record["batch"])
+                    else:
+                        committed[record["batch"]] = record["files"]
+        rolled_forward = 0
+        for batch, files in committed.items():
+            if batch in done:
+                continue
+            for staged, target in files:
+                if (self.root / staged).exists():
+                    os.replace(self.root / staged, self.root / target)
+            rolled_forward += 1
+        for directory in directories:
+            for staged in Path(directory).glob(f"*{STAGING_SUFFIX}"):
+                os.remove(staged)  # Never committed (or already renamed): roll back
+        if self.journal_path.exists():
+            os.remove(self.journal_path)
+        return rolled_forward
+
+    # --- Commits ---
+
+    def commit(self, writes: Dict[Path, Content]) -> None:
+        """Atomically replace the given files, returning once the change is durable."""
+        self.wait(self.enqueue(writes))
+
+    def enqueue(self, writes: Dict[Path, Content]) -> int:
+        """
+        Queue an atomic replacement of the given files without waiting for it. Content callables
+        are called here, so the latest queued content of a file is the newest.
+        Returns:
+            The batch to pass to wait()
+        """
+        with self._cond:
+            for path, content in writes.items():
+                self._pending[Path(path)] = content() if callable(content) else content
+            self.commits += 1
+            return self._next_batch
+
+    def wait(self, batch: int) -> None:
+        """Return once a queued batch is durable, flushing it unless another thread already is."""
+        with self._cond:
+            while self._done_batch < batch and self._flushing:
+                self._cond.wait()  # Another thread flushes our batch or the one before it
+            lead = self._done_batch < batch
+            if lead:
+                self._flushing = True
+        if lead:
+            self._lead()
+        error = self._errors.get(batch)
+        if error is not None:
+            raise error
+
+    def read_pending(self, path: Path) -> Optional[bytes]:
+        """The newest queued content of a file not yet replaced on disk, if any."""
+        with self._cond:
+            path = Path(path)
+            if path in self._pending:
+                return self._pending[path]
+            return self._inflight.get(path)
+
+    def _lead(self) -> None:
+        """Flush batches until no writes are queued."""
+        while True:
+            with self._cond:
+                if not self._pending:
+                    self._flushing = False
+                    self._cond.notify_all()
+                    return
+                writes, self._pending = self._pending, {}
+                self._inflight = writes
+                batch = self._next_batch
+                self._next_batch += 1
+            try:
+                self._flush(writes)
+            except BaseException as e:
+                with self._cond:
+                    self._errors[batch] = e
+            with self._cond:
+                self._inflight = {}
+                self._errors.pop(batch - 64, None)
+                self._done_batch = batch
+                self.batches += 1
+                self._cond.notify_all()
+
+    def _flush(self, writes: Dict[Path, bytes]) -> None:
+        token = uuid.uuid4().hex[:12]
+        files = []
+        for path, data in writes.items():
+            staged = path.with_name(f"{path.name}.{token}{STAGING_SUFFIX}")
+            with open(staged, "wb") as f:
+                f.write(data)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            files.append([os.path.relpath(staged, self.root), os.path.relpath(path, self.root)])
+        with open(self.journal_path, "a", encoding="utf-8") as journal:
+            journal.write(json.dumps({"batch": token, "files": files}) + "\n")
+            journal.flush()
+            if self.fsync:
+                os.fsync(journal.fileno())
+            for staged, target in files:
+                os.replace(self.root / staged, self.root / target)
+            if self.fsync:
+                for directory in {path.parent for path in writes}:
+                    _fsync_dir(directory)
+            journal.write(json.dumps({"batch": token, "done": True}) + "\n")
+        if os.path.getsize(self.journal_path) > JOURNAL_MAX_BYTES:
+            # Only the flushing thread writes the journal and every batch in it is done
+            os.remove(self.journal_path)
@@ -0,0 +1,111 @@
+"""
+Inter-process locking for a memory/ directory shared by several processes.
+
+Writers (e.g. the containers of docker-compose.yml sharing one memory/ volume) serialize their
+updates with an exclusive flock on memory/.memory.lock. A process holds the flock while any of its
+threads is inside a write section; its threads share the hold, so their saves can still be
+group-committed together (journal.py).
+
+The lock file also holds a change counter. A writer that changed the store bumps it when it releases
+the lock, and a process seeing a counter other than the last one it saw knows its caches are stale.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Not on POSIX: only the threads of one process are serialized
+    fcntl = None
+
+# The counter is stored zero-padded to a fixed width, so it is always overwritten in place
+COUNTER_WIDTH = 20
+
+
+class StoreLock:
+    """Process-exclusive, thread-shared write lock with a change counter."""
+
+    def __init__(self, path: Path, timeout: Optional[float] = None):
+        """
+        Args:
+            path: Lock file
+            timeout: Seconds to wait for another process to release the lock before raising
+                     TimeoutError (None waits indefinitely)
+        """
+        self.path = Path(path)
+        self.timeout = timeout
+        self._mutex = threading.Lock()
+        self._holders = 0
+        self._fd = None
+        self._changed = False
+        self.seen = self.read_counter()  # Counter value this process's caches reflect
+
+    def __enter__(self) -> "StoreLock":
+        with self._mutex:
+            if self._holders == 0:
+                fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                if fcntl is not None:
+                    try:
+                        self._flock(fd)
+                    except BaseException:
+                        os.close(fd)
+                        raise
+                self._fd = fd
+            self._holders += 1
+        return self
+
+    def _flock(self, fd: int) -> None:
+        if self.timeout is None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            return
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"{self.path} is held by another process")
+                time.sleep(0.05)
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        with self._mutex:
+            self._holders -= 1
+            if self._holders:
+                return
+            try:
+                if self._changed:
+                    counter = self.read_counter() + 1
+                    os.pwrite(self._fd, str(counter).zfill(COUNTER_WIDTH).encode("ascii"), 0)
+                    # Our own change: the caches are current unless another process changed the store first
+                    if self.seen == counter - 1:
+                        self.seen = counter
+                    self._changed = False
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+                os.close(self._fd)
+                self._fd = None
+
+    def mark_changed(self) -> None:
+        """Record that the current holder changed the store (the counter is bumped on release)."""
+        self._changed = True
+
+    def read_counter(self) -> int:
+        """The change counter in the lock file (0 before any change)."""
+        try:
+            with open(self.path, "rb") as f:
+                return int(f.read(COUNTER_WIDTH) or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def poll(self) -> bool:
+        """Whether the store changed since the last poll (or since the lock was created)."""
+        counter = self.read_counter()
+        if counter == self.seen:
+            return False
+        self.seen = counter
+        return True
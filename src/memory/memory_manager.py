@@ -6,9 +6,20 @@ Handles persistent storage and retrieval of agent memories and debate history.
 import os
 import json
 import datetime
+import threading
+from collections import OrderedDict
 from typing import Dict, List, Any, Optional, Tuple, Union
 from pathlib import Path
 
+from src.config.settings import (get_embedding_config, get_memory_backend, get_memory_cache_config, get_memory_fsync,
+                                 get_memory_retention)
+from .debate_log import DebateLog, log_entry
+from .embeddings import get_embedding_provider
+from .locking import StoreLock
+from .retention import retention_ops
+from .search_index import DebateSearchIndex, debate_statements, reciprocal_rank_fusion
+from .storage import apply_ops, create_store, debate_summary, sort_debate_summaries, topic_relevance
+
 
 class MemoryManager:
     """
@@ -18,13 +29,27 @@ class MemoryManager:
     - Cross-references between related debates
     """
     
-    def __init__(self, memory_dir: Optional[str] = None):
+    MIN_DEBATE_SIMILARITY = 0.2  # Embedding similarity below which a debate is not considered related
+    
+    def __init__(self, memory_dir: Optional[str] = None, backend: Optional[str] = None,
+                 lazy: Optional[bool] = None, agent_cache_size: Optional[int] = None,
+                 retain_entries: Optional[int] = None, history_log: Optional[str] = None):
         """
         Initialize the MemoryManager with a directory for storing memory files.
         
         Args:
             memory_dir: Directory path for storing memory files. If None,
                        defaults to {project_root}/memory/
+            backend: Storage backend, "json", "segment" or "sqlite" (see storage.py). If None,
+                     taken from MEMORY_BACKEND
+            lazy: Load agent memories and indexes on first use instead of at startup. If None,
+                  taken from MEMORY_LAZY_LOAD
+            agent_cache_size: Agent memories kept in the LRU cache when lazy. If None,
+                              taken from MEMORY_AGENT_CACHE_SIZE
+            retain_entries: Debate entries kept raw per agent memory, older ones being folded into
+                            per-topic digests (0 keeps all). If None, taken from MEMORY_RETAIN_ENTRIES
+            history_log: JSON Lines log (e.g. debate_history.jsonl) getting one compact line per
+                         saved debate (see debate_log.py). If None, no log is written
         """
         if memory_dir is None:
             # Default to {project_root}/memory/
@@ -35,16 +60,46 @@ class MemoryManager:
             
         # Create memory directory structure if it doesn't exist
         self._ensure_memory_dirs()
+        # Writers in other processes may share the directory: writes (and opening the store, which
+        # recovers interrupted saves) hold the store lock; caches are dropped when its counter moves
+        self._store_lock = StoreLock(self.memory_dir / ".memory.lock")
+        self._write_lock = threading.RLock()  # Serializes this process's updates of the cached indexes
+        with self._store_lock:
+            self.store = create_store(backend or get_memory_backend(), self.memory_dir, get_memory_fsync())
         
-        # Cache for in-memory storage of frequently accessed data
+        cache_config = get_memory_cache_config()
+        self.lazy = cache_config["lazy"] if lazy is None else lazy
+        # Eager loading keeps every agent; lazy loading bounds the agent LRU
+        self.agent_cache_size = (agent_cache_size or cache_config["agent_cache_size"]) if self.lazy else 0
+        self.retain_entries = get_memory_retention() if retain_entries is None else retain_entries
+        
+        # Cache for in-memory storage of frequently accessed data; the indexes are None until first used
         self.cache = {
-            "agent_memories": {},      # Indexed by agent name
-            "debate_history": [],      # List of debate entries
-            "topic_index": {}          # Topic -> list of debate IDs
+            "agent_memories": OrderedDict(),  # Indexed by agent name, least recently used first
+            "debate_history": None,           # List of debate entries
+            "topic_index": None               # Topic -> list of debate IDs
         }
+        self._agent_names = None              # Names of all agents with a stored memory
+        self.debate_log = DebateLog(history_log) if history_log else None
+        # BM25 index over prompts and statements for get_relevant_debates, loaded on first use
+        self.search_index = DebateSearchIndex(self.memory_dir / "indexes")
+        
+        # Embeddings of each debate and agent statement, computed once when the debate is saved
+        # (None when EMBEDDING_PROVIDER=none or NumPy is missing)
+        embedding_config = get_embedding_config()
+        self.embedder = get_embedding_provider(embedding_config)
+        self.debate_vectors = self.position_vectors = None
+        if self.embedder is not None:
+            from .vector_index import VectorIndex
+            index_dir = self.memory_dir / "indexes"
+            self.debate_vectors = VectorIndex(index_dir, "debate_vectors", self.embedder.dim, self.embedder.name,
+                                              embedding_config["ivf_threshold"])
+            self.position_vectors = VectorIndex(index_dir, "position_vectors", self.embedder.dim, self.embedder.name,
+                                                embedding_config["ivf_threshold"])
         
         # Load existing memory files into cache
-        self._initialize_cache()
+        if not self.lazy:
+            self._initialize_cache()
     
     def _ensure_memory_dirs(self) -> None:
         """
@@ -59,34 +114,123 @@ class MemoryManager:
         """
         Load existing memory files into cache for faster access.
         """
-        # Load agent memories
-        agent_dir = self.memory_dir / "agents"
-        if agent_dir.exists():
-            for agent_file in agent_dir.glob("*.json"):
-                try:
-                    with open(agent_file, 'r') as f:
-                        agent_name = agent_file.stem  # Filename without extension
-                        self.cache["agent_memories"][agent_name] = json.load(f)
-                except Exception as e:
-                    print(f"Error loading agent memory {agent_file}: {e}")
-        
-        # Load debate history index
-        debate_index_path = self.memory_dir / "indexes" / "debate_index.json"
-        if debate_index_path.exists():
-            try:
-                with open(debate_index_path, 'r') as f:
-                    self.cache["debate_history"] = json.load(f)
-            except Exception as e:
-                print(f"Error loading debate index: {e}")
-        
-        # Load topic index
-        topic_index_path = self.memory_dir / "indexes" / "topic_index.json"
-        if topic_index_path.exists():
-            try:
-                with open(topic_index_path, 'r') as f:
-                    self.cache["topic_index"] = json.load(f)
-            except Exception as e:
-                print(f"Error loading topic index: {e}")
+        self.cache["agent_memories"] = OrderedDict(self.store.load_agents())
+        self._agent_names = set(self.cache["agent_memories"])
+        self._debate_history()
+        self._topic_index()
+        self._search_index()
+        if self.embedder is not None:
+            self._vector_indexes()
+    
+    def _sync_with_store(self) -> None:
+        """Drop the caches and indexes if another process changed the store since they were loaded."""
+        if not self._store_lock.poll():
+            return
+        with self._store_lock, self._write_lock:
+            self.store.refresh()
+            self.cache["agent_memories"] = OrderedDict()
+            self.cache["debate_history"] = None
+            self.cache["topic_index"] = None
+            self._agent_names = None
+            self.search_index.unload()
+            if self.embedder is not None:
+                self.debate_vectors.unload()
+                self.position_vectors.unload()
+    
+    @property
+    def generation(self) -> int:
+        """Change counter of the store; it moves whenever this or another process saves to it."""
+        self._sync_with_store()
+        return self._store_lock.seen
+    
+    def _debate_history(self) -> List[Dict[str, Any]]:
+        """The debate index, loaded on first use."""
+        self._sync_with_store()
+        if self.cache["debate_history"] is None:
+            self.cache["debate_history"] = self.store.load_debate_index()
+        return self.cache["debate_history"]
+    
+    def _topic_index(self) -> Dict[str, List[str]]:
+        """The topic index, loaded on first use."""
+        self._sync_with_store()
+        if self.cache["topic_index"] is None:
+            self.cache["topic_index"] = self.store.load_topic_index()
+        return self.cache["topic_index"]
+    
+    def _search_index(self) -> DebateSearchIndex:
+        """The relevance index, loaded on first use and caught up with debates it has not seen."""
+        self._sync_with_store()
+        if not self.search_index.loaded:
+            with self._store_lock:  # Catching up may rewrite the index files
+                self.search_index.load(self.store.debate_ids(), self.store.load_debate)
+        return self.search_index
+    
+    def _vector_indexes(self):
+        """The debate and position vector stores, loaded on first use and backfilled for debates saved without vectors."""
+        self._sync_with_store()
+        if not self.debate_vectors.loaded:
+            with self._store_lock:  # Rows are appended at the end of the shared vector files
+                self.debate_vectors.load()
+                self.position_vectors.load()
+                missing = [debate_id for debate_id in self.store.debate_ids() if debate_id not in self.debate_vectors]
+                if missing:
+                    print(f"Embedding {len(missing)} debates saved without vectors...")
+                for debate_id in missing:
+                    try:
+                        debate_data = self.store.load_debate(debate_id)
+                    except Exception as e:
+                        print(f"Error loading debate {debate_id}: {e}")
+                        continue
+                    if debate_data is not None:
+                        self._embed_debate(debate_id, debate_data)
+        return self.debate_vectors, self.position_vectors
+    
+    def _embed_debate(self, debate_id: str, debate_data: Dict[str, Any]) -> None:
+        """Store the vectors of a debate (prompt and all statements) and of each agent's statements in it."""
+        topic = debate_data.get("topic", "Unknown")
+        statements = debate_statements(debate_data)
+        texts = [debate_data.get("prompt", "") + "\n\n" + "\n\n".join(text for _, text in statements)]
+        texts += [text for _, text in statements]
+        try:
+            vectors = self.embedder.embed(texts)
+        except Exception as e:
+            print(f"Error embedding debate {debate_id}: {e}")
+            return
+        self.debate_vectors.add([(debate_id, None, {"topic": topic})], vectors[:1])
+        if statements:
+            self.position_vectors.add(
+                [(f"{agent_name}/{debate_id}", agent_name, {"debate_id": debate_id, "topic": topic})
+                 for agent_name, _ in statements],
+                vectors[1:],
+            )
+    
+    def _known_agents(self) -> set:
+        """Names of all agents with a stored memory, listed on first use."""
+        self._sync_with_store()
+        if self._agent_names is None:
+            self._agent_names = set(self.store.agent_names())
+        return self._agent_names
+    
+    def _cached_agent(self, agent_name: str) -> Optional[Dict[str, Any]]:
+        """An agent's memory from the LRU cache, loading it from the store on a miss."""
+        self._sync_with_store()
+        memories = self.cache["agent_memories"]
+        if agent_name in memories:
+            memories.move_to_end(agent_name)
+            return memories[agent_name]
+        if agent_name not in self._known_agents():
+            return None
+        memory = self.store.load_agent(agent_name)
+        if memory is not None:
+            self._remember_agent(agent_name, memory)
+        return memory
+    
+    def _remember_agent(self, agent_name: str, memory: Dict[str, Any]) -> None:
+        memories = self.cache["agent_memories"]
+        memories[agent_name] = memory
+        memories.move_to_end(agent_name)
+        while self.agent_cache_size and len(memories) > self.agent_cache_size:
+            memories.popitem(last=False)
     
     def save_debate(self, debate_data: Dict[str, Any]) -> str:
         """
@@ -98,16 +242,15 @@ class MemoryManager:
                         - responses: List of agent responses
                         - critiques: List of critiques between agents
                         - summary: Final debate summary
+                        or, from the dynamic orchestrator, opening_statements, rebuttals,
+                        agent_summaries, judging results, transcript and final_summary
                         
         Returns:
             debate_id: Unique identifier for the saved debate
         """
-        # Generate a unique debate ID based on timestamp
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        debate_id = f"debate_{timestamp}"
         
         # Add metadata
-        debate_data["debate_id"] = debate_id
         debate_data["timestamp"] = timestamp
         
         # Extract topics and create a more user-friendly date
@@ -125,40 +268,85 @@ class MemoryManager:
             main_topic = main_topic[:47] + "..."
         debate_data["topic"] = main_topic
         
-        # Save the complete debate record
-        debate_path = self.memory_dir / "debates" / f"{debate_id}.json"
-        with open(debate_path, 'w') as f:
-            json.dump(debate_data, f, indent=2)
-        
-        # Update debate index
-        index_entry = {
-            "debate_id": debate_id,
-            "id": debate_id,  # For compatibility with explorer
-            "timestamp": timestamp,
-            "date": debate_data["date"],
-            "prompt": debate_data["prompt"],
-            "topic": debate_data["topic"],
-            "topics": debate_data["topics"],
-            "agent_count": len(debate_data.get("responses", [])),
-            "agents": [resp.get("agent", "Unknown") for resp in debate_data.get("responses", [])],
-            "file_path": str(debate_path)
-        }
-        
-        self.cache["debate_history"].append(index_entry)
-        self._save_debate_index()
-        
-        # Update topic index
-        for topic in debate_data["topics"]:
-            if topic not in self.cache["topic_index"]:
-                self.cache["topic_index"][topic] = []
-            self.cache["topic_index"][topic].append(debate_id)
-        self._save_topic_index()
-        
-        # Update individual agent memories
-        self._update_agent_memories(debate_data)
+        # Saves from other processes are serialized by the store lock; threads of this process
+        # update the cached indexes one at a time, then share the flush of their queued saves
+        with self._store_lock:
+            with self._write_lock:
+                self._sync_with_store()
+                # Unique debate ID based on timestamp, with a suffix for debates saved in the same second
+                debate_id = self._new_debate_id(timestamp)
+                debate_data["debate_id"] = debate_id
+                
+                # The debate, index and agent files of one save are committed together (and grouped with
+                # concurrent saves) by backends that journal their writes
+                with self.store.transaction(wait=False):
+                    # Save the complete debate record
+                    debate_path = self.store.put_debate(debate_id, debate_data)
+                    
+                    # Update debate index
+                    participants = [statement.get("agent", "Unknown") for statement in
+                                    debate_data.get("responses", []) + debate_data.get("opening_statements", [])]
+                    index_entry = {
+                        "debate_id": debate_id,
+                        "id": debate_id,  # For compatibility with explorer
+                        "timestamp": timestamp,
+                        "date": debate_data["date"],
+                        "prompt": debate_data["prompt"],
+                        "topic": debate_data["topic"],
+                        "topics": debate_data["topics"],
+                        "agent_count": len(participants),
+                        "agents": participants,
+                        "file_path": debate_path
+                    }
+                    
+                    # Indexes are handed to the store as deltas; only the json backend rewrites them in full,
+                    # so they are loaded here just for that backend or when already in use
+                    if self.store.needs_full_documents:
+                        self._debate_history()
+                        self._topic_index()
+                    debate_history = self.cache["debate_history"]
+                    if debate_history is not None:
+                        debate_history.append(index_entry)
+                    self.store.append_index_entry(index_entry, debate_history)
+                    
+                    # Update topic index
+                    topic_index = self.cache["topic_index"]
+                    if topic_index is not None:
+                        for topic in debate_data["topics"]:
+                            if topic not in topic_index:
+                                topic_index[topic] = []
+                            topic_index[topic].append(debate_id)
+                    self.store.add_topic_refs(debate_id, debate_data["topics"], topic_index)
+                    
+                    # Update individual agent memories
+                    self._update_agent_memories(debate_data)
+                self._store_lock.mark_changed()
+            self.store.flush()
+            
+            # Index prompt and responses for relevance search (appended to its log if not loaded yet),
+            # once the debate is committed; both indexes catch up on debates missing from them
+            self.search_index.add(debate_id, debate_data)
+            if self.embedder is not None:
+                self._embed_debate(debate_id, debate_data)
+            
+            # One line per committed debate, in commit order across processes
+            if self.debate_log is not None:
+                self.debate_log.append(log_entry(debate_data))
         
         return debate_id
     
+    def _new_debate_id(self, timestamp: str) -> str:
+        """
+        A debate ID not used yet: debate_{timestamp}, or debate_{timestamp}_2, _3... for further
+        debates saved within the same second (by this or another process holding the store lock).
+        """
+        debate_id = f"debate_{timestamp}"
+        suffix = 2
+        while self.store.has_debate(debate_id):
+            debate_id = f"debate_{timestamp}_{suffix}"
+            suffix += 1
+        return debate_id
+    
     def _extract_topics(self, prompt: str) -> List[str]:
         """
         Extract key topics from a debate prompt for indexing.
@@ -185,12 +373,13 @@ class MemoryManager:
         Args:
             debate_data: Complete debate data including agent responses and critiques
         """
-        if "responses" not in debate_data:
-            return
+        # Agent responses, or the opening statements of a dynamic orchestrator debate
+        statements = [(response, "response") for response in debate_data.get("responses", [])]
+        statements += [(statement, "text") for statement in debate_data.get("opening_statements", [])]
             
-        for agent_response in debate_data["responses"]:
+        for agent_response, text_field in statements:
             agent_name = agent_response.get("agent", "Unknown")
-            response_text = agent_response.get("response", "")
+            response_text = agent_response.get(text_field, "")
             
             # If agent name is missing, try to extract it from the response
             if agent_name == "Unknown" and response_text:
@@ -213,14 +402,16 @@ class MemoryManager:
                             agent_response["agent"] = agent_name
                             break
             
-            # Initialize agent memory if not exists
-            if agent_name not in self.cache["agent_memories"]:
-                self.cache["agent_memories"][agent_name] = {
-                    "name": agent_name,
-                    "debates": [],
-                    "positions": {},  # Store positions indexed by topic
-                    "topics_addressed": []
-                }
+            # Collect this debate's changes as deltas, applied to the cache and appended to the store
+            ops = []
+            is_new = agent_name not in self._known_agents()
+            if is_new:
+                ops += [
+                    ["set", ["name"], agent_name],
+                    ["set", ["debates"], []],
+                    ["set", ["positions"], {}],  # Store positions indexed by topic
+                    ["set", ["topics_addressed"], []],
+                ]
             
             # Update agent's debate participation
             debate_entry = {
@@ -231,52 +422,86 @@ class MemoryManager:
                 "timestamp": debate_data["timestamp"],
                 "date": debate_data.get("date", "Unknown")
             }
-            
-            self.cache["agent_memories"][agent_name]["debates"].append(debate_entry)
+            ops.append(["append", ["debates"], debate_entry])
             
             # Update topics this agent has addressed
             main_topic = debate_data.get("topic", "Unknown")
             if main_topic != "Unknown":
-                if main_topic not in self.cache["agent_memories"][agent_name]["topics_addressed"]:
-                    self.cache["agent_memories"][agent_name]["topics_addressed"].append(main_topic)
+                ops.append(["add", ["topics_addressed"], main_topic])
             
             # Store position on this topic
             if main_topic != "Unknown":
-                if main_topic not in self.cache["agent_memories"][agent_name]["positions"]:
-                    self.cache["agent_memories"][agent_name]["positions"][main_topic] = []
-                
                 position_entry = {
                     "debate_id": debate_data["debate_id"],
                     "date": debate_data.get("date", "Unknown"),
                     "timestamp": debate_data["timestamp"],
                     "position": response_text[:500] + ("..." if len(response_text) > 500 else "")  # Truncate for storage
                 }
-                
-                self.cache["agent_memories"][agent_name]["positions"][main_topic].append(position_entry)
+                ops.append(["append", ["positions", main_topic], position_entry])
             
             # Also update positions for keyword topics
             for topic in debate_data.get("topics", []):
-                if topic not in self.cache["agent_memories"][agent_name]["topics_addressed"]:
-                    self.cache["agent_memories"][agent_name]["topics_addressed"].append(topic)
+                ops.append(["add", ["topics_addressed"], topic])
             
-            # Save updated agent memory
-            self._save_agent_memory(agent_name)
+            # Save updated agent memory; an uncached agent is only loaded if the store needs the whole
+            # document or the retention policy needs its entry counts (bounded by that same policy)
+            if is_new:
+                self._known_agents().add(agent_name)
+                memory = {}
+                self._remember_agent(agent_name, memory)
+            elif (agent_name in self.cache["agent_memories"] or self.store.needs_full_documents
+                  or self.retain_entries):
+                memory = self._cached_agent(agent_name)
+            else:
+                memory = None
+            if memory is not None:
+                apply_ops(memory, ops)
+                # Fold entries beyond the retention limit into per-topic digests
+                trim_ops = retention_ops(memory, self.retain_entries)
+                apply_ops(memory, trim_ops)
+                ops += trim_ops
+            self.store.update_agent(agent_name, ops, memory)
     
-    def _save_debate_index(self) -> None:
+    def compact_agent_memories(self, retain: Optional[int] = None, agent_names: Optional[List[str]] = None,
+                               summarize=None) -> Dict[str, int]:
         """
-        Save the debate history index to disk.
-        """
-        index_path = self.memory_dir / "indexes" / "debate_index.json"
-        with open(index_path, 'w') as f:
-            json.dump(self.cache["debate_history"], f, indent=2)
-    
-    def _save_topic_index(self) -> None:
-        """
-        Save the topic index to disk.
+        Apply the retention policy to stored agent memories in one batch (e.g. after lowering
+        MEMORY_RETAIN_ENTRIES, or for memories written before it existed).
+        
+        Args:
+            retain: Debate entries to keep per agent. If None, the manager's retain_entries
+            agent_names: Agents to compact. If None, every agent
+            summarize: Optional callable(agent_name, topic, digest) -> str writing a digest summary;
+                       called for digests with entries not yet covered by their summary
+            
+        Returns:
+            Dictionary of agent names and the number of debate entries folded into digests
         """
-        index_path = self.memory_dir / "indexes" / "topic_index.json"
-        with open(index_path, 'w') as f:
-            json.dump(self.cache["topic_index"], f, indent=2)
+        retain = self.retain_entries if retain is None else retain
+        folded = {}
+        with self._store_lock, self._write_lock:
+            for agent_name in agent_names or self.list_agents():
+                memory = self._cached_agent(agent_name)
+                if memory is None:
+                    continue
+                before = len(memory.get("debates", []))
+                ops = retention_ops(memory, retain)
+                apply_ops(memory, ops)
+                if summarize is not None:
+                    for topic, digest in memory.get("digests", {}).items():
+                        if digest.get("summary_entries") == digest.get("entries"):
+                            continue
+                        summary = summarize(agent_name, topic, digest)
+                        if summary:
+                            digest_ops = [["set", ["digests", topic, "summary"], summary],
+                                          ["set", ["digests", topic, "summary_entries"], digest.get("entries")]]
+                            apply_ops(memory, digest_ops)
+                            ops += digest_ops
+                if ops:
+                    self.store.update_agent(agent_name, ops, memory)
+                    self._store_lock.mark_changed()
+                folded[agent_name] = before - len(memory.get("debates", []))
+        return folded
     
     def _save_agent_memory(self, agent_name: str) -> None:
         """
@@ -288,9 +513,9 @@ class MemoryManager:
         if agent_name not in self.cache["agent_memories"]:
             return
             
-        agent_path = self.memory_dir / "agents" / f"{agent_name}.json"
-        with open(agent_path, 'w') as f:
-            json.dump(self.cache["agent_memories"][agent_name], f, indent=2)
+        with self._store_lock, self._write_lock:
+            self.store.put_agent(agent_name, self.cache["agent_memories"][agent_name])
+            self._store_lock.mark_changed()
     
     def get_agent_memory(self, agent_name: str) -> Dict[str, Any]:
         """
@@ -302,7 +527,8 @@ class MemoryManager:
         Returns:
             Dictionary containing agent's memory
         """
-        return self.cache["agent_memories"].get(agent_name, {"name": agent_name, "debates": []})
+        memory = self._cached_agent(agent_name)
+        return memory if memory is not None else {"name": agent_name, "debates": []}
     
     def get_relevant_debates(self, prompt: str, limit: int = 5) -> List[Dict[str, Any]]:
         """
@@ -315,35 +541,84 @@ class MemoryManager:
         Returns:
             List of relevant debate data
         """
-        topics = self._extract_topics(prompt)
         relevant_debates = []
-        debate_scores = {}
-        
-        # Find debates with overlapping topics
-        for topic in topics:
-            if topic in self.cache["topic_index"]:
-                for debate_id in self.cache["topic_index"][topic]:
-                    if debate_id not in debate_scores:
-                        debate_scores[debate_id] = 0
-                    debate_scores[debate_id] += 1
-        
-        # Sort debates by relevance score
-        sorted_debates = sorted(debate_scores.items(), key=lambda x: x[1], reverse=True)
-        
-        # Load full debate data for top matches
-        for debate_id, score in sorted_debates[:limit]:
-            for debate_entry in self.cache["debate_history"]:
-                if debate_entry["debate_id"] == debate_id:
-                    # Load full debate data
-                    debate_path = Path(debate_entry["file_path"])
-                    try:
-                        with open(debate_path, 'r') as f:
-                            relevant_debates.append(json.load(f))
-                    except Exception as e:
-                        print(f"Error loading debate {debate_id}: {e}")
+        if limit <= 0:
+            return relevant_debates
+        
+        # Rank debates by BM25 over their prompts and responses, fused with nearest neighbours by
+        # embedding when enabled; the store loads each hit by ID directly
+        ranked = [debate_id for debate_id, _ in self._search_index().search(prompt, limit * 4)]
+        if self.embedder is not None:
+            debate_vectors, _ = self._vector_indexes()
+            query = self.embedder.embed([prompt])[0]
+            similar = [entry["key"] for entry, similarity in debate_vectors.search(query, limit * 4)
+                       if similarity >= self.MIN_DEBATE_SIMILARITY]
+            ranked = reciprocal_rank_fusion([ranked, similar])
+        
+        for debate_id in ranked[:limit]:
+            try:
+                debate_data = self.store.load_debate(debate_id)
+                if debate_data is None:
+                    raise FileNotFoundError(debate_id)
+                relevant_debates.append(debate_data)
+            except Exception as e:
+                print(f"Error loading debate {debate_id}: {e}")
         
         return relevant_debates
     
+    def find_similar_positions(self, agent_name: str, text: str = "", debate_id: Optional[str] = None,
+                               limit: int = 10, min_similarity: float = 0.25) -> Optional[List[Dict[str, Any]]]:
+        """
+        Find an agent's earlier statements closest in meaning to one of its statements.
+        
+        Args:
+            agent_name: Name of the agent
+            text: The statement; only embedded if the debate was not saved through this manager
+            debate_id: Debate the statement belongs to (its stored vector is reused, and it is excluded)
+            limit: Maximum number of statements to return
+            min_similarity: Cosine similarity below which statements are not considered related
+            
+        Returns:
+            List of {"debate_id", "topic", "similarity"}, most similar first, or None when
+            embeddings are disabled
+        """
+        if self.embedder is None:
+            return None
+        _, position_vectors = self._vector_indexes()
+        key = f"{agent_name}/{debate_id}"
+        vector = position_vectors.get(key) if debate_id else None
+        if vector is None:
+            if not text:
+                return []
+            vector = self.embedder.embed([text])[0]
+        return [
+            {"debate_id": entry["meta"]["debate_id"], "topic": entry["meta"]["topic"], "similarity": similarity}
+            for entry, similarity in position_vectors.search(vector, limit, group=agent_name, exclude={key})
+            if similarity >= min_similarity
+        ]
+    
+    def position_similarities(self, agent_name: str, text: str = "", debate_id: Optional[str] = None):
+        """
+        Cosine similarities between one of an agent's statements and each of its other stored
+        statements, computed at once against the agent's cached position matrix.
+        
+        Args:
+            agent_name: Name of the agent
+            text: The statement; only embedded if the debate was not saved through this manager
+            debate_id: Debate the statement belongs to (its stored vector is reused, and it is excluded)
+            
+        Returns:
+            float32 array with one similarity per earlier statement, or None when embeddings are disabled
+        """
+        if self.embedder is None:
+            return None
+        _, position_vectors = self._vector_indexes()
+        key = f"{agent_name}/{debate_id}"
+        vector = position_vectors.get(key) if debate_id else None
+        if vector is None:
+            vector = self.embedder.embed([text])[0]
+        return position_vectors.group_similarities(vector, agent_name, exclude=key)
+    
     def get_agent_position(self, agent_name: str, topic: str) -> Optional[str]:
         """
         Get an agent's position on a specific topic based on past debates.
@@ -360,12 +635,10 @@ class MemoryManager:
         # Find debates where this agent addressed this topic
         relevant_debates = []
         for debate in agent_memory.get("debates", []):
-            debate_data_path = self.memory_dir / "debates" / f"{debate['debate_id']}.json"
             try:
-                with open(debate_data_path, 'r') as f:
-                    debate_data = json.load(f)
-                    if topic in debate_data.get("topics", []):
-                        relevant_debates.append(debate)
+                debate_data = self.store.load_debate(debate["debate_id"])
+                if debate_data and topic in debate_data.get("topics", []):
+                    relevant_debates.append(debate)
             except Exception:
                 pass
         
@@ -389,9 +662,140 @@ class MemoryManager:
         """
         # Sort by timestamp (newest first)
         sorted_history = sorted(
-            self.cache["debate_history"], 
+            self._debate_history(), 
             key=lambda x: x["timestamp"], 
             reverse=True
         )
         
         return sorted_history[:limit]
+    
+    def get_debate(self, debate_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a complete debate record.
+        
+        Args:
+            debate_id: ID of the debate
+            
+        Returns:
+            The debate data, or None if no such debate is stored
+        """
+        return self.store.load_debate(debate_id)
+    
+    def list_debate_ids(self) -> List[str]:
+        """
+        Get the IDs of all stored debates, including those not in the debate index.
+        
+        Returns:
+            List of debate IDs
+        """
+        return self.store.debate_ids()
+    
+    def list_debates(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        List stored debates, newest first.
+        
+        Args:
+            limit: Maximum number of debates to return
+            
+        Returns:
+            List of debate summaries ({"id", "topic", "date", "agents"})
+        """
+        debates = self.store.list_debates(limit)
+        if debates is None:
+            debates = sort_debate_summaries([
+                debate_summary(debate_id, debate_data)
+                for debate_id, debate_data in self._iter_debates()
+            ])[:limit]
+        return debates
+    
+    def search_debates(self, topic: str) -> List[Dict[str, Any]]:
+        """
+        Search debates by keyword in their topic, prompt and topic keywords.
+        
+        Args:
+            topic: Topic to search for
+            
+        Returns:
+            List of debate summaries with a "relevance" score, most relevant first
+        """
+        debates = self.store.search_debates(topic)
+        if debates is None:
+            debates = []
+            for debate_id, debate_data in self._iter_debates():
+                relevance = topic_relevance(topic, debate_data.get("topic", ""), debate_data.get("prompt", ""),
+                                            debate_data.get("topics", []))
+                if relevance > 0:
+                    summary = debate_summary(debate_id, debate_data)
+                    summary.pop("_timestamp", None)
+                    summary["relevance"] = relevance
+                    debates.append(summary)
+            debates.sort(key=lambda x: x.get("relevance", 0), reverse=True)
+        return debates
+    
+    def get_agent_positions(self, agent_name: str, topic: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get an agent's recorded positions, by topic.
+        
+        Args:
+            agent_name: Name of the agent
+            topic: Optional specific topic
+            
+        Returns:
+            Dictionary of topics and the agent's positions on them
+        """
+        positions = self.store.agent_positions(agent_name, topic)
+        if positions is None:
+            all_positions = self.get_agent_memory(agent_name).get("positions", {})
+            if topic:
+                positions = {topic: all_positions[topic]} if topic in all_positions else {}
+            else:
+                positions = dict(all_positions)
+        return positions
+    
+    def search_responses(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Full-text search over agent statements.
+        
+        Args:
+            query: Words that must all occur in a statement
+            limit: Maximum number of matches to return
+            
+        Returns:
+            List of matches ({"debate_id", "agent", "phase", "text"})
+        """
+        matches = self.store.search_responses(query, limit)
+        if matches is None:
+            words = query.lower().split()
+            matches = []
+            for debate_id, debate_data in self._iter_debates():
+                statements = [("response", r.get("agent"), r.get("response", "")) for r in debate_data.get("responses", [])]
+                statements += [("opening", s.get("agent"), s.get("text", "")) for s in debate_data.get("opening_statements", [])]
+                statements += [("summary", name, text) for name, text in (debate_data.get("agent_summaries") or {}).items()
+                               if isinstance(text, str)]
+                for phase, agent_name, text in statements:
+                    if words and all(word in text.lower() for word in words):
+                        matches.append({"debate_id": debate_id, "agent": agent_name, "phase": phase, "text": text})
+                if len(matches) >= limit:
+                    break
+            matches = matches[:limit]
+        return matches
+    
+    def list_agents(self) -> List[str]:
+        """
+        Get the names of all agents with memory records.
+        
+        Returns:
+            Sorted list of agent names
+        """
+        return sorted(self._known_agents())
+    
+    def _iter_debates(self):
+        """Yield (debate_id, debate_data) for every stored debate (scan used by backends without indexes)."""
+        for debate_id in self.store.debate_ids():
+            try:
+                debate_data = self.store.load_debate(debate_id)
+            except Exception as e:
+                print(f"Error loading debate {debate_id}: {e}")
+                continue
+            if debate_data is not None:
+                yield debate_id, debate_data
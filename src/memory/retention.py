@@ -0,0 +1,80 @@
+"""
+Retention policy for agent memories.
+
+An agent memory keeps its last `retain` debate entries (and its last `retain` positions per topic);
+older debate entries are folded into a digest for their topic under memory["digests"], so the
+document - and the prompt context built from it - stays bounded however many debates the agent has
+taken part in. The full debate records are untouched.
+
+A digest is {"entries", "first_timestamp", "last_timestamp", "points"} where points are the opening
+sentences of the folded statements, newest first. An offline batch (src.utils.memory_digest) can add
+an LLM-written "summary", recording in "summary_entries" how many entries it covers.
+"""
+
+import re
+from typing import Any, Dict, Iterable, Optional
+
+from .storage import AgentOps
+
+# Opening sentences kept per digest, and the length each is cut to
+DIGEST_POINTS = 8
+POINT_CHARS = 200
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def first_sentence(text: str, max_chars: int = POINT_CHARS) -> str:
+    """The first sentence of a text, cut to max_chars."""
+    sentence = _SENTENCE_END.split(text.strip(), maxsplit=1)[0].strip() if text else ""
+    return sentence if len(sentence) <= max_chars else sentence[:max_chars - 3] + "..."
+
+
+def fold_into_digest(digest: Optional[Dict[str, Any]], entries: Iterable[Dict[str, Any]],
+                     max_points: int = DIGEST_POINTS) -> Dict[str, Any]:
+    """
+    Fold agent debate entries (oldest first) into a topic digest.
+    Returns:
+        A new digest; the one passed in is not modified
+    """
+    digest = dict(digest or {"entries": 0, "first_timestamp": None, "last_timestamp": None})
+    points = list(digest.get("points", []))
+    for entry in entries:
+        digest["entries"] = digest.get("entries", 0) + 1
+        timestamp = entry.get("timestamp")
+        if timestamp:
+            if not digest.get("first_timestamp") or timestamp < digest["first_timestamp"]:
+                digest["first_timestamp"] = timestamp
+            if not digest.get("last_timestamp") or timestamp > digest["last_timestamp"]:
+                digest["last_timestamp"] = timestamp
+        point = first_sentence(entry.get("response", ""))
+        if point and point not in points:
+            points.insert(0, point)
+    digest["points"] = points[:max_points]
+    return digest
+
+
+def retention_ops(memory: Dict[str, Any], retain: int) -> AgentOps:
+    """
+    Deltas that apply the retention policy to an agent memory document.
+    Args:
+        memory: The agent's full memory document
+        retain: Debate entries (and positions per topic) to keep; 0 keeps everything
+    Returns:
+        Ops folding the overflow into digests and trimming the lists (empty when within bounds)
+    """
+    if retain <= 0:
+        return []
+    ops = []
+    debates = memory.get("debates", [])
+    if len(debates) > retain:
+        digests = memory.get("digests", {})
+        folded: Dict[str, Dict[str, Any]] = {}
+        for entry in debates[:-retain]:
+            topic = entry.get("topic", "Unknown")
+            folded[topic] = fold_into_digest(folded.get(topic, digests.get(topic)), [entry])
+        ops += [["set", ["digests", topic], digest] for topic, digest in folded.items()]
+        ops.append(["trim", ["debates"], retain])
+    for topic, positions in memory.get("positions", {}).items():
+        if len(positions) > retain:
+            ops.append(["trim", ["positions", topic], retain])
+    return ops
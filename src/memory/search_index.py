@@ -0,0 +1,300 @@
+"""
+Full-text relevance index over debates for MemoryManager.get_relevant_debates.
+
+Debate prompts and agent statements are tokenized (lowercased words, stopwords removed, suffixes
+stemmed) into an inverted index: term -> (document numbers, term frequencies), kept in compact
+arrays. Queries are ranked with Okapi BM25. The index lives next to the other indexes as a snapshot
+(search_index.json) plus an append-only log of documents added since (search_index.log), so saving a
+debate costs one appended line; the log is folded into a new snapshot once it grows long.
+"""
+
+import base64
+import heapq
+import json
+import math
+import os
+import re
+import threading
+from array import array
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being below between
+both but by can could did do does doing down during each few for from further had has have having he her
+here hers herself him himself his how i if in into is it its itself just me more most my myself no nor
+not now of off on once only or other our ours ourselves out over own same she should so some such than
+that the their theirs them themselves then there these they this those through to too under until up
+very was we were what when where which while who whom why will with would you your yours yourself
+yourselves ought shall must may might also yet us s t
+""".split())
+
+_WORD = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+# (suffix, replacement) pairs tried in order after plural and -ed/-ing removal; first match wins
+_DERIVATIONAL = (
+    ("ational", "ate"), ("tional", "tion"), ("ization", "ize"), ("ation", "ate"), ("fulness", "ful"),
+    ("ousness", "ous"), ("iveness", "ive"), ("alism", "al"), ("ality", "al"), ("ivity", "ive"),
+    ("ness", ""), ("ment", ""), ("ly", ""),
+)
+
+
+def _has_vowel(text: str) -> bool:
+    return any(ch in "aeiouy" for ch in text)
+
+
+def stem(word: str) -> str:
+    """Light suffix-stripping stemmer in the spirit of Porter's steps 1-2 (no dependencies)."""
+    if len(word) <= 3 or not word.isalpha():
+        return word
+    if word.endswith("sses"):
+        word = word[:-2]
+    elif word.endswith("ies"):
+        word = word[:-3] + "y"
+    elif word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        word = word[:-1]
+    for suffix in ("ingly", "edly", "ing", "ed"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3 and _has_vowel(word[:-len(suffix)]):
+            word = word[:-len(suffix)]
+            if word.endswith(("at", "bl", "iz")):
+                word += "e"
+            elif word[-1] == word[-2] and word[-1] not in "lsz":
+                word = word[:-1]
+            break
+    for suffix, replacement in _DERIVATIONAL:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)] + replacement
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """Index terms of a text: lowercase words without stopwords, stemmed."""
+    terms = []
+    for word in _WORD.findall(text.lower()):
+        word = word.split("'")[0]
+        if len(word) > 1 and word not in STOPWORDS:
+            terms.append(stem(word))
+    return terms
+
+
+def debate_statements(debate_data: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """(agent, text) for each agent statement of a debate, in either saved format."""
+    statements = [(response.get("agent", "Unknown"), response.get("response", ""))
+                  for response in debate_data.get("responses", [])]
+    statements += [(statement.get("agent", "Unknown"), statement.get("text", ""))
+                   for statement in debate_data.get("opening_statements", [])]
+    return [(agent, text) for agent, text in statements if isinstance(text, str) and text]
+
+
+def debate_text(debate_data: Dict[str, Any]) -> Tuple[str, List[str]]:
+    """The prompt and the agent statements of a debate, in either saved format."""
+    return debate_data.get("prompt", ""), [text for _, text in debate_statements(debate_data)]
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60) -> List[str]:
+    """Merge ranked ID lists: each ID scores 1 / (k + rank) per list it appears in, best first."""
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking):
+            scores[item] = scores.get(item, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(scores, key=scores.get, reverse=True)
+
+
+def _encode(values: array) -> str:
+    return base64.b64encode(values.tobytes()).decode("ascii")
+
+
+def _decode(typecode: str, text: str) -> array:
+    values = array(typecode)
+    values.frombytes(base64.b64decode(text))
+    return values
+
+
+class DebateSearchIndex:
+    """Incrementally updated BM25 inverted index over debate prompts and statements."""
+
+    PROMPT_WEIGHT = 3  # Prompt terms count this many times: a prompt is short and states the topic
+
+    def __init__(self, index_dir: Path, k1: float = 1.2, b: float = 0.75, snapshot_every: int = 1000):
+        """
+        Args:
+            index_dir: Directory for search_index.json and search_index.log
+            k1: BM25 term frequency saturation
+            b: BM25 document length normalization
+            snapshot_every: Fold the log into a new snapshot once it holds this many documents
+        """
+        self.snapshot_path = Path(index_dir) / "search_index.json"
+        self.log_path = Path(index_dir) / "search_index.log"
+        self.k1 = k1
+        self.b = b
+        self.snapshot_every = snapshot_every
+        self._lock = threading.RLock()
+        self.unload()
+
+    def unload(self) -> None:
+        """Drop the in-memory index, so the next load() reads the files again (e.g. after another
+        process added to them)."""
+        with self._lock:
+            self._loaded = False
+            self._doc_ids: List[str] = []            # Document number -> debate ID
+            self._doc_numbers: Dict[str, int] = {}   # Debate ID -> live document number
+            self._lengths = array("I")               # Document number -> term count (0 once replaced)
+            self._postings: Dict[str, Tuple[array, array]] = {}  # Term -> (document numbers, frequencies)
+            self._total_length = 0
+            self._log_entries = 0
+
+    # --- Loading and persistence ---
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def load(self, debate_ids: Iterable[str] = (),
+             load_debate: Optional[Callable[[str], Optional[Dict[str, Any]]]] = None) -> None:
+        """
+        Read the snapshot and replay the log (once), then index any of `debate_ids` not yet indexed
+        (debates saved before the index existed or by another writer), fetching them with `load_debate`.
+        """
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            if self.snapshot_path.exists():
+                with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                    snapshot = json.load(f)
+                self._doc_ids = snapshot["doc_ids"]
+                self._lengths = _decode("I", snapshot["lengths"])
+                self._doc_numbers = {doc_id: n for n, doc_id in enumerate(self._doc_ids)}  # Latest version wins
+                self._total_length = sum(self._lengths)
+                self._postings = {
+                    term: (_decode("I", docs), _decode("H", freqs)) for term, (docs, freqs) in snapshot["postings"].items()
+                }
+            if self.log_path.exists():
+                with open(self.log_path, "rb+") as f:
+                    valid_bytes = 0
+                    for line in f:
+                        try:
+                            if not line.endswith(b"\n"):
+                                raise ValueError("unterminated line")
+                            entry = json.loads(line)
+                        except ValueError:
+                            # Torn final line from an interrupted write; cut it so later appends stay readable
+                            f.truncate(valid_bytes)
+                            break
+                        valid_bytes += len(line)
+                        self._add_frequencies(entry["id"], entry["tf"])
+                        self._log_entries += 1
+            if load_debate is not None:
+                added = 0
+                for debate_id in debate_ids:
+                    if debate_id in self._doc_numbers:
+                        continue
+                    try:
+                        debate_data = load_debate(debate_id)
+                    except Exception as e:
+                        print(f"Error indexing debate {debate_id}: {e}")
+                        continue
+                    if debate_data is not None:
+                        self._index(debate_id, debate_data)
+                        added += 1
+                if added:
+                    self.save_snapshot()
+
+    def save_snapshot(self) -> None:
+        """Write the whole index as a snapshot and start an empty log."""
+        with self._lock:
+            snapshot = {
+                "version": 1,
+                "doc_ids": self._doc_ids,
+                "lengths": _encode(self._lengths),
+                "postings": {term: [_encode(docs), _encode(freqs)] for term, (docs, freqs) in self._postings.items()},
+            }
+            os.makedirs(self.snapshot_path.parent, exist_ok=True)
+            tmp_path = self.snapshot_path.with_suffix(".json.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, self.snapshot_path)
+            if self.log_path.exists():
+                os.remove(self.log_path)
+            self._log_entries = 0
+
+    # --- Updates ---
+
+    def _frequencies(self, debate_data: Dict[str, Any]) -> Dict[str, int]:
+        prompt, statements = debate_text(debate_data)
+        frequencies: Dict[str, int] = {}
+        for term in tokenize(prompt):
+            frequencies[term] = frequencies.get(term, 0) + self.PROMPT_WEIGHT
+        for text in statements:
+            for term in tokenize(text):
+                frequencies[term] = frequencies.get(term, 0) + 1
+        return frequencies
+
+    def _add_frequencies(self, debate_id: str, frequencies: Dict[str, int]) -> None:
+        old = self._doc_numbers.get(debate_id)
+        if old is not None:
+            # Re-indexed debate: the old document stays in the postings but no longer scores
+            self._total_length -= self._lengths[old]
+            self._lengths[old] = 0
+        number = len(self._doc_ids)
+        self._doc_ids.append(debate_id)
+        self._doc_numbers[debate_id] = number
+        length = sum(frequencies.values())
+        self._lengths.append(length)
+        self._total_length += length
+        for term, frequency in frequencies.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = (array("I"), array("H"))
+            postings[0].append(number)
+            postings[1].append(min(frequency, 65535))
+
+    def _index(self, debate_id: str, debate_data: Dict[str, Any]) -> None:
+        frequencies = self._frequencies(debate_data)
+        os.makedirs(self.log_path.parent, exist_ok=True)
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"id": debate_id, "tf": frequencies}, ensure_ascii=False) + "\n")
+        if self._loaded:  # Otherwise replayed from the log on first load
+            self._add_frequencies(debate_id, frequencies)
+            self._log_entries += 1
+
+    def add(self, debate_id: str, debate_data: Dict[str, Any]) -> None:
+        """Index a debate (replacing an earlier version) and append it to the log."""
+        with self._lock:
+            self._index(debate_id, debate_data)
+            if self._log_entries >= self.snapshot_every:
+                self.save_snapshot()
+
+    # --- Queries ---
+
+    def __len__(self) -> int:
+        return len(self._doc_numbers)
+
+    def search(self, query: str, limit: int = 5) -> List[Tuple[str, float]]:
+        """
+        Rank debates against a query with BM25.
+        Returns:
+            Up to `limit` (debate_id, score) pairs, best first
+        """
+        with self._lock:
+            documents = len(self._doc_numbers)
+            if not documents or limit <= 0:
+                return []
+            average_length = self._total_length / documents
+            lengths = self._lengths
+            k1, b = self.k1, self.b
+            scores: Dict[int, float] = {}
+            for term in set(tokenize(query)):
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+                doc_numbers, frequencies = postings
+                document_frequency = len(doc_numbers)
+                idf = math.log(1 + (documents - document_frequency + 0.5) / (document_frequency + 0.5))
+                for number, frequency in zip(doc_numbers, frequencies):
+                    length = lengths[number]
+                    if length:
+                        norm = k1 * (1 - b + b * length / average_length)
+                        scores[number] = scores.get(number, 0.0) + idf * frequency * (k1 + 1) / (frequency + norm)
+            best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            return [(self._doc_ids[number], score) for number, score in best]
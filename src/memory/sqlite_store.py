@@ -0,0 +1,362 @@
+"""
+SQLite storage backend for MemoryManager (MEMORY_BACKEND=sqlite).
+
+Debates are kept whole in `debates` and broken out into `responses` (opening statements, memory
+debate responses and summaries), `rebuttals` (critiques and rebuttals) and `judge_votes`; agent
+memories live in `agent_debates`, `agent_topics` and `positions`. Listing, topic search and position
+lookups are indexed queries, and an FTS5 index over response text backs full-text search. Debate
+topic search uses a trigram FTS5 index, so substring matches are found without a table scan.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .storage import AgentOps, MemoryStore, apply_ops, debate_summary, topic_relevance
+
+# Agent memory fields with their own tables; any other field is kept in agents.extra
+_AGENT_FIELDS = ("name", "debates", "positions", "topics_addressed")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS debates (
+    debate_id TEXT PRIMARY KEY,
+    topic TEXT NOT NULL,
+    date TEXT NOT NULL,
+    timestamp TEXT,
+    prompt TEXT NOT NULL,
+    keywords TEXT NOT NULL,
+    agents TEXT NOT NULL,
+    winner TEXT,
+    doc TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS debates_listing ON debates((date = 'Unknown'), date DESC, timestamp DESC);
+CREATE TABLE IF NOT EXISTS debate_index (seq INTEGER PRIMARY KEY AUTOINCREMENT, debate_id TEXT NOT NULL, entry TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS debate_topics (seq INTEGER PRIMARY KEY AUTOINCREMENT, topic TEXT NOT NULL, debate_id TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS debate_topics_topic ON debate_topics(topic);
+CREATE TABLE IF NOT EXISTS responses (
+    id INTEGER PRIMARY KEY, debate_id TEXT NOT NULL, agent TEXT, archetype TEXT, phase TEXT NOT NULL, text TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS responses_debate ON responses(debate_id);
+CREATE INDEX IF NOT EXISTS responses_agent ON responses(agent);
+CREATE TABLE IF NOT EXISTS rebuttals (
+    id INTEGER PRIMARY KEY, debate_id TEXT NOT NULL, critic TEXT, target TEXT, text TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS rebuttals_debate ON rebuttals(debate_id);
+CREATE TABLE IF NOT EXISTS judge_votes (
+    id INTEGER PRIMARY KEY, debate_id TEXT NOT NULL, judge TEXT, rank INTEGER, agent TEXT, points REAL, rationale TEXT);
+CREATE INDEX IF NOT EXISTS judge_votes_debate ON judge_votes(debate_id);
+CREATE INDEX IF NOT EXISTS judge_votes_agent ON judge_votes(agent);
+CREATE TABLE IF NOT EXISTS agents (seq INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT UNIQUE NOT NULL, extra TEXT NOT NULL DEFAULT '{}');
+CREATE TABLE IF NOT EXISTS agent_debates (id INTEGER PRIMARY KEY, agent TEXT NOT NULL, debate_id TEXT, entry TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS agent_debates_agent ON agent_debates(agent);
+CREATE TABLE IF NOT EXISTS agent_topics (id INTEGER PRIMARY KEY, agent TEXT NOT NULL, topic TEXT NOT NULL, UNIQUE(agent, topic));
+CREATE INDEX IF NOT EXISTS agent_topics_agent ON agent_topics(agent, id);
+CREATE TABLE IF NOT EXISTS positions (id INTEGER PRIMARY KEY, agent TEXT NOT NULL, topic TEXT NOT NULL, debate_id TEXT, entry TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS positions_agent_topic ON positions(agent, topic);
+"""
+
+
+def _debate_rows(debate_data: Dict[str, Any]):
+    """Responses, rebuttals and judge votes of a debate in either saved format."""
+    responses, rebuttals, votes = [], [], []
+    for response in debate_data.get("responses", []):
+        responses.append((response.get("agent"), response.get("archetype"), "response", response.get("response", "")))
+    for statement in debate_data.get("opening_statements", []):
+        responses.append((statement.get("agent"), statement.get("archetype"), "opening", statement.get("text", "")))
+    for agent_name, summary in (debate_data.get("agent_summaries") or {}).items():
+        responses.append((agent_name, None, "summary", summary if isinstance(summary, str) else json.dumps(summary)))
+    for critique in debate_data.get("critiques", []):
+        rebuttals.append((critique.get("critic"), critique.get("target"), critique.get("critique", "")))
+    for critic, items in (debate_data.get("rebuttals") or {}).items():
+        for item in items:
+            rebuttals.append((critic, item.get("target"), item.get("text", "")))
+    for vote in debate_data.get("judge_rationales") or []:
+        votes.append((vote.get("judge"), vote.get("rank"), vote.get("agent"), vote.get("points"), vote.get("rationale")))
+    return responses, rebuttals, votes
+
+
+class SqliteStore(MemoryStore):
+    """Normalized SQLite tables with indexed and full-text queries, in {memory_dir}/memory.sqlite3."""
+
+    DB_FILE = "memory.sqlite3"
+
+    def __init__(self, memory_dir: Path):
+        self.memory_dir = Path(memory_dir)
+        os.makedirs(self.memory_dir, exist_ok=True)
+        self.path = self.memory_dir / self.DB_FILE
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        # FTS5 is compiled into nearly every SQLite build; without it searches fall back to LIKE scans
+        try:
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS responses_fts USING fts5(text, content='responses', content_rowid='id')"
+            )
+            self.fts = True
+        except sqlite3.OperationalError:
+            self.fts = False
+        try:
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS debates_fts USING fts5(topic, prompt, keywords, content='', tokenize='trigram')"
+            )
+            self.trigram = True
+        except sqlite3.OperationalError:
+            self.trigram = False  # Trigram tokenizer needs SQLite 3.34+
+        self._conn.commit()
+
+    def _query(self, sql: str, params=()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    # --- Writes ---
+
+    def put_debate(self, debate_id: str, debate_data: Dict[str, Any]) -> str:
+        summary = debate_summary(debate_id, debate_data)
+        responses, rebuttals, votes = _debate_rows(debate_data)
+        keywords = " ".join(debate_data.get("topics", []))
+        with self._lock, self._conn:
+            for table in ("responses", "rebuttals", "judge_votes"):
+                if table == "responses" and self.fts:
+                    # External-content FTS rows must be deleted with the text they were indexed with
+                    self._conn.execute(
+                        "INSERT INTO responses_fts(responses_fts, rowid, text) "
+                        "SELECT 'delete', id, text FROM responses WHERE debate_id = ?", (debate_id,)
+                    )
+                self._conn.execute(f"DELETE FROM {table} WHERE debate_id = ?", (debate_id,))
+            if self.trigram:
+                # Contentless FTS rows, likewise, with the values they were indexed with
+                self._conn.execute(
+                    "INSERT INTO debates_fts(debates_fts, rowid, topic, prompt, keywords) "
+                    "SELECT 'delete', rowid, topic, prompt, keywords FROM debates WHERE debate_id = ?", (debate_id,)
+                )
+            self._conn.execute("DELETE FROM debates WHERE debate_id = ?", (debate_id,))
+            cur = self._conn.execute(
+                "INSERT INTO debates (debate_id, topic, date, timestamp, prompt, keywords, agents, winner, doc) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (debate_id, summary["topic"], summary["date"], debate_data.get("timestamp"),
+                 debate_data.get("prompt", ""), keywords, json.dumps(summary["agents"]),
+                 debate_data.get("winner"), json.dumps(debate_data)),
+            )
+            if self.trigram:
+                self._conn.execute(
+                    "INSERT INTO debates_fts (rowid, topic, prompt, keywords) VALUES (?, ?, ?, ?)",
+                    (cur.lastrowid, summary["topic"], debate_data.get("prompt", ""), keywords),
+                )
+            for agent_name, archetype, phase, text in responses:
+                cur = self._conn.execute(
+                    "INSERT INTO responses (debate_id, agent, archetype, phase, text) VALUES (?, ?, ?, ?, ?)",
+                    (debate_id, agent_name, archetype, phase, text),
+                )
+                if self.fts:
+                    self._conn.execute("INSERT INTO responses_fts (rowid, text) VALUES (?, ?)", (cur.lastrowid, text))
+            self._conn.executemany(
+                "INSERT INTO rebuttals (debate_id, critic, target, text) VALUES (?, ?, ?, ?)",
+                [(debate_id, *row) for row in rebuttals],
+            )
+            self._conn.executemany(
+                "INSERT INTO judge_votes (debate_id, judge, rank, agent, points, rationale) VALUES (?, ?, ?, ?, ?, ?)",
+                [(debate_id, *row) for row in votes],
+            )
+        return f"{self.path}#{debate_id}"
+
+    def append_index_entry(self, entry: Dict[str, Any], debate_index: List[Dict[str, Any]]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("INSERT INTO debate_index (debate_id, entry) VALUES (?, ?)",
+                               (entry["debate_id"], json.dumps(entry)))
+
+    def add_topic_refs(self, debate_id: str, topics: List[str], topic_index: Dict[str, List[str]]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT INTO debate_topics (topic, debate_id) VALUES (?, ?)",
+                                   [(topic, debate_id) for topic in topics])
+
+    def _agent_extra(self, agent_name: str) -> Dict[str, Any]:
+        row = self._conn.execute("SELECT extra FROM agents WHERE name = ?", (agent_name,)).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def _apply_agent_ops(self, agent_name: str, ops: AgentOps) -> None:
+        self._conn.execute("INSERT OR IGNORE INTO agents (name) VALUES (?)", (agent_name,))
+        extra_ops = []
+        for op in ops:
+            kind, path, value = op
+            field = path[0]
+            if field == "name":
+                continue
+            if kind == "set" and field in _AGENT_FIELDS and len(path) == 1:
+                # Replacing a whole field: clear its rows, then re-add the new contents
+                table = {"debates": "agent_debates", "positions": "positions", "topics_addressed": "agent_topics"}[field]
+                self._conn.execute(f"DELETE FROM {table} WHERE agent = ?", (agent_name,))
+                if field == "positions":
+                    self._apply_agent_ops(agent_name, [["append", ["positions", topic], entry]
+                                                       for topic, entries in value.items() for entry in entries])
+                else:
+                    kind = "append" if field == "debates" else "add"
+                    self._apply_agent_ops(agent_name, [[kind, [field], item] for item in value])
+            elif kind == "append" and path == ["debates"]:
+                self._conn.execute("INSERT INTO agent_debates (agent, debate_id, entry) VALUES (?, ?, ?)",
+                                   (agent_name, value.get("debate_id"), json.dumps(value)))
+            elif kind == "add" and path == ["topics_addressed"]:
+                self._conn.execute("INSERT OR IGNORE INTO agent_topics (agent, topic) VALUES (?, ?)", (agent_name, value))
+            elif kind == "append" and field == "positions" and len(path) == 2:
+                self._conn.execute("INSERT INTO positions (agent, topic, debate_id, entry) VALUES (?, ?, ?, ?)",
+                                   (agent_name, path[1], value.get("debate_id"), json.dumps(value)))
+            elif kind == "trim" and path == ["debates"]:
+                self._conn.execute(
+                    "DELETE FROM agent_debates WHERE agent = ? AND id NOT IN "
+                    "(SELECT id FROM agent_debates WHERE agent = ? ORDER BY id DESC LIMIT ?)",
+                    (agent_name, agent_name, max(value, 0)))
+            elif kind == "trim" and field == "positions" and len(path) == 2:
+                self._conn.execute(
+                    "DELETE FROM positions WHERE agent = ? AND topic = ? AND id NOT IN "
+                    "(SELECT id FROM positions WHERE agent = ? AND topic = ? ORDER BY id DESC LIMIT ?)",
+                    (agent_name, path[1], agent_name, path[1], max(value, 0)))
+            else:
+                extra_ops.append(op)
+        if extra_ops:
+            extra = apply_ops(self._agent_extra(agent_name), extra_ops)
+            self._conn.execute("UPDATE agents SET extra = ? WHERE name = ?", (json.dumps(extra), agent_name))
+
+    def update_agent(self, agent_name: str, ops: AgentOps, memory: Dict[str, Any]) -> None:
+        with self._lock, self._conn:
+            self._apply_agent_ops(agent_name, ops)
+
+    def put_agent(self, agent_name: str, memory: Dict[str, Any]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE agents SET extra = '{}' WHERE name = ?", (agent_name,))
+            ops = [["set", [field], memory.get(field, {} if field == "positions" else [])]
+                   for field in _AGENT_FIELDS if field != "name"]
+            ops += [["set", [key], value] for key, value in memory.items() if key not in _AGENT_FIELDS]
+            self._apply_agent_ops(agent_name, ops)
+
+    def compact(self) -> None:
+        with self._lock:
+            if self.fts:
+                self._conn.execute("INSERT INTO responses_fts(responses_fts) VALUES ('optimize')")
+                self._conn.commit()
+            self._conn.execute("VACUUM")
+
+    def stats(self) -> Dict[str, Any]:
+        counts = {
+            table: self._query(f"SELECT COUNT(*) FROM {table}")[0][0]
+            for table in ("debates", "responses", "rebuttals", "judge_votes", "agents", "positions")
+        }
+        counts["bytes"] = os.path.getsize(self.path)
+        return counts
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # --- Loads ---
+
+    def _load_agents(self, agent_name: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Reassemble agent memory documents, all of them or just agent_name's."""
+        where, params = ("WHERE agent = ?", (agent_name,)) if agent_name else ("", ())
+        agent_where = "WHERE name = ?" if agent_name else ""
+        agents = {}
+        for name, extra in self._query(f"SELECT name, extra FROM agents {agent_where} ORDER BY seq", params):
+            agents[name] = {"name": name, "debates": [], "positions": {}, "topics_addressed": []}
+            agents[name].update(json.loads(extra))
+        for name, entry in self._query(f"SELECT agent, entry FROM agent_debates {where} ORDER BY id", params):
+            agents[name]["debates"].append(json.loads(entry))
+        for name, topic, entry in self._query(f"SELECT agent, topic, entry FROM positions {where} ORDER BY id", params):
+            agents[name]["positions"].setdefault(topic, []).append(json.loads(entry))
+        for name, topic in self._query(f"SELECT agent, topic FROM agent_topics {where} ORDER BY id", params):
+            agents[name]["topics_addressed"].append(topic)
+        return agents
+
+    def load_agents(self) -> Dict[str, Dict[str, Any]]:
+        return self._load_agents()
+
+    def agent_names(self) -> List[str]:
+        return [name for (name,) in self._query("SELECT name FROM agents ORDER BY seq")]
+
+    def load_agent(self, agent_name: str) -> Optional[Dict[str, Any]]:
+        return self._load_agents(agent_name).get(agent_name)
+
+    def load_debate_index(self) -> List[Dict[str, Any]]:
+        return [json.loads(entry) for (entry,) in self._query("SELECT entry FROM debate_index ORDER BY seq")]
+
+    def load_topic_index(self) -> Dict[str, List[str]]:
+        topics: Dict[str, List[str]] = {}
+        for topic, debate_id in self._query("SELECT topic, debate_id FROM debate_topics ORDER BY seq"):
+            topics.setdefault(topic, []).append(debate_id)
+        return topics
+
+    def load_debate(self, debate_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._query("SELECT doc FROM debates WHERE debate_id = ?", (debate_id,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def debate_ids(self) -> List[str]:
+        return [debate_id for (debate_id,) in self._query("SELECT debate_id FROM debates ORDER BY rowid")]
+
+    def has_debate(self, debate_id: str) -> bool:
+        return bool(self._query("SELECT 1 FROM debates WHERE debate_id = ?", (debate_id,)))
+
+    # --- Indexed queries ---
+
+    @staticmethod
+    def _summary(debate_id: str, topic: str, date: str, timestamp: Optional[str], agents: str) -> Dict[str, Any]:
+        summary = {"id": debate_id, "topic": topic, "date": date, "agents": json.loads(agents)}
+        if timestamp is not None and date == "Unknown":
+            summary["_timestamp"] = timestamp
+        return summary
+
+    def list_debates(self, limit: int) -> List[Dict[str, Any]]:
+        rows = self._query(
+            "SELECT debate_id, topic, date, timestamp, agents FROM debates "
+            "ORDER BY (date = 'Unknown'), date DESC, timestamp DESC LIMIT ?", (limit,)
+        )
+        return [self._summary(*row) for row in rows]
+
+    def search_debates(self, topic: str) -> List[Dict[str, Any]]:
+        columns = "d.debate_id, d.topic, d.date, d.timestamp, d.agents, d.prompt, d.keywords"
+        if self.trigram and len(topic) >= 3:
+            phrase = '"' + topic.replace('"', '""') + '"'
+            rows = self._query(
+                f"SELECT {columns} FROM debates_fts f JOIN debates d ON d.rowid = f.rowid WHERE debates_fts MATCH ?",
+                (phrase,),
+            )
+        else:
+            like = "%" + topic.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            rows = self._query(
+                f"SELECT {columns} FROM debates d WHERE lower(d.topic) LIKE ?1 ESCAPE '\\' "
+                "OR lower(d.prompt) LIKE ?1 ESCAPE '\\' OR lower(d.keywords) LIKE ?1 ESCAPE '\\'",
+                (like,),
+            )
+        results = []
+        for debate_id, main_topic, date, timestamp, agents, prompt, keywords in rows:
+            # The index narrows the candidates; relevance is scored exactly as for the other backends
+            relevance = topic_relevance(topic, main_topic, prompt, keywords.split())
+            if relevance > 0:
+                summary = self._summary(debate_id, main_topic, date, None, agents)
+                summary["relevance"] = relevance
+                results.append(summary)
+        results.sort(key=lambda x: x["relevance"], reverse=True)
+        return results
+
+    def agent_positions(self, agent_name: str, topic: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+        if topic:
+            rows = self._query("SELECT topic, entry FROM positions WHERE agent = ? AND topic = ? ORDER BY id",
+                               (agent_name, topic))
+        else:
+            rows = self._query("SELECT topic, entry FROM positions WHERE agent = ? ORDER BY id", (agent_name,))
+        positions: Dict[str, List[Dict[str, Any]]] = {}
+        for position_topic, entry in rows:
+            positions.setdefault(position_topic, []).append(json.loads(entry))
+        return positions
+
+    def search_responses(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        if self.fts and query.split():
+            # Every word must occur (implicit AND), best BM25 rank first
+            rows = self._query(
+                "SELECT r.debate_id, r.agent, r.phase, r.text FROM responses_fts f JOIN responses r ON r.id = f.rowid "
+                "WHERE responses_fts MATCH ? ORDER BY f.rank LIMIT ?",
+                (" ".join('"' + word.replace('"', '""') + '"' for word in query.split()), limit),
+            )
+        else:
+            rows = self._query("SELECT debate_id, agent, phase, text FROM responses WHERE text LIKE ? LIMIT ?",
+                               (f"%{query}%", limit))
+        return [{"debate_id": debate_id, "agent": agent_name, "phase": phase, "text": text}
+                for debate_id, agent_name, phase, text in rows]
@@ -0,0 +1,712 @@
+"""
+Storage backends for MemoryManager.
+
+MemoryManager persists four kinds of records: full debate documents, the debate index (one summary
+entry per debate), the topic index (topic -> debate IDs) and one memory document per agent. Every
+write hands the backend the change itself and, for backends that store whole documents, the updated
+whole:
+
+- JsonDirectoryStore keeps the original memory/ layout (debates/*.json, agents/*.json and
+  indexes/*.json), rewriting an index or agent file in full on every change. The files written by
+  one save are replaced together through a write-ahead journal (journal.py), so a crash never
+  leaves a torn file or half a save.
+- SegmentLogStore appends each change as one record to a segment log and its location to an offset
+  index, so a save costs the same at 10 debates as at 100k. Agent memories and the topic index are
+  rebuilt by replaying their deltas; compaction periodically folds them back into single records
+  and drops superseded ones.
+- SqliteStore (sqlite_store.py) normalizes debates into tables with indexes and FTS5, and answers
+  the listing, search and position queries itself instead of MemoryManager scanning every debate.
+"""
+
+import copy
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .journal import WriteJournal
+
+# Agent memory deltas: [op, path, value] with op "append" (to a list), "add" (to a list, once), "set"
+# or "trim" (keep the last `value` items of a list)
+AgentOps = List[List[Any]]
+
+
+def apply_ops(doc: Dict[str, Any], ops: AgentOps) -> Dict[str, Any]:
+    """Apply agent memory deltas to a document in place and return it."""
+    for op, path, value in ops:
+        value = copy.deepcopy(value)  # The ops are persisted as well; the document must not share their values
+        target = doc
+        for key in path[:-1]:
+            target = target.setdefault(key, {})
+        last = path[-1]
+        if op == "set":
+            target[last] = value
+        elif op == "append":
+            target.setdefault(last, []).append(value)
+        elif op == "add":
+            values = target.setdefault(last, [])
+            if value not in values:
+                values.append(value)
+        elif op == "trim":
+            target[last] = target.get(last, [])[-value:] if value > 0 else []
+        else:
+            raise ValueError(f"Unknown memory op: {op}")
+    return doc
+
+
+def debate_summary(debate_id: str, debate_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Listing entry for a debate: {"id", "topic", "date", "agents"} (+ "_timestamp" when undated)."""
+    agents = []
+    for response in debate_data.get("responses", []) + debate_data.get("opening_statements", []):
+        agent_name = response.get("agent", "Unknown")
+        if agent_name != "Unknown":
+            agents.append(agent_name)
+    summary = {
+        "id": debate_id,
+        "topic": debate_data.get("topic", "Unknown"),
+        "date": debate_data.get("date", "Unknown"),
+        "agents": agents
+    }
+    # Add timestamp for sorting if date is missing
+    if "timestamp" in debate_data and summary["date"] == "Unknown":
+        summary["_timestamp"] = debate_data["timestamp"]
+    return summary
+
+
+def sort_debate_summaries(summaries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Dated debates first (by date, newest first), then undated ones by timestamp."""
+    debates_with_dates = [d for d in summaries if d.get("date") != "Unknown"]
+    debates_with_dates.sort(key=lambda x: x.get("date", ""), reverse=True)
+    debates_with_unknown = [d for d in summaries if d.get("date") == "Unknown"]
+    debates_with_unknown.sort(key=lambda x: x.get("_timestamp", ""), reverse=True)
+    return debates_with_dates + debates_with_unknown
+
+
+def topic_relevance(topic: str, main_topic: str, prompt: str, keywords: List[str]) -> int:
+    """Keyword relevance of a debate to a search topic: 2 for the main topic, 1 each for prompt and keywords."""
+    topic_lower = topic.lower()
+    relevance = 0
+    if topic_lower in (main_topic or "").lower():
+        relevance += 2  # Higher score for topic match
+    if topic_lower in (prompt or "").lower():
+        relevance += 1
+    if any(topic_lower in keyword.lower() for keyword in keywords):
+        relevance += 1
+    return relevance
+
+
+class MemoryStore:
+    """
+    Interface shared by the MemoryManager storage backends.
+
+    The query methods at the end return None when a backend has no index for them; MemoryManager
+    then answers by scanning the debates and agent memories.
+    """
+
+    # True when writes need the full index or agent document (not just the delta), so MemoryManager
+    # must have it loaded before recording a change
+    needs_full_documents = False
+
+    def agent_names(self) -> List[str]:
+        return list(self.load_agents())
+
+    def load_agent(self, agent_name: str) -> Optional[Dict[str, Any]]:
+        return self.load_agents().get(agent_name)
+
+    def load_agents(self) -> Dict[str, Dict[str, Any]]:
+        raise NotImplementedError
+
+    def load_debate_index(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def load_topic_index(self) -> Dict[str, List[str]]:
+        raise NotImplementedError
+
+    def load_debate(self, debate_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def debate_ids(self) -> List[str]:
+        raise NotImplementedError
+
+    def has_debate(self, debate_id: str) -> bool:
+        return self.load_debate(debate_id) is not None
+
+    def put_debate(self, debate_id: str, debate_data: Dict[str, Any]) -> str:
+        """Store a full debate document and return a human-readable location for it."""
+        raise NotImplementedError
+
+    def append_index_entry(self, entry: Dict[str, Any], debate_index: Optional[List[Dict[str, Any]]]) -> None:
+        """Record a new debate index entry; debate_index is the full index including it, if loaded."""
+        raise NotImplementedError
+
+    def add_topic_refs(self, debate_id: str, topics: List[str], topic_index: Optional[Dict[str, List[str]]]) -> None:
+        """Record that debate_id covers topics; topic_index is the full index including them, if loaded."""
+        raise NotImplementedError
+
+    def update_agent(self, agent_name: str, ops: AgentOps, memory: Optional[Dict[str, Any]]) -> None:
+        """Record agent memory deltas; memory is the agent's full document after applying them, if loaded
+        (always loaded for backends with needs_full_documents)."""
+        raise NotImplementedError
+
+    def put_agent(self, agent_name: str, memory: Dict[str, Any]) -> None:
+        """Replace an agent's memory document."""
+        raise NotImplementedError
+
+    @contextmanager
+    def transaction(self, wait: bool = True):
+        """Make this thread's writes inside the block one atomic save (backends that are not
+        already crash-consistent per write). A block that raises discards its buffered writes.
+        With wait=False the save is only queued at the end of the block and flush() waits for it,
+        so the caller can release its own locks first and let concurrent saves share one flush."""
+        yield
+
+    def flush(self) -> None:
+        """Wait until this thread's queued saves are on disk."""
+
+    def refresh(self) -> None:
+        """Pick up changes other processes made to the store since it was opened or last refreshed."""
+
+    def compact(self) -> None:
+        """Reclaim space held by superseded records (no-op for backends without any)."""
+
+    def close(self) -> None:
+        """Release file handles."""
+
+    def list_debates(self, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """Newest debate_summary() entries first (see sort_debate_summaries)."""
+        return None
+
+    def search_debates(self, topic: str) -> Optional[List[Dict[str, Any]]]:
+        """debate_summary() entries with a "relevance" > 0, most relevant first."""
+        return None
+
+    def agent_positions(self, agent_name: str, topic: Optional[str] = None) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """An agent's recorded positions by topic, optionally for one topic only."""
+        return None
+
+    def search_responses(self, query: str, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """Agent statements matching a full-text query: {"debate_id", "agent", "phase", "text"}."""
+        return None
+
+
+class JsonDirectoryStore(MemoryStore):
+    """The original memory/ layout: one JSON file per debate and agent plus whole-file indexes."""
+
+    needs_full_documents = True
+
+    JOURNAL_FILE = "journal.log"
+
+    def __init__(self, memory_dir: Path, fsync: bool = True):
+        self.memory_dir = Path(memory_dir)
+        self._dirs = [self.memory_dir / sub for sub in ("agents", "debates", "indexes")]
+        for directory in self._dirs:
+            os.makedirs(directory, exist_ok=True)
+        self.journal = WriteJournal(self.memory_dir, self.memory_dir / "indexes" / self.JOURNAL_FILE, fsync)
+        rolled_forward = self.journal.recover(self._dirs)
+        if rolled_forward:
+            print(f"Completed {rolled_forward} interrupted memory saves from the journal")
+        self._txn = threading.local()
+
+    @contextmanager
+    def transaction(self, wait: bool = True):
+        if getattr(self._txn, "writes", None) is not None:
+            yield  # Nested: part of the enclosing transaction
+            return
+        self._txn.writes = {}
+        try:
+            yield
+            writes = self._txn.writes
+        finally:
+            self._txn.writes = None
+        if writes:
+            self._txn.batch = self.journal.enqueue(writes)
+            if wait:
+                self.flush()
+
+    def flush(self) -> None:
+        batch = getattr(self._txn, "batch", None)
+        if batch is not None:
+            self._txn.batch = None
+            self.journal.wait(batch)
+
+    def _write_json(self, path: Path, data: Any, compact: bool = False) -> None:
+        """Replace a JSON file, at the end of the current transaction if there is one."""
+        def content() -> bytes:
+            if compact:
+                return json.dumps(data, separators=(",", ":")).encode("utf-8")
+            return json.dumps(data, indent=2).encode("utf-8")
+
+        writes = getattr(self._txn, "writes", None)
+        if writes is not None:
+            writes[path] = content  # Serialized at commit, so the last state of `data` is saved
+        else:
+            self.journal.commit({path: content})
+
+    def _read_json(self, path: Path, label: str, default):
+        pending = self.journal.read_pending(path)
+        if pending is not None:
+            return json.loads(pending)  # Saved by this process, not yet on disk
+        if path.exists():
+            try:
+                with open(path, 'r') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"Error loading {label}: {e}")
+        return default
+
+    def load_agents(self) -> Dict[str, Dict[str, Any]]:
+        agents = {}
+        for agent_file in (self.memory_dir / "agents").glob("*.json"):
+            memory = self._read_json(agent_file, f"agent memory {agent_file}", None)
+            if memory is not None:
+                agents[agent_file.stem] = memory  # Filename without extension
+        return agents
+
+    def agent_names(self) -> List[str]:
+        return [agent_file.stem for agent_file in (self.memory_dir / "agents").glob("*.json")]
+
+    def load_agent(self, agent_name: str) -> Optional[Dict[str, Any]]:
+        agent_file = self.memory_dir / "agents" / f"{agent_name}.json"
+        return self._read_json(agent_file, f"agent memory {agent_file}", None)
+
+    def load_debate_index(self) -> List[Dict[str, Any]]:
+        return self._read_json(self.memory_dir / "indexes" / "debate_index.json", "debate index", [])
+
+    def load_topic_index(self) -> Dict[str, List[str]]:
+        return self._read_json(self.memory_dir / "indexes" / "topic_index.json", "topic index", {})
+
+    def load_debate(self, debate_id: str) -> Optional[Dict[str, Any]]:
+        path = self.memory_dir / "debates" / f"{debate_id}.json"
+        pending = self.journal.read_pending(path)
+        if pending is not None:
+            return json.loads(pending)
+        if not path.exists():
+            return None
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def debate_ids(self) -> List[str]:
+        return sorted(path.stem for path in (self.memory_dir / "debates").glob("*.json"))
+
+    def has_debate(self, debate_id: str) -> bool:
+        path = self.memory_dir / "debates" / f"{debate_id}.json"
+        return path.exists() or self.journal.read_pending(path) is not None
+
+    def put_debate(self, debate_id: str, debate_data: Dict[str, Any]) -> str:
+        debate_path = self.memory_dir / "debates" / f"{debate_id}.json"
+        self._write_json(debate_path, debate_data, compact=True)  # Transcripts make debates the largest files
+        return str(debate_path)
+
+    def append_index_entry(self, entry: Dict[str, Any], debate_index: List[Dict[str, Any]]) -> None:
+        self._write_json(self.memory_dir / "indexes" / "debate_index.json", debate_index)
+
+    def add_topic_refs(self, debate_id: str, topics: List[str], topic_index: Dict[str, List[str]]) -> None:
+        self._write_json(self.memory_dir / "indexes" / "topic_index.json", topic_index)
+
+    def update_agent(self, agent_name: str, ops: AgentOps, memory: Dict[str, Any]) -> None:
+        self.put_agent(agent_name, memory)
+
+    def put_agent(self, agent_name: str, memory: Dict[str, Any]) -> None:
+        self._write_json(self.memory_dir / "agents" / f"{agent_name}.json", memory)
+
+
+# Location of a record: (segment file name, byte offset, byte length, op)
+Location = Tuple[str, int, int, str]
+
+
+class SegmentLogStore(MemoryStore):
+    """
+    Append-only segment log with an offset index, under {memory_dir}/store/.
+
+    Every change is one JSON line {"ns", "key", "op", ...} appended to the active segment
+    (NNNN-NNNNNN.seg, rotated at max_segment_bytes); its location is appended to offsets.log.
+    Opening the store reads offsets.log only; documents are read by seeking to their records.
+    Namespaces: "debate" (by ID) and "debate_index" (by position; op "put", latest wins), "topic" (op "extend",
+    accumulated) and "agent" ("put" replaces, "patch" applies deltas).
+    """
+
+    OFFSETS_FILE = "offsets.log"
+
+    def __init__(self, memory_dir: Path, max_segment_bytes: int = 64 * 1024 * 1024,
+                 compact_dead_ratio: float = 0.5, compact_min_bytes: int = 8 * 1024 * 1024,
+                 compact_max_patches: int = 50000):
+        """
+        Args:
+            memory_dir: Memory root; the log lives in its store/ subdirectory
+            max_segment_bytes: Start a new segment once the active one reaches this size
+            compact_dead_ratio: Compact when superseded bytes exceed this share of the log...
+            compact_min_bytes: ...and amount to at least this many bytes
+            compact_max_patches: Compact when this many delta records await replay at startup
+        """
+        self.memory_dir = Path(memory_dir)
+        self.store_dir = self.memory_dir / "store"
+        os.makedirs(self.store_dir, exist_ok=True)
+        self.max_segment_bytes = max_segment_bytes
+        self.compact_dead_ratio = compact_dead_ratio
+        self.compact_min_bytes = compact_min_bytes
+        self.compact_max_patches = compact_max_patches
+        self._lock = threading.RLock()
+        self._locations: Dict[str, Dict[str, List[Location]]] = {
+            "debate": {}, "debate_index": {}, "topic": {}, "agent": {},
+        }
+        self._readers: Dict[str, Any] = {}
+        self._live_bytes = 0
+        self._patches = 0
+        self._load_offsets()
+        self._open_writer()
+
+    # --- Offset index ---
+
+    def _load_offsets(self) -> None:
+        offsets_path = self.store_dir / self.OFFSETS_FILE
+        sizes: Dict[str, int] = {}
+        valid = 0
+        if offsets_path.exists():
+            valid = self._read_offsets(0, sizes)
+            if valid < offsets_path.stat().st_size:
+                # Drop the unusable tail so new offsets are not appended after it
+                os.truncate(offsets_path, valid)
+        # Segments of another generation the offset index does not reference are leftovers of an
+        # interrupted compaction (an unreferenced one of this generation may be another process's new segment)
+        generation = max(self._parse_segment_name(segment)[0] for segment in sizes) if sizes else None
+        for path in self.store_dir.glob("*.seg"):
+            if path.name not in sizes and generation is not None \
+                    and self._parse_segment_name(path.name)[0] != generation:
+                path.unlink()
+        self._segments = sorted(sizes)
+        self._offsets_read = valid  # Bytes of offsets.log reflected in _locations
+        self._offsets_inode = offsets_path.stat().st_ino if offsets_path.exists() else None
+
+    def _read_offsets(self, start: int, sizes: Dict[str, int]) -> int:
+        """Remember the locations in offsets.log from byte `start`; returns where the valid lines end."""
+        valid = start
+        with open(self.store_dir / self.OFFSETS_FILE, "rb") as f:
+            f.seek(start)
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("unterminated line")
+                    ns, key, segment, offset, length, op = json.loads(line)
+                except ValueError:
+                    break  # Torn final line from a crash (or another writer) mid-write
+                if segment not in sizes:
+                    path = self.store_dir / segment
+                    sizes[segment] = path.stat().st_size if path.exists() else 0
+                if offset + length > sizes[segment]:
+                    break  # Offset written but its record never reached the segment
+                self._remember(ns, key, (segment, offset, length, op))
+                valid += len(line)
+        return valid
+
+    def refresh(self) -> None:
+        """
+        Read the offsets other processes appended, and follow their segment rotations. After
+        another process compacted the store (a new offsets.log), reopen it. Callers hold the
+        store lock (locking.py), so no other process is mid-write.
+        """
+        with self._lock:
+            offsets_path = self.store_dir / self.OFFSETS_FILE
+            try:
+                stat = offsets_path.stat()
+            except FileNotFoundError:
+                return
+            if stat.st_ino != self._offsets_inode:
+                self.close()
+                self._locations = {ns: {} for ns in self._locations}
+                self._live_bytes = 0
+                self._patches = 0
+                self._load_offsets()
+                self._open_writer()
+                return
+            if stat.st_size <= self._offsets_read:
+                return
+            sizes: Dict[str, int] = {}
+            self._offsets_read = self._read_offsets(self._offsets_read, sizes)
+            self._segments = sorted(set(self._segments) | set(sizes))
+            if self._segments[-1] != self._active:
+                self._writer.close()
+                self._active = self._segments[-1]
+                self._writer = open(self.store_dir / self._active, "ab")
+
+    def _remember(self, ns: str, key: str, location: Location) -> None:
+        keys = self._locations[ns]
+        length = location[2]
+        if location[3] in ("put",):
+            for old in keys.get(key, []):
+                self._live_bytes -= old[2]
+            self._patches -= max(0, len(keys.get(key, [])) - 1)
+            keys[key] = [location]
+        else:
+            keys.setdefault(key, []).append(location)
+            if len(keys[key]) > 1:
+                self._patches += 1
+        self._live_bytes += length
+
+    def _open_writer(self) -> None:
+        if self._segments:
+            self._active = self._segments[-1]
+        else:
+            self._active = self._segment_name(1, 1)
+            self._segments = [self._active]
+        self._writer = open(self.store_dir / self._active, "ab")
+        self._offsets = open(self.store_dir / self.OFFSETS_FILE, "a", encoding="utf-8")
+        self._offsets_inode = os.fstat(self._offsets.fileno()).st_ino
+
+    @staticmethod
+    def _segment_name(generation: int, number: int) -> str:
+        return f"{generation:04d}-{number:06d}.seg"
+
+    @staticmethod
+    def _parse_segment_name(name: str) -> Tuple[int, int]:
+        generation, number = name[:-4].split("-")
+        return int(generation), int(number)
+
+    # --- Records ---
+
+    def _append(self, ns: str, key: str, op: str, payload: Dict[str, Any]) -> Location:
+        record = json.dumps(dict(payload, ns=ns, key=key, op=op), ensure_ascii=False, separators=(",", ":"))
+        data = (record + "\n").encode("utf-8")
+        with self._lock:
+            # Seek to the end: another process may have appended to the segment since our last write
+            end = self._writer.seek(0, os.SEEK_END)
+            if end + len(data) > self.max_segment_bytes and end > 0:
+                self._rotate()
+            offset = self._writer.tell()
+            self._writer.write(data)
+            self._writer.flush()
+            location = (self._active, offset, len(data), op)
+            line = json.dumps([ns, key, *location], ensure_ascii=False) + "\n"
+            self._offsets.write(line)
+            self._offsets.flush()
+            end = self._offsets.tell()
+            if end - len(line.encode("utf-8")) == self._offsets_read:
+                self._offsets_read = end  # Our own line; offsets other processes wrote before it are read by refresh()
+            self._remember(ns, key, location)
+        return location
+
+    def _rotate(self) -> None:
+        self._writer.close()
+        generation, number = self._parse_segment_name(self._active)
+        self._active = self._segment_name(generation, number + 1)
+        self._segments.append(self._active)
+        self._writer = open(self.store_dir / self._active, "ab")
+
+    def _read_raw(self, location: Location) -> bytes:
+        segment, offset, length, _ = location
+        with self._lock:
+            reader = self._readers.get(segment)
+            if reader is None:
+                reader = self._readers[segment] = open(self.store_dir / segment, "rb")
+            reader.seek(offset)
+            return reader.read(length)
+
+    def _read(self, location: Location) -> Dict[str, Any]:
+        return json.loads(self._read_raw(location))
+
+    def _records(self, ns: str) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        for key, locations in list(self._locations[ns].items()):
+            yield key, [self._read(location) for location in locations]
+
+    # --- MemoryStore ---
+
+    @staticmethod
+    def _replay_agent(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        memory: Dict[str, Any] = {}
+        for record in records:
+            if record["op"] == "put":
+                memory = record["value"]
+            else:
+                apply_ops(memory, record["ops"])
+        return memory
+
+    def load_agents(self) -> Dict[str, Dict[str, Any]]:
+        return {name: self._replay_agent(records) for name, records in self._records("agent")}
+
+    def agent_names(self) -> List[str]:
+        return list(self._locations["agent"])
+
+    def load_agent(self, agent_name: str) -> Optional[Dict[str, Any]]:
+        locations = self._locations["agent"].get(agent_name)
+        if not locations:
+            return None
+        return self._replay_agent([self._read(location) for location in locations])
+
+    def load_debate_index(self) -> List[Dict[str, Any]]:
+        return [records[-1]["value"] for _, records in self._records("debate_index")]
+
+    def load_topic_index(self) -> Dict[str, List[str]]:
+        topics = {}
+        for topic, records in self._records("topic"):
+            topics[topic] = [debate_id for record in records for debate_id in record["value"]]
+        return topics
+
+    def load_debate(self, debate_id: str) -> Optional[Dict[str, Any]]:
+        locations = self._locations["debate"].get(debate_id)
+        if not locations:
+            return None
+        return self._read(locations[-1])["value"]
+
+    def debate_ids(self) -> List[str]:
+        return list(self._locations["debate"])
+
+    def has_debate(self, debate_id: str) -> bool:
+        return debate_id in self._locations["debate"]
+
+    def put_debate(self, debate_id: str, debate_data: Dict[str, Any]) -> str:
+        segment, offset, _, _ = self._append("debate", debate_id, "put", {"value": debate_data})
+        self.maybe_compact()
+        return str(self.store_dir / f"{segment}@{offset}")
+
+    def append_index_entry(self, entry: Dict[str, Any], debate_index: List[Dict[str, Any]]) -> None:
+        # Keyed by position: the index is a list and may hold two entries for one debate_id
+        self._append("debate_index", str(len(self._locations["debate_index"])), "put", {"value": entry})
+
+    def add_topic_refs(self, debate_id: str, topics: List[str], topic_index: Dict[str, List[str]]) -> None:
+        for topic in topics:
+            self._append("topic", topic, "extend", {"value": [debate_id]})
+
+    def update_agent(self, agent_name: str, ops: AgentOps, memory: Dict[str, Any]) -> None:
+        self._append("agent", agent_name, "patch", {"ops": ops})
+
+    def put_agent(self, agent_name: str, memory: Dict[str, Any]) -> None:
+        self._append("agent", agent_name, "put", {"value": memory})
+
+    # --- Compaction ---
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = sum((self.store_dir / segment).stat().st_size for segment in self._segments
+                        if (self.store_dir / segment).exists())
+            return {
+                "segments": len(self._segments),
+                "total_bytes": total,
+                "live_bytes": self._live_bytes,
+                "dead_bytes": max(0, total - self._live_bytes),
+                "pending_patches": self._patches,
+                "debates": len(self._locations["debate"]),
+            }
+
+    def maybe_compact(self) -> bool:
+        """Compact when superseded bytes or unreplayed deltas pass their thresholds."""
+        stats = self.stats()
+        dead = stats["dead_bytes"]
+        if (dead >= self.compact_min_bytes and dead >= self.compact_dead_ratio * stats["total_bytes"]) \
+                or stats["pending_patches"] >= self.compact_max_patches:
+            self.compact()
+            return True
+        return False
+
+    def compact(self) -> None:
+        """
+        Rewrite the live data into a new segment generation: the latest debate and index records
+        are copied byte for byte, topic and agent deltas are folded into one record each. The new
+        offset index replaces the old one atomically; old segments are deleted afterwards.
+        """
+        with self._lock:
+            generation = self._parse_segment_name(self._active)[0] + 1
+            agents = self.load_agents()
+            topics = self.load_topic_index()
+            old_locations = self._locations
+            old_segments = list(self._segments)
+
+            self._writer.close()
+            self._offsets.close()
+            self._locations = {ns: {} for ns in old_locations}
+            self._live_bytes = 0
+            self._patches = 0
+            self._active = self._segment_name(generation, 1)
+            self._segments = [self._active]
+            self._writer = open(self.store_dir / self._active, "ab")
+            tmp_offsets = self.store_dir / (self.OFFSETS_FILE + ".tmp")
+            self._offsets = open(tmp_offsets, "w", encoding="utf-8")
+
+            for ns in ("debate", "debate_index"):
+                for key, locations in old_locations[ns].items():
+                    record = json.loads(self._read_raw(locations[-1]))
+                    self._append(ns, key, "put", {"value": record["value"]})
+            for topic, debate_ids in topics.items():
+                self._append("topic", topic, "extend", {"value": debate_ids})
+            for name, memory in agents.items():
+                self._append("agent", name, "put", {"value": memory})
+
+            self._writer.flush()
+            os.fsync(self._writer.fileno())
+            self._offsets.flush()
+            os.fsync(self._offsets.fileno())
+            self._offsets.close()
+            os.replace(tmp_offsets, self.store_dir / self.OFFSETS_FILE)
+            self._offsets = open(self.store_dir / self.OFFSETS_FILE, "a", encoding="utf-8")
+            self._offsets_read = self._offsets.tell()
+            self._offsets_inode = os.fstat(self._offsets.fileno()).st_ino
+
+            for reader in self._readers.values():
+                reader.close()
+            self._readers = {}
+            for segment in old_segments:
+                path = self.store_dir / segment
+                if path.exists():
+                    path.unlink()
+
+    def close(self) -> None:
+        with self._lock:
+            self._writer.close()
+            self._offsets.close()
+            for reader in self._readers.values():
+                reader.close()
+            self._readers = {}
+
+
+def migrate_store(source: MemoryStore, target: MemoryStore) -> int:
+    """
+    Copy every debate, index entry, topic reference and agent memory from source into target.
+    Returns:
+        Number of debates copied
+    """
+    debate_ids = source.debate_ids()
+    for debate_id in debate_ids:
+        debate_data = source.load_debate(debate_id)
+        if debate_data is not None:
+            target.put_debate(debate_id, debate_data)
+    debate_index: List[Dict[str, Any]] = []
+    for entry in source.load_debate_index():
+        debate_index.append(entry)
+        target.append_index_entry(entry, debate_index)
+    topic_index: Dict[str, List[str]] = {}
+    for topic, ids in source.load_topic_index().items():
+        for debate_id in ids:
+            topic_index.setdefault(topic, []).append(debate_id)
+            target.add_topic_refs(debate_id, [topic], topic_index)
+    for name, memory in source.load_agents().items():
+        target.put_agent(name, memory)
+    target.compact()
+    return len(debate_ids)
+
+
+def _has_json_layout(memory_dir: Path) -> bool:
+    return (memory_dir / "indexes" / "debate_index.json").exists() or any((memory_dir / "debates").glob("*.json"))
+
+
+def create_store(backend: str, memory_dir: Path, fsync: bool = True) -> MemoryStore:
+    """
+    Build the storage backend named by MEMORY_BACKEND ("json", "segment" or "sqlite").
+    A new segment or SQLite store next to an existing JSON layout is populated from it on first open.
+    fsync (MEMORY_FSYNC) applies to the json backend's journaled writes.
+    """
+    memory_dir = Path(memory_dir)
+    if backend == "json":
+        return JsonDirectoryStore(memory_dir, fsync)
+    if backend == "segment":
+        is_new = not (memory_dir / "store" / SegmentLogStore.OFFSETS_FILE).exists()
+        store = SegmentLogStore(memory_dir)
+    elif backend == "sqlite":
+        from .sqlite_store import SqliteStore
+        is_new = not (memory_dir / SqliteStore.DB_FILE).exists()
+        store = SqliteStore(memory_dir)
+    else:
+        raise ValueError(f"Unknown MEMORY_BACKEND: {backend!r} (expected 'json', 'segment' or 'sqlite')")
+    if is_new and _has_json_layout(memory_dir):
+        count = migrate_store(JsonDirectoryStore(memory_dir, fsync), store)
+        print(f"Migrated {count} debates from {memory_dir} into the {backend} store")
+    return store
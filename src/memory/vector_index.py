@@ -0,0 +1,270 @@
+"""
+Append-only vector store with nearest-neighbour search for debate and position embeddings.
+
+Vectors are appended as raw float32 rows to {name}.f32 and read back through a NumPy memmap, so
+searching never loads the file into Python objects; {name}.keys.jsonl holds one line per row (key,
+row number, optional group, metadata) and {name}.meta.json the provider and dimension the rows were
+made with. Re-adding a key appends a new row and retires the old one. Searches are exact (brute
+force) until the store reaches `ivf_threshold` vectors; from then on an IVF index (spherical k-means
+centroids with an inverted list per centroid) is built in memory on first search and `nprobe` lists
+are scanned.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class VectorIndex:
+    """Vectors keyed by string, optionally grouped (e.g. by agent), searched by cosine similarity."""
+
+    def __init__(self, index_dir: Path, name: str, dim: int, provider_name: str,
+                 ivf_threshold: int = 20000, nprobe: int = 8):
+        """
+        Args:
+            index_dir: Directory holding the store's files
+            name: File name prefix
+            dim: Vector size
+            provider_name: Embedding provider the vectors come from; stored vectors from another
+                           provider or dimension are discarded on load
+            ivf_threshold: Live vectors from which searches without a group use the IVF index
+            nprobe: Inverted lists scanned per IVF search
+        """
+        index_dir = Path(index_dir)
+        self.vectors_path = index_dir / f"{name}.f32"
+        self.keys_path = index_dir / f"{name}.keys.jsonl"
+        self.meta_path = index_dir / f"{name}.meta.json"
+        self.dim = dim
+        self.row_bytes = dim * 4
+        self.provider_name = provider_name
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self._lock = threading.RLock()
+        self.unload()
+
+    def unload(self) -> None:
+        """Drop the in-memory key list, so the next load() reads the files again (e.g. after another
+        process appended to them)."""
+        with self._lock:
+            self._loaded = False
+            self._entries: Dict[int, Dict[str, Any]] = {}  # Row -> {"key", "row", "group", "meta"}
+            self._rows: Dict[str, int] = {}                 # Key -> live row
+            self._groups: Dict[str, List[int]] = {}         # Group -> rows (live or retired)
+            self._row_count = 0                             # Rows in the vectors file
+            self._matrix = None                             # memmap of the first _matrix_rows rows
+            self._matrix_rows = 0
+            self._ivf = None                                # (centroids, [rows per centroid]) once built
+            self._ivf_rows = 0
+            self._group_vectors: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}  # Group -> (live rows, their vectors)
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def load(self) -> None:
+        """Read the key list (once); rows whose key line or vector was cut short by a crash are ignored."""
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            os.makedirs(self.meta_path.parent, exist_ok=True)
+            meta = {"provider": self.provider_name, "dim": self.dim}
+            if self.meta_path.exists():
+                with open(self.meta_path, "r", encoding="utf-8") as f:
+                    if json.load(f) != meta:
+                        # Vectors from another provider are not comparable; start over (callers backfill)
+                        for path in (self.vectors_path, self.keys_path):
+                            if path.exists():
+                                os.remove(path)
+            with open(self.meta_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+
+            self._row_count = os.path.getsize(self.vectors_path) // self.row_bytes if self.vectors_path.exists() else 0
+            if self.keys_path.exists():
+                with open(self.keys_path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line) if line.endswith("\n") else None
+                        except ValueError:
+                            entry = None
+                        if entry is not None and entry["row"] < self._row_count:
+                            self._track(entry)
+
+    def _track(self, entry: Dict[str, Any]) -> None:
+        row = entry["row"]
+        retired = self._rows.get(entry["key"])
+        if retired is not None and self._entries[retired].get("group") is not None:
+            self._group_vectors.pop(self._entries[retired]["group"], None)
+        self._entries[row] = entry
+        self._rows[entry["key"]] = row
+        if entry.get("group") is not None:
+            self._groups.setdefault(entry["group"], []).append(row)
+            self._group_vectors.pop(entry["group"], None)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    def add(self, items: List[Tuple[str, Optional[str], Dict[str, Any]]], vectors) -> None:
+        """
+        Append vectors.
+        Args:
+            items: (key, group, metadata) per vector
+            vectors: float32 array of shape (len(items), dim)
+        Appending does not load the store; the rows are read back on first load.
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32).reshape(len(items), self.dim)
+        with self._lock:
+            os.makedirs(self.vectors_path.parent, exist_ok=True)
+            with open(self.vectors_path, "ab") as f:
+                size = f.seek(0, os.SEEK_END)
+                if size % self.row_bytes:
+                    # Drop a partial row left by an interrupted write so rows stay aligned
+                    size -= size % self.row_bytes
+                    f.truncate(size)
+                first = size // self.row_bytes
+                f.write(vectors.tobytes())
+            entries = [{"key": key, "row": first + offset, "group": group, "meta": meta}
+                       for offset, (key, group, meta) in enumerate(items)]
+            with open(self.keys_path, "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+            if not self._loaded:
+                return  # Read back on first load
+            self._row_count = first + len(entries)
+            for entry in entries:
+                self._track(entry)
+            if self._ivf is not None:
+                centroids, lists = self._ivf
+                for offset, cluster in enumerate(np.argmax(vectors @ centroids.T, axis=1)):
+                    lists[cluster].append(first + offset)
+
+    # --- Reading ---
+
+    def _vectors(self):
+        """All rows as a read-only memmap (reopened when rows were appended)."""
+        rows = self._row_count
+        if self._matrix is None or self._matrix_rows != rows:
+            self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim)) \
+                if rows else np.zeros((0, self.dim), dtype=np.float32)
+            self._matrix_rows = rows
+        return self._matrix
+
+    def group_vectors(self, group: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The live rows of a group and a contiguous in-memory copy of their vectors, cached until rows
+        are added to the group, so repeated searches within it do not gather rows from the memmap.
+        Returns:
+            (rows, vectors of shape (len(rows), dim))
+        """
+        with self._lock:
+            self.load()
+            if group not in self._group_vectors:
+                rows = np.array([row for row in self._groups.get(group, [])
+                                 if self._rows.get(self._entries[row]["key"]) == row], dtype=np.int64)
+                vectors = np.array(self._vectors()[rows]) if len(rows) else np.zeros((0, self.dim), dtype=np.float32)
+                self._group_vectors[group] = (rows, vectors)
+            return self._group_vectors[group]
+
+    def group_similarities(self, vector, group: str, exclude: Optional[str] = None) -> np.ndarray:
+        """
+        Cosine similarities between a vector and every live vector of a group, as one product with
+        the group's cached matrix (see group_vectors).
+        Args:
+            vector: Query vector of length dim (unit length)
+            group: Group whose vectors are compared
+            exclude: Key whose row is left out
+        Returns:
+            float32 array with one similarity per compared row, in row order
+        """
+        with self._lock:
+            rows, group_vectors = self.group_vectors(group)
+            scores = group_vectors @ np.asarray(vector, dtype=np.float32)
+            excluded = self._rows.get(exclude) if exclude is not None else None
+            return scores[rows != excluded] if excluded is not None else scores
+
+    def get(self, key: str):
+        """The stored vector for a key, or None."""
+        with self._lock:
+            self.load()
+            row = self._rows.get(key)
+            return None if row is None else np.array(self._vectors()[row])
+
+    def _build_ivf(self) -> None:
+        """Cluster the stored vectors with a few rounds of spherical k-means on a sample."""
+        vectors = self._vectors()
+        rows = self._row_count
+        lists_count = int(min(4096, max(16, np.sqrt(rows))))
+        rng = np.random.default_rng(0)
+        sample = np.asarray(vectors[np.sort(rng.choice(rows, size=min(rows, lists_count * 64), replace=False))])
+        centroids = sample[rng.choice(len(sample), size=lists_count, replace=False)].copy()
+        for _ in range(8):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            for cluster in range(lists_count):
+                members = sample[assignment == cluster]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    norm = np.linalg.norm(centroid)
+                    centroids[cluster] = centroid / norm if norm else centroids[cluster]
+        lists: List[List[int]] = [[] for _ in range(lists_count)]
+        for start in range(0, rows, 65536):
+            chunk = np.asarray(vectors[start:start + 65536])
+            for offset, cluster in enumerate(np.argmax(chunk @ centroids.T, axis=1)):
+                lists[cluster].append(start + offset)
+        self._ivf = (centroids, lists)
+        self._ivf_rows = rows
+
+    def search(self, vector, limit: int = 5, group: Optional[str] = None,
+               exclude: Optional[set] = None) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Nearest stored vectors by cosine similarity.
+        Args:
+            vector: Query vector of length dim (unit length)
+            limit: Maximum number of results
+            group: Only search rows of this group (always exact)
+            exclude: Keys to leave out
+        Returns:
+            Up to `limit` (entry, similarity) pairs, most similar first; entry is {"key", "row", "group", "meta"}
+        """
+        with self._lock:
+            self.load()
+            if not self._rows or limit <= 0:
+                return []
+            if group is not None:
+                # The group's live vectors, kept contiguous in memory
+                rows, group_vectors = self.group_vectors(group)
+                scores = group_vectors @ vector
+            elif len(self._rows) >= self.ivf_threshold:
+                if self._ivf is None or self._row_count > 2 * self._ivf_rows:
+                    self._build_ivf()
+                centroids, lists = self._ivf
+                probes = np.argsort(-(centroids @ vector))[:self.nprobe]
+                rows = np.array(sorted(row for cluster in probes for row in lists[cluster]), dtype=np.int64)
+                scores = np.asarray(self._vectors()[rows]) @ vector if len(rows) else np.zeros(0, dtype=np.float32)
+            else:
+                scores = np.asarray(self._vectors()) @ vector
+                rows = np.arange(len(scores))
+            if not len(scores):
+                return []
+            # Enough top rows to still fill `limit` after skipping retired, orphaned and excluded rows
+            wanted = limit + (self._row_count - len(self._rows)) + len(exclude or ())
+            if wanted < len(scores):
+                top = np.argpartition(-scores, wanted)[:wanted]
+                top = top[np.argsort(-scores[top])]
+            else:
+                top = np.argsort(-scores)
+            results = []
+            for position in top:
+                row = int(rows[position])
+                entry = self._entries.get(row)
+                if entry is None or self._rows.get(entry["key"]) != row or (exclude and entry["key"] in exclude):
+                    continue
+                results.append((entry, float(scores[position])))
+                if len(results) >= limit:
+                    break
+            return results
@@ -14,28 +14,87 @@ from pathlib import Path
 from collections import Counter
 from typing import Dict, List, Any, Optional, Union, Tuple
 import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.memory import MemoryManager
+from .keyword_scanner import KeywordScanner
+from .manifest import MetricsManifest, debate_hash
+from .metrics_table import METRIC_COLUMNS, MetricsTable
+
+# Version of the scoring below: bump it when a metric changes so bulk runs rescore every debate
+METRICS_VERSION = 2
+
+# Major philosophical traditions, counted for perspective diversity
+TRADITIONS = [
+    "utilitarian", "deontolog", "virtue ethics", "existential", "pragmati", 
+    "empiric", "rational", "phenomenolog", "analytic", "continental",
+    "eastern", "buddhis", "taois", "confucian", "hindu"
+]
+
+# Philosophers and concepts, counted for philosophical depth
+PHILOSOPHERS = [
+    "aristotle", "plato", "kant", "nietzsche", "hume", "marx", "sartre", 
+    "wittgenstein", "descartes", "hegel", "locke", "rousseau", "kierkegaard",
+    "confucius", "buddha", "laozi", "spinoza", "aquinas", "heidegger"
+]
+
+CONCEPTS = [
+    "ethics", "metaphysics", "epistemology", "ontology", "phenomenology",
+    "existentialism", "empiricism", "rationalism", "utilitarianism",
+    "deontology", "categorical imperative", "virtue", "moral", "epistemic",
+    "truth", "knowledge", "justice", "freedom", "consciousness", "meaning"
+]
+
+# Words marking explicit disagreement between agents
+DISAGREEMENT_MARKERS = ["disagree", "contrary"]
+
+# Consistency: an agent's statement against its earlier statements closest in meaning
+RELATED_POSITIONS = 10       # Earlier statements compared, most similar first
+RELATED_SIMILARITY = 0.25    # Cosine similarity below which an earlier statement is on another subject
+CONSISTENT_SIMILARITY = 0.8  # Mean similarity to the related statements scored as fully consistent
+
+# Counts all keyword families over a debate's analyses at once
+KEYWORD_SCANNER = KeywordScanner({
+    "traditions": TRADITIONS,
+    "philosophers": PHILOSOPHERS,
+    "concepts": CONCEPTS,
+    "disagreement": DISAGREEMENT_MARKERS,
+})
 
 
 class DebateMetricsCalculator:
     """Calculator for various metrics related to philosophical debates."""
     
-    def __init__(self, memory_dir: str = "memory"):
+    def __init__(self, memory_dir: str = "memory", memory_manager: Optional[MemoryManager] = None,
+                 agent_positions: Optional[Dict[str, Dict[str, List[Dict[str, Any]]]]] = None):
         """Initialize metrics calculator with path to memory directory.
         
         Args:
             memory_dir: Path to memory directory containing debate records
+            memory_manager: MemoryManager to read the debates from (e.g. the one that saved them);
+                            if given, memory_dir is taken from it
+            agent_positions: Every agent's positions by topic, loaded beforehand (see load_agent_positions);
+                             if None, each agent's positions are read from memory when scored.
+                             Only used when embeddings are disabled
         """
-        self.memory_dir = Path(memory_dir)
+        self.memory_dir = memory_manager.memory_dir if memory_manager is not None else Path(memory_dir)
         self.debates_dir = self.memory_dir / "debates"
         self.agents_dir = self.memory_dir / "agents"
         self.indexes_dir = self.memory_dir / "indexes"
+        self.memory_manager = memory_manager or MemoryManager(str(self.memory_dir))
+        self.agent_positions = agent_positions
+        self._marker_cache: Dict[str, Optional[Dict[str, Any]]] = {}  # Per agent, when agent_positions is set
         
         # Create metrics directory if it doesn't exist
         self.metrics_dir = self.memory_dir / "metrics"
         os.makedirs(self.metrics_dir, exist_ok=True)
+        self.manifest = MetricsManifest(self.metrics_dir)
+        self.metrics_table = MetricsTable(self.metrics_dir, self.manifest)
     
     def calculate_metrics_for_debate(self, debate_id: str) -> Dict[str, Any]:
-        """Calculate all metrics for a specific debate.
+        """Calculate all metrics for a specific debate, save them and print a summary.
         
         Args:
             debate_id: ID of the debate to analyze
@@ -43,12 +102,34 @@ class DebateMetricsCalculator:
         Returns:
             Dictionary of metrics for the debate
         """
-        debate_file = self.debates_dir / f"{debate_id}.json"
-        if not debate_file.exists():
-            return {"error": f"Debate {debate_id} not found"}
+        metrics = self.compute_metrics(debate_id)
+        if "error" in metrics:
+            return metrics
+        
+        # Save metrics to file
+        self.save_metrics(debate_id, metrics)
+        
+        # Print a summary of metrics for the console output
+        print(f"Metrics for debate '{metrics['topic']}': ")
+        print(f"  Coherence: {metrics['metrics']['coherence']:.2f}")
+        print(f"  Diversity: {metrics['metrics']['diversity']:.2f}")
+        print(f"  Depth: {metrics['metrics']['depth']:.2f}")
+        print(f"  Overall Quality: {metrics['metrics']['overall_quality']:.2f}")
+        
+        return metrics
+    
+    def compute_metrics(self, debate_id: str) -> Dict[str, Any]:
+        """Calculate all metrics for a specific debate without saving them.
         
-        with open(debate_file, "r") as f:
-            debate = json.load(f)
+        Args:
+            debate_id: ID of the debate to analyze
+            
+        Returns:
+            Dictionary of metrics for the debate, or {"error": ...} if it cannot be loaded
+        """
+        debate = self.load_debate(debate_id)
+        if debate is None:
+            return {"error": f"Debate {debate_id} not found"}
         
         # Ensure we have responses to analyze
         if "responses" not in debate or not debate["responses"]:
@@ -59,10 +140,11 @@ class DebateMetricsCalculator:
             depth_score = 0.0
             consistency_scores = {}
         else:
-            # Calculate all metrics from responses
+            # Calculate all metrics from responses, scanning the analyses for keywords once
+            features = self.keyword_features(debate)
             coherence_score = self.calculate_coherence(debate)
-            diversity_score = self.calculate_perspective_diversity(debate)
-            depth_score = self.calculate_philosophical_depth(debate)
+            diversity_score = self.calculate_perspective_diversity(debate, features)
+            depth_score = self.calculate_philosophical_depth(debate, features)
             consistency_scores = self.calculate_philosophical_consistency(debate)
         
         # Use proper debate topic and date fields
@@ -75,6 +157,8 @@ class DebateMetricsCalculator:
         # Compile metrics
         metrics = {
             "debate_id": debate_id,
+            "debate_hash": debate_hash(debate),
+            "metrics_version": METRICS_VERSION,
             "topic": topic,
             "date": date,
             "agents": agents,
@@ -87,17 +171,42 @@ class DebateMetricsCalculator:
             }
         }
         
-        # Save metrics to file
-        self.save_metrics(debate_id, metrics)
+        return metrics
+    
+    def load_debate(self, debate_id: str) -> Optional[Dict[str, Any]]:
+        """Load a debate record to score.
         
-        # Print a summary of metrics for the console output
-        print(f"Metrics for debate '{topic}': ")
-        print(f"  Coherence: {coherence_score:.2f}")
-        print(f"  Diversity: {diversity_score:.2f}")
-        print(f"  Depth: {depth_score:.2f}")
-        print(f"  Overall Quality: {(coherence_score + diversity_score + depth_score) / 3:.2f}")
+        Args:
+            debate_id: ID of the debate
+            
+        Returns:
+            The debate data, or None if it does not exist
+        """
+        debate = self.memory_manager.get_debate(debate_id)
+        if debate is None:
+            # Records written straight to debates/ rather than through MemoryManager
+            debate_file = self.debates_dir / f"{debate_id}.json"
+            if not debate_file.exists():
+                return None
+            with open(debate_file, "r") as f:
+                debate = json.load(f)
+        return debate
+    
+    def is_scored(self, debate_id: str, manifest: Dict[str, Dict[str, Any]]) -> bool:
+        """Check whether a debate's saved metrics are current: same content and metrics version.
         
-        return metrics
+        Args:
+            debate_id: ID of the debate
+            manifest: Entries from self.manifest.load()
+            
+        Returns:
+            True if the debate does not need rescoring
+        """
+        entry = manifest.get(debate_id)
+        if entry is None or entry.get("hash") is None or entry.get("metrics_version") != METRICS_VERSION:
+            return False
+        debate = self.load_debate(debate_id)
+        return debate is not None and debate_hash(debate) == entry["hash"]
     
     def calculate_coherence(self, debate: Dict[str, Any]) -> float:
         """Calculate coherence score based on logical consistency and clarity.
@@ -129,11 +238,23 @@ class DebateMetricsCalculator:
         
         return min(base_coherence + length_factor + structure_factor, 1.0)
     
-    def calculate_perspective_diversity(self, debate: Dict[str, Any]) -> float:
+    def keyword_features(self, debate: Dict[str, Any]) -> np.ndarray:
+        """Count the metric keywords in each agent's analysis.
+        
+        Args:
+            debate: Full debate data
+            
+        Returns:
+            Array of keyword occurrences, one row per agent and one column per KEYWORD_SCANNER.keywords entry
+        """
+        return KEYWORD_SCANNER.counts([agent.get("analysis", "") for agent in debate.get("agents", [])])
+    
+    def calculate_perspective_diversity(self, debate: Dict[str, Any], features: Optional[np.ndarray] = None) -> float:
         """Calculate diversity score based on representation of different viewpoints.
         
         Args:
             debate: Full debate data
+            features: keyword_features(debate), if already computed
             
         Returns:
             Diversity score from 0.0 to 1.0
@@ -141,75 +262,45 @@ class DebateMetricsCalculator:
         agents = debate.get("agents", [])
         if not agents:
             return 0.0
+        if features is None:
+            features = self.keyword_features(debate)
         
         # Count distinct philosophical traditions referenced
-        traditions = set()
-        for agent in agents:
-            analysis = agent.get("analysis", "").lower()
-            # Check for mentions of major philosophical traditions
-            traditions_keywords = [
-                "utilitarian", "deontolog", "virtue ethics", "existential", "pragmati", 
-                "empiric", "rational", "phenomenolog", "analytic", "continental",
-                "eastern", "buddhis", "taois", "confucian", "hindu"
-            ]
-            
-            for keyword in traditions_keywords:
-                if keyword in analysis:
-                    traditions.add(keyword)
+        traditions = int(KEYWORD_SCANNER.family_presence(features)["traditions"].sum())
         
         # Calculate diversity based on number of traditions referenced
         # More traditions = higher diversity score
-        diversity_score = min(len(traditions) / 8, 1.0)  # Max out at 8 traditions
+        diversity_score = min(traditions / 8, 1.0)  # Max out at 8 traditions
         
-        # Check if there are opposing viewpoints
-        has_disagreement = False
-        for agent in agents:
-            for other_agent in agents:
-                if agent != other_agent:
-                    if "disagree" in agent.get("analysis", "").lower() or "contrary" in agent.get("analysis", "").lower():
-                        has_disagreement = True
-                        break
+        # Check if there are opposing viewpoints: an agent disagreeing, with some other agent to disagree with
+        disagreeing = np.flatnonzero(KEYWORD_SCANNER.family_counts(features)["disagreement"])
+        has_disagreement = any(
+            any(other_agent != agents[index] for other_agent in agents)
+            for index in disagreeing
+        )
         
         if has_disagreement:
             diversity_score = min(diversity_score + 0.2, 1.0)  # Bonus for explicit disagreement
             
         return diversity_score
     
-    def calculate_philosophical_depth(self, debate: Dict[str, Any]) -> float:
+    def calculate_philosophical_depth(self, debate: Dict[str, Any], features: Optional[np.ndarray] = None) -> float:
         """Calculate depth score based on philosophical sophistication and detail.
         
         Args:
             debate: Full debate data
+            features: keyword_features(debate), if already computed
             
         Returns:
             Depth score from 0.0 to 1.0
         """
-        # Count references to philosophers, concepts, and arguments
-        philosophers = [
-            "aristotle", "plato", "kant", "nietzsche", "hume", "marx", "sartre", 
-            "wittgenstein", "descartes", "hegel", "locke", "rousseau", "kierkegaard",
-            "confucius", "buddha", "laozi", "spinoza", "aquinas", "heidegger"
-        ]
-        
-        concepts = [
-            "ethics", "metaphysics", "epistemology", "ontology", "phenomenology",
-            "existentialism", "empiricism", "rationalism", "utilitarianism",
-            "deontology", "categorical imperative", "virtue", "moral", "epistemic",
-            "truth", "knowledge", "justice", "freedom", "consciousness", "meaning"
-        ]
-        
-        # Count mentions in all agent analyses
-        philosopher_mentions = 0
-        concept_mentions = 0
+        if features is None:
+            features = self.keyword_features(debate)
         
-        for agent in debate.get("agents", []):
-            analysis = agent.get("analysis", "").lower()
-            
-            for philosopher in philosophers:
-                philosopher_mentions += analysis.count(philosopher)
-                
-            for concept in concepts:
-                concept_mentions += analysis.count(concept)
+        # Count mentions of philosophers and concepts in all agent analyses
+        family_counts = KEYWORD_SCANNER.family_counts(features)
+        philosopher_mentions = int(family_counts["philosophers"].sum())
+        concept_mentions = int(family_counts["concepts"].sum())
         
         # Calculate depth score based on mentions
         # Sophisticated philosophical discussions should reference both thinkers and concepts
@@ -221,6 +312,15 @@ class DebateMetricsCalculator:
     def calculate_philosophical_consistency(self, debate: Dict[str, Any]) -> Dict[str, float]:
         """Calculate consistency scores for each agent based on past positions.
         
+        Each agent's statement is compared with the stored vectors of all its earlier statements at
+        once (see MemoryManager.position_similarities). The mean cosine similarity of the closest
+        related ones (at most RELATED_POSITIONS, each at least RELATED_SIMILARITY) is scaled from
+        0.2 at RELATED_SIMILARITY to 1.0 at CONSISTENT_SIMILARITY: an agent restating its earlier
+        stance scores high, one drifting away from what it said on related subjects scores low.
+        An agent without related earlier statements is consistent. When embeddings are disabled,
+        contradiction markers in positions on topics sharing a word with the debate topic are
+        counted instead (see _marker_consistency).
+        
         Args:
             debate: Full debate data
             
@@ -228,62 +328,99 @@ class DebateMetricsCalculator:
             Dictionary mapping agent names to consistency scores
         """
         consistency_scores = {}
+        debate_id = debate.get("debate_id") or debate.get("id")
         
         for agent in debate.get("agents", []):
             agent_name = agent.get("name")
             if not agent_name:
                 continue
-                
-            # Get agent memory file
-            agent_file = self.agents_dir / f"{agent_name}.json"
-            if not agent_file.exists():
-                consistency_scores[agent_name] = 1.0  # No previous positions, so technically consistent
-                continue
-                
-            # Load agent memory
-            with open(agent_file, "r") as f:
-                agent_memory = json.load(f)
-                
-            # Get agent's positions on topics
-            positions = agent_memory.get("positions", {})
-            current_topic = debate.get("topic", "")
-            
-            # Default consistency score
-            consistency_score = 1.0
             
-            # Check if agent has previous positions on this topic or related topics
-            related_topics = self._find_related_topics(current_topic, positions.keys())
-            if not related_topics:
-                consistency_scores[agent_name] = consistency_score  # No previous positions on related topics
+            similarities = self.memory_manager.position_similarities(agent_name, agent.get("analysis", ""), debate_id)
+            if similarities is None:
+                consistency_scores[agent_name] = self._marker_consistency(debate, agent)
                 continue
-                
-            # Compare current position with previous positions on related topics
-            current_analysis = agent.get("analysis", "").lower()
-            previous_positions = []
             
-            for topic in related_topics:
-                for position in positions.get(topic, []):
-                    previous_positions.append(position.get("position", "").lower())
+            if len(similarities) > RELATED_POSITIONS:
+                similarities = np.partition(similarities, -RELATED_POSITIONS)[-RELATED_POSITIONS:]
+            related = similarities[similarities >= RELATED_SIMILARITY]
+            if not len(related):
+                consistency_scores[agent_name] = 1.0  # No earlier statements on related subjects
+                continue
             
-            if previous_positions:
-                # Simple text similarity check - in production, use embeddings or semantic similarity
-                contradictions = 0
-                for prev_pos in previous_positions:
-                    # Check for opposite statements (simplistic)
-                    if "not" in prev_pos and "not" not in current_analysis:
-                        contradictions += 1
-                    if "disagree" in prev_pos and "agree" in current_analysis:
-                        contradictions += 1
-                    if "agree" in prev_pos and "disagree" in current_analysis:
-                        contradictions += 1
-                
-                # Reduce consistency score for each contradiction found
-                consistency_score -= min(contradictions * 0.2, 0.8)  # Allow for some evolution of thought
-                
-            consistency_scores[agent_name] = max(consistency_score, 0.2)  # Floor at 0.2
+            agreement = (float(related.mean()) - RELATED_SIMILARITY) / (CONSISTENT_SIMILARITY - RELATED_SIMILARITY)
+            consistency_scores[agent_name] = 0.2 + 0.8 * min(max(agreement, 0.0), 1.0)
             
         return consistency_scores
     
+    def _marker_consistency(self, debate: Dict[str, Any], agent: Dict[str, Any]) -> float:
+        """Consistency of one agent without embeddings: contradiction markers in related positions.
+        
+        Args:
+            debate: Full debate data
+            agent: The agent's entry in debate["agents"]
+            
+        Returns:
+            Consistency score between 0.2 and 1.0
+        """
+        # Get agent's positions on topics, as contradiction marker counts
+        markers = self._position_markers(agent["name"])
+        if markers is None:
+            return 1.0  # No previous positions, so technically consistent
+        current_analysis = agent.get("analysis", "").lower()
+        
+        # Positions on topics sharing a word with the current topic:
+        # [positions, containing "not", containing "disagree", containing "agree"]
+        related = [markers["topics"][topic]
+                   for topic in self._find_related_topics(debate.get("topic", ""), list(markers["topics"]))]
+        previous, with_not, with_disagree, with_agree = np.sum(related, axis=0) if related else (0, 0, 0, 0)
+        if not previous:
+            return 1.0  # No previous positions on related topics
+        
+        # Simple contradiction check over the related positions: opposite statements (simplistic)
+        contradictions = 0
+        if "not" not in current_analysis:
+            contradictions += with_not
+        if "agree" in current_analysis:
+            contradictions += with_disagree
+        if "disagree" in current_analysis:
+            contradictions += with_agree
+        
+        # Reduce consistency score for each contradiction found, allowing for some evolution of thought
+        return max(1.0 - min(int(contradictions) * 0.2, 0.8), 0.2)  # Floor at 0.2
+    
+    def _position_markers(self, agent_name: str) -> Optional[Dict[str, Any]]:
+        """Count the contradiction markers in an agent's previous positions, by topic.
+        
+        Computed once per agent when the positions were loaded beforehand.
+        
+        Args:
+            agent_name: Name of the agent
+            
+        Returns:
+            {"topics": {topic: counts}}, counts being
+            [positions, containing "not", containing "disagree", containing "agree"];
+            None if the agent has no positions
+        """
+        if self.agent_positions is not None and agent_name in self._marker_cache:
+            return self._marker_cache[agent_name]
+        if self.agent_positions is not None:
+            positions = self.agent_positions.get(agent_name, {})
+        else:
+            positions = self.memory_manager.get_agent_positions(agent_name)
+        
+        markers = None
+        if positions:
+            markers = {"topics": {}}
+            for topic, topic_positions in positions.items():
+                topic_counts = np.zeros(4, dtype=np.int64)
+                for position in topic_positions:
+                    text = position.get("position", "").lower()
+                    topic_counts += np.array([1, "not" in text, "disagree" in text, "agree" in text], dtype=np.int64)
+                markers["topics"][topic] = topic_counts
+        if self.agent_positions is not None:
+            self._marker_cache[agent_name] = markers
+        return markers
+    
     def _find_related_topics(self, current_topic: str, previous_topics: List[str]) -> List[str]:
         """Find topics related to the current debate topic.
         
@@ -312,40 +449,45 @@ class DebateMetricsCalculator:
             debate_id: ID of the debate
             metrics: Dictionary of metrics to save
         """
+        self._write_metrics_file(debate_id, metrics)
+        self.manifest.record([metrics])
+    
+    def save_metrics_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """Save the metrics of several debates, in order, recording them in the manifest at once.
+        
+        Args:
+            batch: Metrics dictionaries (each with its "debate_id")
+        """
+        for metrics in batch:
+            self._write_metrics_file(metrics["debate_id"], metrics)
+        self.manifest.record(batch)
+    
+    def _write_metrics_file(self, debate_id: str, metrics: Dict[str, Any]) -> None:
         metrics_file = self.metrics_dir / f"{debate_id}.json"
         with open(metrics_file, "w") as f:
             json.dump(metrics, f, indent=2)
     
-    def get_metrics_over_time(self) -> Dict[str, List[Dict[str, Any]]]:
+    def get_metrics_over_time(self, window: int = 1) -> Dict[str, List[Dict[str, Any]]]:
         """Get metrics over time to track debate quality trends.
         
+        Args:
+            window: Debates averaged into each value (a trailing rolling mean; 1 gives the raw values)
+        
         Returns:
             Dictionary mapping metric names to lists of values over time
         """
         if not self.metrics_dir.exists():
             return {}
             
-        metrics_over_time = {
-            "coherence": [],
-            "diversity": [],
-            "depth": [],
-            "overall_quality": []
-        }
-        
-        for metrics_file in sorted(self.metrics_dir.glob("*.json"), key=lambda x: x.stat().st_mtime):
-            with open(metrics_file, "r") as f:
-                debate_metrics = json.load(f)
-                
-            date = debate_metrics.get("date", "Unknown")
-            metrics = debate_metrics.get("metrics", {})
-            
-            for metric_name in metrics_over_time.keys():
-                if metric_name in metrics:
-                    metrics_over_time[metric_name].append({
-                        "date": date,
-                        "topic": debate_metrics.get("topic", "Unknown"),
-                        "value": metrics[metric_name]
-                    })
+        metrics_over_time = {}
+        
+        # Columns of the metrics table, in the order the debates were scored
+        for metric_name in METRIC_COLUMNS:
+            values, dates, topics = self.metrics_table.trend(metric_name, window)
+            metrics_over_time[metric_name] = [
+                {"date": str(date), "topic": str(topic), "value": float(value)}
+                for value, date, topic in zip(values, dates, topics)
+            ]
                     
         return metrics_over_time
     
@@ -355,71 +497,119 @@ class DebateMetricsCalculator:
         Returns:
             Dictionary mapping agent names to performance metrics
         """
-        agent_metrics = {}
-        
         # Collect metrics from all debates
         if not self.metrics_dir.exists():
             return {}
             
-        for metrics_file in self.metrics_dir.glob("*.json"):
-            with open(metrics_file, "r") as f:
-                debate_metrics = json.load(f)
-                
-            consistency_scores = debate_metrics.get("metrics", {}).get("consistency", {})
-            
-            for agent_name, consistency in consistency_scores.items():
-                if agent_name not in agent_metrics:
-                    agent_metrics[agent_name] = {
-                        "consistency_scores": [],
-                        "debate_count": 0
-                    }
-                
-                agent_metrics[agent_name]["consistency_scores"].append(consistency)
-                agent_metrics[agent_name]["debate_count"] += 1
-        
-        # Calculate average metrics for each agent
-        for agent_name in agent_metrics.keys():
-            consistency_scores = agent_metrics[agent_name]["consistency_scores"]
-            if consistency_scores:
-                agent_metrics[agent_name]["avg_consistency"] = sum(consistency_scores) / len(consistency_scores)
-            else:
-                agent_metrics[agent_name]["avg_consistency"] = 0
-                
-        return agent_metrics
+        return self.metrics_table.agent_consistency()
+
+
+def load_agent_positions(memory_manager: MemoryManager) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+    """Load every agent's positions by topic at once, for scoring many debates.
+    
+    Args:
+        memory_manager: MemoryManager holding the agent memories
+        
+    Returns:
+        Dictionary mapping agent names to their positions by topic
+    """
+    return {agent_name: memory_manager.get_agent_positions(agent_name) for agent_name in memory_manager.list_agents()}
+
+
+# Calculator of a bulk worker process, created once by _init_worker
+_worker_calculator: Optional[DebateMetricsCalculator] = None
+
+
+def _init_worker(memory_dir: str, agent_positions: Optional[Dict[str, Dict[str, List[Dict[str, Any]]]]]) -> None:
+    global _worker_calculator
+    _worker_calculator = DebateMetricsCalculator(memory_dir, agent_positions=agent_positions)
+
+
+def _score_chunk(debate_ids: List[str]) -> List[Dict[str, Any]]:
+    """Compute (without saving) the metrics of a chunk of debates in a worker process."""
+    return [_worker_calculator.compute_metrics(debate_id) for debate_id in debate_ids]
 
 
-def calculate_metrics_for_all_debates(memory_dir: str = "memory") -> None:
+def calculate_metrics_for_all_debates(memory_dir: str = "memory", jobs: int = 1, chunk_size: Optional[int] = None,
+                                      force: bool = False) -> None:
     """Calculate metrics for all debates in the memory system.
     
+    Only debates that are new, changed since they were scored or scored by another METRICS_VERSION
+    are scored (see manifest.py). Without embeddings, agent positions are loaded once up front for
+    the consistency markers; with them, workers compare the stored position vectors. Debates are scored in
+    chunks, by `jobs` worker processes when jobs > 1, and the metrics of each chunk are saved
+    together, in archive order.
+    
     Args:
         memory_dir: Path to the memory directory
+        jobs: Worker processes scoring debates in parallel (1 scores them in this process)
+        chunk_size: Debates per chunk handed to a worker. If None, chosen from the archive size
+        force: Rescore every debate, even those whose metrics are current
     """
     calculator = DebateMetricsCalculator(memory_dir)
-    debates_dir = Path(memory_dir) / "debates"
+    all_debate_ids = calculator.memory_manager.list_debate_ids()
     
-    if not debates_dir.exists():
+    if not all_debate_ids:
         print("No debates found in memory.")
         return
-        
-    for debate_file in debates_dir.glob("*.json"):
-        debate_id = debate_file.stem
-        print(f"Calculating metrics for debate {debate_id}...")
-        metrics = calculator.calculate_metrics_for_debate(debate_id)
-        
-        print(f"Metrics for debate '{metrics.get('topic', 'Unknown')}': ")
-        print(f"  Coherence: {metrics['metrics']['coherence']:.2f}")
-        print(f"  Diversity: {metrics['metrics']['diversity']:.2f}")
-        print(f"  Depth: {metrics['metrics']['depth']:.2f}")
-        print(f"  Overall Quality: {metrics['metrics']['overall_quality']:.2f}")
-        print()
     
-    print("Metrics calculation complete.")
+    if force:
+        debate_ids = all_debate_ids
+    else:
+        manifest = calculator.manifest.load()
+        debate_ids = [debate_id for debate_id in all_debate_ids if not calculator.is_scored(debate_id, manifest)]
+        if not debate_ids:
+            print(f"Metrics of all {len(all_debate_ids)} debates are up to date.")
+            return
+        if len(debate_ids) < len(all_debate_ids):
+            print(f"{len(all_debate_ids) - len(debate_ids)} debates unchanged since they were scored.")
+    
+    jobs = max(1, min(jobs, len(debate_ids)))
+    if chunk_size is None:
+        # About four chunks per worker balances uneven debates without much dispatch overhead
+        chunk_size = max(1, min(200, math.ceil(len(debate_ids) / (jobs * 4))))
+    chunks = [debate_ids[i:i + chunk_size] for i in range(0, len(debate_ids), chunk_size)]
+    agent_positions = load_agent_positions(calculator.memory_manager) if calculator.memory_manager.embedder is None else None
+    print(f"Calculating metrics for {len(debate_ids)} debates ({jobs} job{'s' if jobs > 1 else ''}, "
+          f"{len(chunks)} chunks)...")
+    
+    if jobs > 1:
+        executor = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                       initargs=(str(calculator.memory_dir), agent_positions))
+        results = executor.map(_score_chunk, chunks)
+    else:
+        executor = None
+        calculator = DebateMetricsCalculator(memory_manager=calculator.memory_manager, agent_positions=agent_positions)
+        results = ([calculator.compute_metrics(debate_id) for debate_id in chunk] for chunk in chunks)
+    
+    scored = failed = 0
+    try:
+        for chunk_metrics in results:
+            batch = [metrics for metrics in chunk_metrics if "error" not in metrics]
+            for metrics in chunk_metrics:
+                if "error" in metrics:
+                    print(f"  {metrics['error']}")
+            calculator.save_metrics_batch(batch)
+            scored += len(batch)
+            failed += len(chunk_metrics) - len(batch)
+            print(f"  {scored + failed}/{len(debate_ids)} debates scored")
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    
+    print(f"Metrics calculation complete: {scored} debates scored" + (f", {failed} failed." if failed else "."))
 
 
 if __name__ == "__main__":
-    import sys
+    import argparse
     
-    if len(sys.argv) > 1:
-        calculate_metrics_for_all_debates(sys.argv[1])
-    else:
-        calculate_metrics_for_all_debates()
+    parser = argparse.ArgumentParser(description="Calculate metrics for all debates")
+    parser.add_argument("memory_dir", nargs="?", default="memory", help="Memory directory")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Worker processes scoring debates in parallel (0: one per CPU)")
+    parser.add_argument("--chunk-size", type=int, help="Debates per chunk handed to a worker")
+    parser.add_argument("--force", action="store_true", help="Rescore debates whose metrics are up to date")
+    args = parser.parse_args()
+    
+    calculate_metrics_for_all_debates(args.memory_dir, jobs=args.jobs or os.cpu_count() or 1,
+                                      chunk_size=args.chunk_size, force=args.force)
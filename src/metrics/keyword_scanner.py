@@ -0,0 +1,52 @@
+"""
+Keyword feature extraction for debate metrics.
+
+A KeywordScanner counts every keyword of several families (philosophers, concepts, traditions, ...)
+over a batch of texts, lowercasing each text once, and returns the counts as one (texts x keywords)
+array that the metrics are computed from with vectorized operations. A keyword listed in several
+families is counted once. Counts equal text.lower().count(keyword), so occurrences of one keyword
+never overlap while those of different keywords may ("virtue" inside "virtue ethics").
+
+Each keyword is counted with str.count: on responses of a few KB and the ~60 keywords of
+DebateMetricsCalculator, these C-level scans are faster than one combined regular expression
+(even compiled as a character trie) matched over the text in a single pass.
+"""
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+
+class KeywordScanner:
+    """Counts the keywords of several families over a batch of texts."""
+
+    def __init__(self, families: Dict[str, Sequence[str]]):
+        """
+        Args:
+            families: Family name -> keywords (lowercase). A keyword may belong to several families;
+                      it is counted once and reported in each of them
+        """
+        self.families = {name: list(keywords) for name, keywords in families.items()}
+        self.keywords: List[str] = list(dict.fromkeys(k for keywords in self.families.values() for k in keywords))
+        if not all(self.keywords):
+            raise ValueError("Keywords must be non-empty")
+        self.columns = {keyword: column for column, keyword in enumerate(self.keywords)}
+        self.family_columns = {name: np.array([self.columns[k] for k in keywords], dtype=np.intp)
+                               for name, keywords in self.families.items()}
+
+    def counts(self, texts: Sequence[str]) -> np.ndarray:
+        """A (len(texts) x len(self.keywords)) array of keyword occurrences per text (case-insensitive)."""
+        rows = []
+        for text in texts:
+            lowered = text.lower()
+            rows.append([lowered.count(keyword) for keyword in self.keywords])
+        return np.array(rows, dtype=np.int64).reshape(len(texts), len(self.keywords))
+
+    def family_counts(self, counts: np.ndarray) -> Dict[str, np.ndarray]:
+        """Family name -> occurrences of its keywords per text (rows of a counts() array)."""
+        return {name: counts[:, columns].sum(axis=1) for name, columns in self.family_columns.items()}
+
+    def family_presence(self, counts: np.ndarray) -> Dict[str, np.ndarray]:
+        """Family name -> whether each of its keywords occurs in any of the texts of a counts() array."""
+        present = counts.any(axis=0)
+        return {name: present[columns] for name, columns in self.family_columns.items()}
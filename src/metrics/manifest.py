@@ -0,0 +1,129 @@
+"""
+Manifest of the saved debate metrics (memory/metrics/manifest.jsonl).
+
+Each time metrics are saved, one line is appended:
+{"debate_id", "hash", "metrics_version", "scored_at", "topic", "date", "metrics"}, where "hash" is
+the content hash of the debate that was scored and "metrics_version" the METRICS_VERSION of the
+scoring code. The latest line of a debate wins. Bulk recomputation rescores only debates that are
+new, whose content hash changed or that were scored by another metrics version; the trend and
+agent aggregates are read from the manifest instead of from every metrics file.
+
+Metrics files without a manifest line (saved before the manifest existed, or by hand) are added
+on load, with no hash so they are rescored by the next bulk run; lines of deleted metrics files
+are dropped. The file is rewritten without superseded lines once most of it is superseded.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+from src.memory.journal import atomic_write
+from src.memory.locking import StoreLock
+
+
+def debate_hash(debate: Dict[str, Any]) -> str:
+    """Content hash of a debate record (independent of key order and formatting)."""
+    canonical = json.dumps(debate, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class MetricsManifest:
+    """The content hash, metrics version and metrics of every debate with saved metrics."""
+
+    FILE_NAME = "manifest.jsonl"
+
+    def __init__(self, metrics_dir: Path):
+        self.metrics_dir = Path(metrics_dir)
+        self.path = self.metrics_dir / self.FILE_NAME
+        # Appends and compactions by processes sharing the directory (bulk runs, orchestrators)
+        self._lock = StoreLock(self.metrics_dir / ".manifest.lock")
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Latest entry of every debate with a metrics file, in scoring order.
+        Returns:
+            debate_id -> {"debate_id", "hash", "metrics_version", "scored_at", "topic", "date", "metrics"}
+        """
+        with self._lock:
+            entries, lines = self._read()
+            saved = {entry.name[:-len(".json")] for entry in os.scandir(self.metrics_dir)
+                     if entry.name.endswith(".json") and entry.is_file()}
+            missing = sorted(saved - entries.keys())
+            stale = [debate_id for debate_id in entries if debate_id not in saved]
+            for debate_id in stale:
+                del entries[debate_id]
+            for debate_id in missing:
+                entries[debate_id] = self._entry_from_file(debate_id)
+            if missing or stale or lines > 2 * len(entries) + 64:
+                self._rewrite(entries)
+        return dict(sorted(entries.items(), key=lambda item: item[1]["scored_at"]))
+
+    def record(self, batch: Iterable[Dict[str, Any]]) -> None:
+        """
+        Append the entries of just-saved metrics.
+        Args:
+            batch: Metrics dictionaries, each with its "debate_id", "debate_hash" and "metrics_version"
+        """
+        scored_at = time.time()
+        data = "".join(json.dumps(self._entry(metrics, scored_at), separators=(",", ":")) + "\n" for metrics in batch)
+        if not data:
+            return
+        with self._lock:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, data.encode("utf-8"))
+            finally:
+                os.close(fd)
+
+    @staticmethod
+    def _entry(metrics: Dict[str, Any], scored_at: float) -> Dict[str, Any]:
+        return {
+            "debate_id": metrics["debate_id"],
+            "hash": metrics.get("debate_hash"),
+            "metrics_version": metrics.get("metrics_version"),
+            "scored_at": scored_at,
+            "topic": metrics.get("topic", "Unknown"),
+            "date": metrics.get("date", "Unknown"),
+            "metrics": metrics.get("metrics", {}),
+        }
+
+    def _entry_from_file(self, debate_id: str) -> Dict[str, Any]:
+        metrics_file = self.metrics_dir / f"{debate_id}.json"
+        try:
+            with open(metrics_file, "r") as f:
+                metrics = json.load(f)
+        except (OSError, ValueError):
+            metrics = {}
+        metrics["debate_id"] = debate_id
+        try:
+            scored_at = metrics_file.stat().st_mtime
+        except OSError:
+            scored_at = 0.0
+        return self._entry(metrics, scored_at)
+
+    def _read(self):
+        """(debate_id -> latest entry, number of lines)."""
+        entries: Dict[str, Dict[str, Any]] = {}
+        lines = 0
+        if not self.path.exists():
+            return entries, lines
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Still being written
+                lines += 1
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                entries.pop(entry["debate_id"], None)  # Keep scoring order: a rescored debate moves last
+                entries[entry["debate_id"]] = entry
+        return entries, lines
+
+    def _rewrite(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        ordered: List[Dict[str, Any]] = sorted(entries.values(), key=lambda entry: entry["scored_at"])
+        data = "".join(json.dumps(entry, separators=(",", ":")) + "\n" for entry in ordered)
+        atomic_write(self.path, data.encode("utf-8"), fsync=False)
@@ -0,0 +1,206 @@
+"""
+Columnar table of the saved debate metrics (memory/metrics/metrics.table), memory-mapped for queries.
+
+The table holds one row per scored debate, in scoring order, and one NumPy column per field:
+debate_id, date, topic, scored_at, coherence, diversity, depth and overall_quality (NaN where a
+debate has no value), plus the per-agent consistency scores as three parallel columns
+(consistency_row, consistency_agent, consistency_value) over the agent names in "agents".
+
+The file is a JSON header followed by the raw column arrays:
+
+    8-byte little-endian header length | header | padding | column data ...
+
+where the header maps each column to its dtype, shape and byte offset (aligned to 64 bytes), so
+every column is opened as a read-only np.memmap without parsing anything else. The table is a
+cache of manifest.py: it is rebuilt from the manifest, and rewritten atomically, whenever the
+manifest changed since it was built. Trend, rolling-average, per-agent and per-topic queries are
+then vectorized operations over the columns.
+"""
+
+import json
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.memory.journal import atomic_write
+from .manifest import MetricsManifest
+
+# Metrics kept as float columns
+METRIC_COLUMNS = ("coherence", "diversity", "depth", "overall_quality")
+
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+
+
+class MetricsTable:
+    """Memory-mapped columns of every debate's metrics, rebuilt from the manifest when it changes."""
+
+    FILE_NAME = "metrics.table"
+
+    def __init__(self, metrics_dir: Path, manifest: Optional[MetricsManifest] = None):
+        """
+        Args:
+            metrics_dir: Directory holding the metrics files and the manifest
+            manifest: The directory's manifest. If None, opened here
+        """
+        self.metrics_dir = Path(metrics_dir)
+        self.path = self.metrics_dir / self.FILE_NAME
+        self.manifest = manifest or MetricsManifest(self.metrics_dir)
+        self._lock = threading.Lock()
+        self._columns: Dict[str, np.ndarray] = {}
+        self._header: Dict[str, Any] = {}
+
+    # --- Loading ---
+
+    def _source_state(self) -> List[int]:
+        """Identity, size and mtime of the manifest, to detect changes."""
+        try:
+            stat = os.stat(self.manifest.path)
+        except OSError:
+            return [0, 0, 0]
+        return [stat.st_ino, stat.st_size, stat.st_mtime_ns]
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """The table's columns, rebuilding the table first if the manifest changed."""
+        with self._lock:
+            state = self._source_state()
+            if self._columns and self._header.get("source") == state:
+                return self._columns
+            if not self._open() or self._header.get("source") != state:
+                self._build()
+                self._open()
+            return self._columns
+
+    def _open(self) -> bool:
+        """Memory-map the table file's columns; False if it is missing or unreadable."""
+        try:
+            with open(self.path, "rb") as f:
+                (header_size,) = struct.unpack("<Q", f.read(8))
+                header = json.loads(f.read(header_size))
+        except (OSError, ValueError, struct.error):
+            return False
+        if header.get("format") != FORMAT_VERSION:
+            return False
+        columns = {}
+        for name, spec in header["columns"].items():
+            shape = tuple(spec["shape"])
+            if spec["shape"][0] == 0:
+                columns[name] = np.empty(shape, dtype=spec["dtype"])
+            else:
+                columns[name] = np.memmap(self.path, dtype=spec["dtype"], mode="r", offset=spec["offset"], shape=shape)
+        self._header, self._columns = header, columns
+        return True
+
+    def _build(self) -> None:
+        """Rewrite the table file from the manifest."""
+        entries = list(self.manifest.load().values())
+        state = self._source_state()  # After load(), which may have rewritten the manifest
+        agents: Dict[str, int] = {}
+        consistency_rows, consistency_agents, consistency_values = [], [], []
+        for row, entry in enumerate(entries):
+            for agent_name, value in (entry.get("metrics", {}).get("consistency") or {}).items():
+                consistency_rows.append(row)
+                consistency_agents.append(agents.setdefault(agent_name, len(agents)))
+                consistency_values.append(value)
+
+        def text(values: List[Any]) -> np.ndarray:
+            return np.array([str(value) for value in values], dtype=str) if values else np.empty(0, dtype="<U1")
+
+        def metric(name: str) -> np.ndarray:
+            values = [entry.get("metrics", {}).get(name) for entry in entries]
+            return np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+
+        arrays = {
+            "debate_id": text([entry["debate_id"] for entry in entries]),
+            "date": text([entry.get("date", "Unknown") for entry in entries]),
+            "topic": text([entry.get("topic", "Unknown") for entry in entries]),
+            "scored_at": np.array([entry.get("scored_at", 0.0) for entry in entries], dtype=np.float64),
+            **{name: metric(name) for name in METRIC_COLUMNS},
+            "agents": text(list(agents)),
+            "consistency_row": np.array(consistency_rows, dtype=np.int32),
+            "consistency_agent": np.array(consistency_agents, dtype=np.int32),
+            "consistency_value": np.array(consistency_values, dtype=np.float64),
+        }
+
+        # Lay the columns out after the header, each aligned; the header size is fixed first
+        specs = {name: {"dtype": array.dtype.str, "shape": list(array.shape), "offset": 0} for name, array in arrays.items()}
+        header = {"format": FORMAT_VERSION, "rows": len(entries), "source": state, "columns": specs}
+        header_size = len(json.dumps(header)) + 32 * len(arrays)  # Room for the offsets' digits
+        offset = -(-(8 + header_size) // ALIGNMENT) * ALIGNMENT
+        for name, array in arrays.items():
+            specs[name]["offset"] = offset
+            offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+        header_bytes = json.dumps(header).encode("utf-8").ljust(header_size)
+        parts = [struct.pack("<Q", header_size), header_bytes]
+        position = 8 + header_size
+        for name, array in arrays.items():
+            parts.append(b"\0" * (specs[name]["offset"] - position))
+            parts.append(np.ascontiguousarray(array).tobytes())
+            position = specs[name]["offset"] + array.nbytes
+        atomic_write(self.path, b"".join(parts), fsync=False)
+
+    # --- Queries ---
+
+    def __len__(self) -> int:
+        return len(self.columns()["debate_id"])
+
+    def trend(self, metric_name: str, window: int = 1) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        A metric over time, in scoring order, skipping debates without a value.
+        Args:
+            metric_name: One of METRIC_COLUMNS
+            window: Debates averaged per point (a trailing rolling mean; 1 gives the raw values)
+        Returns:
+            (values, dates, topics)
+        """
+        columns = self.columns()
+        values = np.asarray(columns[metric_name])
+        present = ~np.isnan(values)
+        values = values[present]
+        if window > 1 and len(values):
+            sums = np.cumsum(np.concatenate(([0.0], values)))
+            ends = np.arange(1, len(values) + 1)
+            values = (sums[ends] - sums[np.maximum(ends - window, 0)]) / np.minimum(ends, window)
+        return values, np.asarray(columns["date"])[present], np.asarray(columns["topic"])[present]
+
+    def agent_consistency(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Consistency per agent.
+        Returns:
+            agent name -> {"consistency_scores" (in scoring order), "debate_count", "avg_consistency"}
+        """
+        columns = self.columns()
+        agents = np.asarray(columns["agents"])
+        agent_index = np.asarray(columns["consistency_agent"])
+        values = np.asarray(columns["consistency_value"])
+        counts = np.bincount(agent_index, minlength=len(agents))
+        sums = np.bincount(agent_index, weights=values, minlength=len(agents))
+        order = np.argsort(agent_index, kind="stable")
+        per_agent = np.split(values[order], np.cumsum(counts)[:-1]) if len(agents) else []
+        return {
+            str(agent_name): {
+                "consistency_scores": per_agent[index].tolist(),
+                "debate_count": int(counts[index]),
+                "avg_consistency": float(sums[index] / counts[index]) if counts[index] else 0,
+            }
+            for index, agent_name in enumerate(agents)
+        }
+
+    def topic_means(self, metric_name: str) -> Dict[str, float]:
+        """
+        Mean of a metric per topic (a missing value counting as 0), topics in order of first scoring.
+        Args:
+            metric_name: One of METRIC_COLUMNS
+        """
+        columns = self.columns()
+        topics = np.asarray(columns["topic"])
+        if not len(topics):
+            return {}
+        values = np.nan_to_num(np.asarray(columns[metric_name]), nan=0.0)
+        unique, first, inverse = np.unique(topics, return_index=True, return_inverse=True)
+        means = np.bincount(inverse, weights=values) / np.bincount(inverse)
+        return {str(unique[index]): float(means[index]) for index in np.argsort(first)}
@@ -7,12 +7,13 @@ This module provides visualization capabilities for debate metrics, including:
 - Topic diversity visualizations
 """
 
-import json
 import os
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
+from .metrics_table import MetricsTable
+
 # Note: In a production environment, we would use matplotlib or another plotting library
 # Since we're operating in a CLI environment, we'll use ASCII/text-based visualizations
 
@@ -28,12 +29,15 @@ class MetricsVisualizer:
         """
         self.memory_dir = Path(memory_dir)
         self.metrics_dir = self.memory_dir / "metrics"
+        # Columnar metrics of all debates, shared by every chart
+        self.metrics_table = MetricsTable(self.metrics_dir)
     
-    def visualize_metrics_over_time(self, metric_name: str = "overall_quality") -> str:
+    def visualize_metrics_over_time(self, metric_name: str = "overall_quality", window: int = 1) -> str:
         """Create a text-based line chart of metrics over time.
         
         Args:
             metric_name: Name of the metric to visualize
+            window: Debates averaged into each point (a trailing rolling mean; 1 plots the raw values)
             
         Returns:
             ASCII visualization of the metric over time
@@ -42,27 +46,18 @@ class MetricsVisualizer:
             return "No metrics data available."
         
         # Collect metrics data
-        metrics_data = []
-        for metrics_file in sorted(self.metrics_dir.glob("*.json"), key=lambda x: x.stat().st_mtime):
-            with open(metrics_file, "r") as f:
-                debate_metrics = json.load(f)
-            
-            date = debate_metrics.get("date", "Unknown")
-            topic = debate_metrics.get("topic", "Unknown")
-            value = debate_metrics.get("metrics", {}).get(metric_name)
-            
-            if value is not None:
-                metrics_data.append({
-                    "date": date,
-                    "topic": topic,
-                    "value": value
-                })
+        values, dates, topics = self.metrics_table.trend(metric_name, window)
+        metrics_data = [
+            {"date": str(date), "topic": str(topic), "value": float(value)}
+            for value, date, topic in zip(values, dates, topics)
+        ]
         
         if not metrics_data:
             return f"No data available for metric '{metric_name}'."
         
         # Create a simple ASCII line chart
-        chart = f"\nMetric: {metric_name.capitalize()} Over Time\n"
+        chart = f"\nMetric: {metric_name.capitalize()} Over Time"
+        chart += f" (rolling mean of {window} debates)\n" if window > 1 else "\n"
         chart += "=" * 60 + "\n"
         
         # Y-axis labels and grid
@@ -157,33 +152,12 @@ class MetricsVisualizer:
         if not self.metrics_dir.exists():
             return "No metrics data available."
         
-        # Collect agent data
-        agent_metrics = {}
-        
-        for metrics_file in self.metrics_dir.glob("*.json"):
-            with open(metrics_file, "r") as f:
-                debate_metrics = json.load(f)
-            
-            consistency_scores = debate_metrics.get("metrics", {}).get("consistency", {})
-            
-            for agent_name, consistency in consistency_scores.items():
-                if agent_name not in agent_metrics:
-                    agent_metrics[agent_name] = {
-                        "consistency_scores": [],
-                        "debate_count": 0
-                    }
-                
-                agent_metrics[agent_name]["consistency_scores"].append(consistency)
-                agent_metrics[agent_name]["debate_count"] += 1
+        # Collect agent data, with average metrics
+        agent_metrics = self.metrics_table.agent_consistency()
         
         if not agent_metrics:
             return "No agent performance data available."
         
-        # Calculate average metrics
-        for agent_name in agent_metrics:
-            scores = agent_metrics[agent_name]["consistency_scores"]
-            agent_metrics[agent_name]["avg_consistency"] = sum(scores) / len(scores) if scores else 0
-        
         # Sort by average consistency
         sorted_agents = sorted(
             agent_metrics.items(), 
@@ -221,29 +195,14 @@ class MetricsVisualizer:
         if not self.metrics_dir.exists():
             return "No metrics data available."
         
-        # Collect topic data
-        topics = {}
-        
-        for metrics_file in self.metrics_dir.glob("*.json"):
-            with open(metrics_file, "r") as f:
-                metrics = json.load(f)
-            
-            topic = metrics.get("topic", "Unknown")
-            diversity = metrics.get("metrics", {}).get("diversity", 0)
-            
-            if topic != "Unknown":
-                if topic not in topics:
-                    topics[topic] = []
-                topics[topic].append(diversity)
+        # Average diversity for each topic
+        topic_diversity = self.metrics_table.topic_means("diversity")
+        topic_diversity.pop("Unknown", None)
+        topics = topic_diversity
         
         if not topics:
             return "No topic diversity data available."
         
-        # Calculate average diversity for each topic
-        topic_diversity = {}
-        for topic, diversity_scores in topics.items():
-            topic_diversity[topic] = sum(diversity_scores) / len(diversity_scores)
-        
         # Create visualized output
         viz = "\nTopic Diversity Metrics\n"
         viz += "=" * 60 + "\n"
@@ -279,6 +238,8 @@ def visualize_metrics_cli():
     parser.add_argument("--metric", default="overall_quality", 
                         choices=["overall_quality", "coherence", "diversity", "depth"],
                         help="Metric to visualize over time")
+    parser.add_argument("--window", type=int, default=1,
+                        help="Debates averaged into each point of the time chart (rolling mean)")
     parser.add_argument("--type", default="time", 
                         choices=["time", "agents", "topics"],
                         help="Type of visualization to show")
@@ -288,7 +249,7 @@ def visualize_metrics_cli():
     visualizer = MetricsVisualizer(args.memory_dir)
     
     if args.type == "time":
-        print(visualizer.visualize_metrics_over_time(args.metric))
+        print(visualizer.visualize_metrics_over_time(args.metric, args.window))
     elif args.type == "agents":
         print(visualizer.visualize_agent_performance())
     elif args.type == "topics":
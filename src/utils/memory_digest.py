@@ -0,0 +1,71 @@
+"""
+Memory Digest Utility Module
+
+Applies the agent memory retention policy offline, in one batch: debate entries beyond the last
+N of each agent are folded into per-topic digests and the raw lists trimmed. With --llm, each digest
+that gained entries since its last summary also gets a short LLM-written summary.
+
+Usage:
+    python -m src.utils.memory_digest [--memory-dir memory] [--backend json|segment|sqlite]
+                                      [--retain N] [--agent NAME ...] [--llm]
+"""
+
+import argparse
+import os
+import sys
+
+# Add the project root to the path to make imports work
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+
+from src.agents.llm_utils import RateLimitExceeded, call_openai
+from src.memory import MemoryManager
+
+SUMMARY_SYSTEM_PROMPT = (
+    "You condense a debater's earlier statements on one topic into a faithful summary of the position "
+    "they took. Answer with two or three sentences in the first person, without preamble."
+)
+
+
+def summarize_digest(agent_name: str, topic: str, digest: dict) -> str:
+    """
+    Ask the LLM for a summary of a digest's points; empty if the LLM is unavailable or still rate
+    limited, which leaves the digest unsummarized for the next run instead of aborting this one.
+    """
+    points = "\n".join(f"- {point}" for point in digest.get("points", []))
+    user_prompt = (f"Debater: {agent_name}\nTopic: {topic}\n"
+                   f"Opening sentences of {digest.get('entries', 0)} earlier statements, newest first:\n{points}")
+    try:
+        summary = call_openai(SUMMARY_SYSTEM_PROMPT, user_prompt)
+    except RateLimitExceeded as e:
+        print(f"[Rate limited] summary of {agent_name}'s '{topic}' digest skipped ({e})")
+        return ""
+    return "" if not summary or summary.startswith("[LLM") else summary.strip()
+
+
+def main():
+    """Command-line interface for offline agent memory compaction."""
+    parser = argparse.ArgumentParser(description="Fold old agent memory entries into per-topic digests")
+    parser.add_argument("--memory-dir", default="memory", help="Path to memory directory")
+    parser.add_argument("--backend", choices=["json", "segment", "sqlite"],
+                        help="Storage backend (default: MEMORY_BACKEND)")
+    parser.add_argument("--retain", type=int, help="Debate entries to keep per agent (default: MEMORY_RETAIN_ENTRIES)")
+    parser.add_argument("--agent", action="append", help="Only compact this agent (repeatable)")
+    parser.add_argument("--llm", action="store_true", help="Write an LLM summary for each changed digest")
+    args = parser.parse_args()
+
+    manager = MemoryManager(args.memory_dir, backend=args.backend, lazy=True)
+    retain = manager.retain_entries if args.retain is None else args.retain
+    if retain <= 0:
+        print("Retention is disabled (keep every entry); pass --retain N to compact.")
+        return
+    folded = manager.compact_agent_memories(retain, args.agent, summarize_digest if args.llm else None)
+    for agent_name, count in sorted(folded.items()):
+        digests = len(manager.get_agent_memory(agent_name).get("digests", {}))
+        print(f"{agent_name}: folded {count} entries, {digests} topic digests")
+    print(f"Kept the last {retain} entries for {len(folded)} agents.")
+    manager.store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,7 @@ project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(_
 sys.path.append(project_root)
 
 from src.memory import MemoryManager
+from src.memory.debate_log import DebateLog
 
 
 class MemoryQueryTool:
@@ -40,51 +41,7 @@ class MemoryQueryTool:
         Returns:
             List of debate summaries
         """
-        debates_dir = self.memory_dir / "debates"
-        
-        if not debates_dir.exists():
-            return []
-        
-        debates = []
-        for debate_file in debates_dir.glob("*.json"):
-            with open(debate_file, "r") as f:
-                debate_data = json.load(f)
-                
-                # Extract agent names from responses if available
-                agents = []
-                for response in debate_data.get("responses", []):
-                    agent_name = response.get("agent", "Unknown")
-                    if agent_name != "Unknown":
-                        agents.append(agent_name)
-                
-                # Build debate summary
-                debate_summary = {
-                    "id": debate_file.stem,
-                    "topic": debate_data.get("topic", "Unknown"),
-                    "date": debate_data.get("date", "Unknown"),
-                    "agents": agents
-                }
-                
-                # Add timestamp for sorting if date is missing
-                if "timestamp" in debate_data and debate_summary["date"] == "Unknown":
-                    debate_summary["_timestamp"] = debate_data["timestamp"]
-                
-                debates.append(debate_summary)
-                
-        # Sort by date (newest first) and limit
-        # First try to sort by timestamp if date is unknown
-        debates_with_unknown = [d for d in debates if d.get("date") == "Unknown"]
-        if debates_with_unknown:
-            debates_with_unknown.sort(key=lambda x: x.get("_timestamp", ""), reverse=True)
-            
-        # Then sort the debates with known dates
-        debates_with_dates = [d for d in debates if d.get("date") != "Unknown"]
-        debates_with_dates.sort(key=lambda x: x.get("date", ""), reverse=True)
-        
-        # Combine the sorted lists
-        sorted_debates = debates_with_dates + debates_with_unknown
-        
-        return sorted_debates[:limit]
+        return self.memory_manager.list_debates(limit)
     
     def search_debates_by_topic(self, topic: str) -> List[Dict[str, Any]]:
         """Search for debates related to a specific topic.
@@ -95,62 +52,7 @@ class MemoryQueryTool:
         Returns:
             List of related debates
         """
-        # Search in debate titles/topics first
-        debates_dir = self.memory_dir / "debates"
-        related_debates = []
-        
-        if not debates_dir.exists():
-            return []
-        
-        # Simple keyword matching for topic searching
-        topic_lower = topic.lower()
-        
-        for debate_file in debates_dir.glob("*.json"):
-            try:
-                with open(debate_file, "r") as f:
-                    debate_data = json.load(f)
-                    
-                    # Calculate relevance score based on keyword matches
-                    relevance = 0
-                    main_topic = debate_data.get("topic", "").lower()
-                    prompt = debate_data.get("prompt", "").lower()
-                    
-                    # Check if topic is in the main topic
-                    if topic_lower in main_topic:
-                        relevance += 2  # Higher score for topic match
-                    
-                    # Check if topic is in the prompt
-                    if topic_lower in prompt:
-                        relevance += 1
-                    
-                    # Check if topic is in any of the topic keywords
-                    for keyword in debate_data.get("topics", []):
-                        if topic_lower in keyword.lower():
-                            relevance += 1
-                            break
-                    
-                    # If relevant, add to results
-                    if relevance > 0:
-                        # Extract agent names
-                        agents = []
-                        for response in debate_data.get("responses", []):
-                            agent_name = response.get("agent", "Unknown")
-                            if agent_name != "Unknown":
-                                agents.append(agent_name)
-                            
-                        related_debates.append({
-                            "id": debate_file.stem,
-                            "topic": debate_data.get("topic", "Unknown"),
-                            "date": debate_data.get("date", "Unknown"),
-                            "relevance": relevance,
-                            "agents": agents
-                        })
-            except Exception as e:
-                print(f"Error searching debate {debate_file}: {e}")
-        
-        # Sort by relevance (highest first)
-        related_debates.sort(key=lambda x: x.get("relevance", 0), reverse=True)
-        return related_debates
+        return self.memory_manager.search_debates(topic)
     
     def get_agent_positions(self, agent_name: str, topic: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
         """Get an agent's positions on topics.
@@ -162,26 +64,7 @@ class MemoryQueryTool:
         Returns:
             Dictionary of topics and agent positions
         """
-        agent_file = self.memory_dir / "agents" / f"{agent_name}.json"
-        if not agent_file.exists():
-            return {}
-            
-        with open(agent_file, "r") as f:
-            agent_memory = json.load(f)
-        
-        agent_positions = {}
-        
-        if topic:
-            # Get positions on a specific topic
-            if "positions" in agent_memory and topic in agent_memory["positions"]:
-                agent_positions[topic] = agent_memory["positions"][topic]
-        else:
-            # Get all positions for the agent
-            if "positions" in agent_memory:
-                for topic_name, positions in agent_memory["positions"].items():
-                    agent_positions[topic_name] = positions
-        
-        return agent_positions
+        return self.memory_manager.get_agent_positions(agent_name, topic)
     
     def get_debate_details(self, debate_id: str) -> Dict[str, Any]:
         """Get full details of a specific debate.
@@ -192,14 +75,10 @@ class MemoryQueryTool:
         Returns:
             Complete debate data with properly formatted agent information
         """
-        debate_file = self.memory_dir / "debates" / f"{debate_id}.json"
-        
-        if not debate_file.exists():
+        debate_data = self.memory_manager.get_debate(debate_id)
+        if debate_data is None:
             return {}
         
-        with open(debate_file, "r") as f:
-            debate_data = json.load(f)
-        
         # Format the data for the explorer
         # Adapt the debate_data format to match what the explorer expects
         formatted_agents = []
@@ -218,6 +97,27 @@ class MemoryQueryTool:
             
         return debate_data
     
+    def search_statements(self, query: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """Full-text search over agent statements.
+        
+        Args:
+            query: Words that must all occur in a statement
+            limit: Maximum number of matches to return
+            
+        Returns:
+            List of matching statements with their debate ID, agent and phase
+        """
+        return self.memory_manager.search_responses(query, limit)
+    
+    def list_topics(self) -> List[str]:
+        """List the main topics of all stored debates.
+        
+        Returns:
+            Sorted list of distinct topics
+        """
+        debates = self.memory_manager.list_debates(len(self.memory_manager.list_debate_ids()))
+        return sorted({debate.get("topic", "Unknown") for debate in debates})
+    
     def find_contradictions(self, agent_name: str) -> List[Dict[str, Any]]:
         """Find potential contradictions in an agent's positions over time.
         
@@ -227,23 +127,12 @@ class MemoryQueryTool:
         Returns:
             List of potential contradictory positions
         """
-        # Load the agent memory file directly
-        agent_file = self.memory_dir / "agents" / f"{agent_name}.json"
-        if not agent_file.exists():
-            return []
-            
-        with open(agent_file, "r") as f:
-            agent_memory = json.load(f)
-        
         # This is a placeholder for more sophisticated contradiction analysis
         # A real implementation would use NLP techniques to identify semantic contradictions
         contradictions = []
         
-        if "positions" not in agent_memory:
-            return []
-        
         # For now, just return topics where the agent has multiple positions
-        for topic, positions in agent_memory["positions"].items():
+        for topic, positions in self.memory_manager.get_agent_positions(agent_name).items():
             if len(positions) > 1:
                 contradictions.append({
                     "topic": topic,
@@ -251,6 +140,24 @@ class MemoryQueryTool:
                 })
         
         return contradictions
+    
+    def stream_log(self, log_path: str, follow: bool = False, full: bool = False):
+        """Stream the debate history log, optionally waiting for new debates like `tail -f`.
+        
+        Args:
+            log_path: Path to debate_history.jsonl
+            follow: Keep waiting for debates appended to the log
+            full: Yield each debate's full record from the memory store instead of its log line
+            
+        Yields:
+            Log entries (or full debate records)
+        """
+        log = DebateLog(log_path)
+        entries = log.follow() if follow else (entry for _, entry in log.read())
+        for entry in entries:
+            if full and "debate_id" in entry:
+                entry = self.memory_manager.get_debate(entry["debate_id"]) or entry
+            yield entry
 
 
 def main():
@@ -277,10 +184,22 @@ def main():
     debate_parser = subparsers.add_parser("debate", help="Get details of a specific debate")
     debate_parser.add_argument("id", help="ID of the debate")
     
+    # Full-text search command
+    text_parser = subparsers.add_parser("text", help="Full-text search over agent statements")
+    text_parser.add_argument("query", help="Words that must all occur in a statement")
+    text_parser.add_argument("--limit", type=int, default=20, help="Maximum number of matches to show")
+    
     # Contradiction finder command
     contradiction_parser = subparsers.add_parser("contradictions", help="Find potential contradictions in agent positions")
     contradiction_parser.add_argument("name", help="Name of the agent")
     
+    # Debate history log command
+    log_parser = subparsers.add_parser("log", help="Stream the debate history log (debate_history.jsonl)")
+    log_parser.add_argument("--log", default=os.path.join(project_root, "debate_history.jsonl"),
+                            help="Path to the log")
+    log_parser.add_argument("--follow", "-f", action="store_true", help="Keep printing debates as they are saved")
+    log_parser.add_argument("--full", action="store_true", help="Print each debate's full record as JSON")
+    
     # Define memory directory option for all commands
     parser.add_argument("--memory-dir", default="memory", help="Path to memory directory")
     
@@ -347,6 +266,18 @@ def main():
                 print(f"\n{agent.get('name', 'Unknown Agent')}:")
                 print(agent.get('analysis', 'No analysis available.'))
     
+    elif args.command == "text":
+        matches = query_tool.search_statements(args.query, args.limit)
+        if not matches:
+            print(f"No statements found matching '{args.query}'.")
+        else:
+            print(f"Found {len(matches)} statement(s) matching '{args.query}':")
+            for i, match in enumerate(matches):
+                text = " ".join(match["text"].split())
+                print(f"{i+1}. {match.get('agent') or 'Unknown'} ({match['phase']}) in {match['debate_id']}")
+                print(f"   {text[:200]}{'...' if len(text) > 200 else ''}")
+                print()
+    
     elif args.command == "contradictions":
         contradictions = query_tool.find_contradictions(args.name)
         if not contradictions:
@@ -360,6 +291,18 @@ def main():
                     print(f"  {position.get('position', 'No position statement')}")
                     print(f"  From debate: {position.get('debate_id', 'Unknown')}")
     
+    elif args.command == "log":
+        try:
+            for entry in query_tool.stream_log(args.log, args.follow, args.full):
+                if args.full:
+                    print(json.dumps(entry))
+                else:
+                    outcome = "tie" if entry.get("is_tie") else entry.get("winner") or "-"
+                    print(f"{entry.get('debate_id', '(inline)')}  {entry.get('timestamp', '')}  "
+                          f"winner: {outcome}  {entry.get('prompt', '')[:80]}")
+        except KeyboardInterrupt:
+            pass
+    
     else:
         parser.print_help()
 
@@ -0,0 +1,97 @@
+"""
+Memory Store Utility Module
+
+Maintenance commands for the debate memory storage backends:
+- migrate: copy the JSON memory/ layout into the segment or SQLite store
+- compact: fold deltas and drop superseded records (segment) or VACUUM the database (sqlite)
+- stats: show the size of the store
+
+Usage:
+    python -m src.utils.memory_store [--memory-dir memory] [--backend segment|sqlite] {migrate,compact,stats}
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Add the project root to the path to make imports work
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(project_root)
+
+from src.memory.locking import StoreLock
+from src.memory.sqlite_store import SqliteStore
+from src.memory.storage import JsonDirectoryStore, SegmentLogStore, migrate_store
+
+# Seconds to wait for running writers (MemoryManager.save_debate etc.) to release the store
+LOCK_TIMEOUT = 30.0
+
+
+def _open_store(backend: str, memory_dir: Path):
+    return SqliteStore(memory_dir) if backend == "sqlite" else SegmentLogStore(memory_dir)
+
+
+def _store_lock(memory_dir: Path) -> StoreLock:
+    """The memory store's write lock (memory/.memory.lock), shared with every MemoryManager."""
+    os.makedirs(memory_dir, exist_ok=True)
+    return StoreLock(memory_dir / ".memory.lock", timeout=LOCK_TIMEOUT)
+
+
+def _print_stats(store) -> None:
+    for key, value in store.stats().items():
+        if key.endswith("bytes"):
+            value = f"{value / 1024:.1f} KiB"
+        print(f"{key.replace('_', ' ').capitalize()}: {value}")
+
+
+def main():
+    """Command-line interface for memory store maintenance."""
+    parser = argparse.ArgumentParser(description="Maintain the debate memory store")
+    subparsers = parser.add_subparsers(dest="command", help="Command to execute")
+    migrate_parser = subparsers.add_parser("migrate", help="Copy the JSON memory layout into the store")
+    migrate_parser.add_argument("--force", action="store_true",
+                                help="Migrate even if the store already holds data")
+    subparsers.add_parser("compact", help="Compact the store")
+    subparsers.add_parser("stats", help="Show store statistics")
+    parser.add_argument("--memory-dir", default="memory", help="Path to memory directory")
+    parser.add_argument("--backend", choices=["segment", "sqlite"], default="segment", help="Store to maintain")
+    args = parser.parse_args()
+
+    memory_dir = Path(args.memory_dir)
+    if args.command in ("migrate", "compact"):
+        # Hold the store lock like any writer and bump its change counter, so running
+        # MemoryManagers reopen the rewritten store instead of appending to the replaced files
+        try:
+            with _store_lock(memory_dir) as lock:
+                store = _open_store(args.backend, memory_dir)
+                if args.command == "migrate":
+                    if store.debate_ids() and not args.force:
+                        print(f"The {args.backend} store in {memory_dir} already holds data; use --force to migrate again.")
+                    else:
+                        count = migrate_store(JsonDirectoryStore(memory_dir), store)
+                        lock.mark_changed()
+                        print(f"Migrated {count} debates into the {args.backend} store. "
+                              f"Set MEMORY_BACKEND={args.backend} to use it.")
+                        _print_stats(store)
+                else:
+                    store.compact()
+                    lock.mark_changed()
+                    print(f"Compacted the {args.backend} store in {memory_dir}")
+                    _print_stats(store)
+                store.close()
+        except TimeoutError:
+            print(f"The memory store in {memory_dir} is busy (another process kept {memory_dir / '.memory.lock'} "
+                  f"for {LOCK_TIMEOUT:.0f}s); not running {args.command}.")
+            sys.exit(1)
+
+    elif args.command == "stats":
+        store = _open_store(args.backend, memory_dir)
+        _print_stats(store)
+        store.close()
+
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()